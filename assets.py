@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 静态资源处理
+样式表按内容哈希命名（可长期缓存），HTML/CSS 去掉多余空白和注释，
+并为输出目录下的文本文件写出 .gz / .br 预压缩副本
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # brotli 是可选依赖，没有时只写 .gz
+    brotli = None
+
+# 需要预压缩的文件类型
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt')
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCT = re.compile(r'\s*([{};,>])\s*')
+_HTML_COMMENT = re.compile(r'<!--(?! content-hash:).*?-->', re.DOTALL)
+_HTML_SPACE = re.compile(r'\s+')
+
+
+def minify_css(css):
+    """去掉注释和多余空白（冒号前的空格保留，避免改变 `a :hover` 这类选择器的含义）"""
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_SPACE.sub(' ', css)
+    css = _CSS_PUNCT.sub(r'\1', css)
+    css = css.replace(': ', ':').replace(';}', '}')
+    return css.strip()
+
+
+def iter_minified_html(chunks):
+    """
+    逐块压缩 HTML：去掉注释（保留 content-hash 标记），连续空白合并为一个空格
+
+    采用保守的合并方式：标签之间的空白不完全删除，行内元素之间的间距保持不变。
+    跨块的空白也只保留一个。
+
+    Args:
+        chunks: HTML 文本块的迭代器
+
+    Yields:
+        str: 压缩后的文本块
+    """
+    trailing_space = True  # 文档开头的空白直接去掉
+    for chunk in chunks:
+        text = _HTML_SPACE.sub(' ', _HTML_COMMENT.sub('', chunk))
+        if trailing_space and text.startswith(' '):
+            text = text[1:]
+        if text:
+            trailing_space = text.endswith(' ')
+            yield text
+
+
+def write_stylesheet(css, output_dir, assets_dir='assets', minify=True):
+    """
+    写出带内容哈希的样式表，并删除旧版本
+
+    Args:
+        css: 样式表内容
+        output_dir: 网站根目录
+        assets_dir: 样式表所在的子目录
+
+    Returns:
+        str: 相对网站根目录的路径，如 assets/style.1a2b3c4d5e.css
+    """
+    if minify:
+        css = minify_css(css)
+    payload = css.encode('utf-8')
+    name = f'style.{hashlib.sha256(payload).hexdigest()[:10]}.css'
+    directory = os.path.join(output_dir, assets_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        _atomic_write(path, payload)
+    for other in os.listdir(directory):
+        if other.startswith('style.') and not other.startswith(name):
+            os.remove(os.path.join(directory, other))
+    return f'{assets_dir}/{name}'
+
+
+def precompress_tree(root, min_size=0):
+    """
+    为 root 下的文本文件写出 .gz（和 .br）副本
+
+    副本比源文件新时跳过；源文件已删除的副本一并删除。gzip 头中的时间戳固定为 0，
+    内容不变时输出逐字节相同。
+
+    Args:
+        root: 输出目录
+        min_size: 小于该字节数的文件不压缩
+
+    Returns:
+        dict: {'gz': 写入数, 'br': 写入数, 'removed': 删除的过期副本数}
+    """
+    stats = {'gz': 0, 'br': 0, 'removed': 0}
+    suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+    for directory, _, files in os.walk(root):
+        names = set(files)
+        for name in files:
+            path = os.path.join(directory, name)
+            base, ext = os.path.splitext(name)
+            if ext in ('.gz', '.br'):
+                if base not in names:
+                    os.remove(path)
+                    stats['removed'] += 1
+                continue
+            if not name.endswith(COMPRESSIBLE) or os.path.getsize(path) < min_size:
+                continue
+
+            mtime = os.path.getmtime(path)
+            stale = [suffix for suffix in suffixes
+                     if not os.path.exists(path + suffix) or os.path.getmtime(path + suffix) < mtime]
+            if not stale:
+                continue
+            with open(path, 'rb') as f:
+                payload = f.read()
+            for suffix in stale:
+                if suffix == '.gz':
+                    _atomic_write(path + suffix, gzip.compress(payload, compresslevel=9, mtime=0))
+                else:
+                    _atomic_write(path + suffix, brotli.compress(payload, quality=11))
+                stats[suffix[1:]] += 1
+    return stats
+
+
+def _atomic_write(path, payload):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 批量查询规划
+把多个搜索任务（可以跨新闻/案例）合并到一次请求里，按估算的输出 token 数分批；
+根据实际返回的 token 用量调整估算，响应被截断时缩小批次
+"""
+
+import threading
+
+# 每个条目的初始输出 token 估算（中文摘要 + JSON 结构）
+DEFAULT_TOKENS_PER_ITEM = {'news': 160, 'case': 200}
+
+
+class BatchPlanner:
+    """按 token 上限把任务分批，线程安全"""
+
+    def __init__(self, max_queries=4, max_output_tokens=6000, tokens_per_item=None, overhead=100):
+        """
+        Args:
+            max_queries: 每批最多的查询数
+            max_output_tokens: 每批预计输出 token 的上限（应低于模型的 max_tokens）
+            tokens_per_item: {content_type: 每个条目的 token 估算}
+            overhead: 每个查询在 JSON 结构上的额外开销
+        """
+        self.max_queries = max(1, max_queries)
+        self.max_output_tokens = max_output_tokens
+        self.tokens_per_item = dict(DEFAULT_TOKENS_PER_ITEM, **(tokens_per_item or {}))
+        self.overhead = overhead
+        self._lock = threading.Lock()
+
+    def estimate(self, tasks):
+        """
+        估算一批任务的输出 token 数
+
+        Args:
+            tasks: [(query, content_type, count), ...]
+        """
+        with self._lock:
+            return sum(count * self.tokens_per_item.get(content_type, 200) + self.overhead
+                       for _, content_type, count in tasks)
+
+    def plan(self, tasks):
+        """
+        贪心分批：按顺序装入，超过查询数或 token 上限时另起一批
+
+        单个任务本身超过上限时单独成批。
+
+        Returns:
+            list: 每批是 [(任务序号, task), ...]
+        """
+        batches, current, current_tokens = [], [], 0
+        for index, task in enumerate(tasks):
+            tokens = self.estimate([task])
+            if current and (len(current) >= self.max_queries
+                            or current_tokens + tokens > self.max_output_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append((index, task))
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def observe(self, tasks, completion_tokens, items):
+        """
+        用一次批量请求的实际用量修正每个条目的 token 估算
+
+        Args:
+            tasks: 这一批的任务
+            completion_tokens: 接口返回的输出 token 数（None 时忽略）
+            items: 实际返回的条目总数
+        """
+        if not completion_tokens or not items:
+            return
+        estimated = self.estimate(tasks) - self.overhead * len(tasks)
+        if estimated <= 0:
+            return
+        actual = completion_tokens - self.overhead * len(tasks)
+        # 估算和实际条目数不同，按条目数折算后再比较
+        expected_items = sum(count for _, _, count in tasks)
+        ratio = max(actual, 1) * expected_items / (estimated * items)
+        with self._lock:
+            for content_type in self.tokens_per_item:
+                # 指数滑动平均，避免单次异常值大幅改变分批
+                updated = self.tokens_per_item[content_type] * (0.5 + 0.5 * ratio)
+                self.tokens_per_item[content_type] = max(20, int(updated))
+
+    def shrink(self):
+        """响应被截断或无法解析时缩小批次，返回新的每批查询数"""
+        with self._lock:
+            self.max_queries = max(1, self.max_queries // 2)
+            return self.max_queries
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+增量采集基准测试
+模拟接口每次响应中有一部分是该查询反复出现的老条目（--repeat-ratio）。先跑一次采集建立历史库，
+再从同一份历史库出发分别关闭 / 开启 DELTA_MODE 采集一次，对比每次调用得到的新条目数和每个新条目花费的 token
+
+用法: python benchmarks/bench_delta.py --repeat-ratio 0.6 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_qwen_server import start_server
+from run_suite import overrides
+
+
+def collect_once(workdir, delta_mode):
+    """在 workdir 里采集并保存一次，返回指标汇总"""
+    import config
+    from collect_content import AINewsCollector
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with overrides(config, {'DELTA_MODE': delta_mode}), contextlib.redirect_stdout(io.StringIO()):
+            collector = AINewsCollector(use_cache=False)
+            collector.save_data(*collector.collect_all())
+    finally:
+        os.chdir(cwd)
+    return collector.metrics.snapshot()['totals']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='增量采集基准测试')
+    parser.add_argument('--repeat-ratio', type=float, default=0.6, help='每次响应中老条目的比例')
+    parser.add_argument('--runs', type=int, default=3, help='建立历史库时的采集次数')
+    parser.add_argument('--latency', default='fixed:0.02')
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, repeat_ratio=args.repeat_ratio, seed=42)
+    import config
+    config.QWEN_API_BASE = base_url
+    config.QWEN_API_KEY = 'mock'
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, overrides(config, {'OUTPUT_DIR': workdir}):
+        history = os.path.join(workdir, 'history')
+        os.makedirs(history)
+        for _ in range(args.runs):
+            collect_once(history, delta_mode=False)
+        for name, delta_mode in (('off', False), ('on', True)):
+            run_dir = os.path.join(workdir, name)
+            shutil.copytree(history, run_dir)
+            results[name] = collect_once(run_dir, delta_mode)
+    server.shutdown()
+
+    print(f"\n老条目比例 {args.repeat_ratio}，历史库来自 {args.runs} 次采集")
+    print(f"{'增量模式':>8} {'有效条目':>8} {'新条目':>8} {'新条目/调用':>10} "
+          f"{'提示词token/新条目':>18} {'输出token/新条目':>16}")
+    for name, totals in results.items():
+        novel = totals['items_novel'] or 1
+        print(f"{name:>8} {totals['items_valid']:>8} {totals['items_novel']:>8} {totals['novel_per_call']:>10} "
+              f"{totals['prompt_tokens'] / novel:>18.1f} {totals['completion_tokens'] / novel:>16.1f}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+容错 JSON 解析基准测试
+语料：标准 JSON、手写的大模型常见错误样例，以及按固定随机种子生成的变异响应
+（尾随/缺少/多余逗号、弯引号、单引号、没有引号的键和值、Python 字面量、注释、
+字符串中未转义的引号和换行、转义的代理对、外层数组缺失、任意位置截断）。
+对比原来的 _extract_json + json.loads 和 salvage_json：通过校验的条目数和吞吐量；
+最后在不同规模下测量容错解析的耗时，确认与文本长度成正比
+
+用法: python benchmarks/bench_json_salvage.py --docs 500 --seed 7
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_salvage import salvage_json
+from records import validate_items
+
+# 手写样例：(响应文本, 能恢复的有效条目数)
+HANDWRITTEN = [
+    ('```json\n[\n  {"title": "OpenAI 发布新模型", "summary": "要点。", "priority": "high", "tags": ["模型",], '
+     '"date": "2026年1月"},\n]\n```', 1),
+    ('根据联网搜索结果，整理如下：\n\n```json\n[{“title”: “百度升级文心”, “summary”: “支持长文本”, “priority”: “medium”, '
+     '“tags”: [“大模型”], “date”: “2026年2月”}]\n```\n以上信息仅供参考。', 1),
+    ("[{'title': 'Meta open-sources Llama', 'summary': \"Meta's new weights\", 'priority': 'high', "
+     "'tags': ['开源'], 'date': '2026年3月', 'verified': True}]", 1),
+    ('[{title: "阿里云发布通义", summary: "多模态", priority: high, tags: ["多模态"], date: 2026年3月}]', 1),
+    ('[{"title": "专家称"拐点"已到", "summary": "业内认为"AI+项目管理"进入落地期", "priority": "high", '
+     '"tags": ["观点"], "date": "2026年1月"}]', 1),
+    ('[{"title": "条目一", "summary": "第一行\n第二行", "priority": "medium", "tags": [], "date": "2026年"}\n'
+     '{"title": "条目二", "summary": "缺逗号", "priority": "medium", "tags": [], "date": "2026年"}]', 2),
+    ('[{"title": "完整条目", "summary": "ok", "priority": "high", "tags": [], "date": "2026年"}, '
+     '{"title": "被截断的条目", "summary": "输出达到 max_tok', 1),
+    ('{"title": "只有一个对象", "summary": "模型没有返回数组", "priority": "medium", "tags": ["单条"], '
+     '"date": "2026年"}', 1),
+    ('[{"title": "带注释", // 模型加的注释\n "summary": "s", "priority": "high", "tags": [], "date": "2026年"}, '
+     '/* 第二条 */ {"title": "第二条", "summary": "s", "priority": None, "tags": [], "date": "2026年"}]', 2),
+    ('[{"title": "损坏的条目", "summary": ###, "priority": "high", "tags": [}, '
+     '{"title": "后面的条目", "summary": "s", "priority": "high", "tags": [], "date": "2026年"}]', 1),
+    ('参考资料[1][2]\n[{"title": "说明文字里有方括号", "summary": "s", "priority": "medium", "tags": [], '
+     '"date": "2026年"}]', 1),
+    ('```json\n[{"title": "第一段", "summary": "s", "priority": "high", "tags": [], "date": "2026年"},\n```\n'
+     '```json\n{"title": "第二段", "summary": "s", "priority": "high", "tags": [], "date": "2026年"}]\n```', 2),
+    # 转义的表情符号（代理对）：必须合并成一个码位，否则写入缓存和历史库时 UTF-8 编码失败
+    ('[{"title": "\\uD83D\\ude80 发布会", summary: "\\uD83D\\uDE00 要点", "priority": "high", "tags": [], '
+     '"date": "2026年"},]', 1),
+]
+
+
+def legacy_parse(content):
+    """原来的解析方式：按代码块切分 + 贪婪正则 + json.loads，失败时整段丢弃"""
+    content = content.strip()
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0].strip()
+    elif '```' in content:
+        content = content.split('```')[1].split('```')[0].strip()
+    match = re.search(r'\[.*\]', content, re.DOTALL)
+    if match:
+        content = match.group()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return []
+
+
+def salvage_parse(content):
+    return salvage_json(content.strip())[0]
+
+
+def _quote(rng, text, style):
+    if style == 'single':
+        return "'" + text.replace("'", "\\'") + "'"
+    if style == 'smart':
+        return '“' + text + '”'
+    return json.dumps(text, ensure_ascii=False)
+
+
+def render_item(rng, i, defects):
+    """按给定的缺陷概率写出一条新闻（返回文本）"""
+    style = 'double'
+    if rng.random() < defects:
+        style = rng.choice(['single', 'smart'])
+    summary = f'第 {i} 条摘要，说明要点和对项目管理的影响。'
+    if rng.random() < defects:
+        summary = summary.replace('要点', '"要点"' if style == 'double' else '“要点”')
+    if rng.random() < defects:
+        summary = summary.replace('，', '，\n', 1)
+    fields = [
+        ('title', _quote(rng, f'模拟新闻 {i}：大模型发布', style)),
+        ('summary', _quote(rng, summary, style) if '"要点"' not in summary else f'"{summary}"'),
+        ('priority', 'high' if rng.random() < defects else _quote(rng, 'medium', style)),
+        ('tags', '[' + ', '.join(_quote(rng, tag, style) for tag in ['人工智能', f'标签{i % 7}'])
+         + (',' if rng.random() < defects else '') + ']'),
+        ('date', _quote(rng, f'2026年{i % 12 + 1}月', style)),
+        ('verified', 'True' if rng.random() < defects else 'true'),
+    ]
+    parts = []
+    for name, value in fields:
+        key = name if rng.random() < defects / 2 else _quote(rng, name, style)
+        parts.append(f'{key}: {value}')
+    separators = []
+    for _ in parts[:-1]:
+        roll = rng.random()
+        if roll < defects / 3:
+            separators.append('\n  ')  # 缺少逗号
+        elif roll < defects / 2:
+            separators.append(', // 注释\n  ')
+        else:
+            separators.append(', ')
+    body = parts[0] + ''.join(sep + part for sep, part in zip(separators, parts[1:]))
+    if rng.random() < defects / 2:
+        body += ','  # 尾随逗号
+    return '{' + body + '}'
+
+
+def fuzz_document(rng, count, defects, truncate):
+    """
+    一条变异后的响应
+
+    Returns:
+        tuple: (文本, 能恢复的有效条目数)
+    """
+    items = [render_item(rng, i, defects) for i in range(count)]
+    prefix = rng.choice(['', '以下是搜索结果：\n', '```json\n', '根据联网搜索：\n```json\n'])
+    wrapped = rng.random() >= defects / 3  # 偶尔缺少外层数组
+    text = prefix + ('[\n' if wrapped else '')
+    ends = []
+    for index, item in enumerate(items):
+        if index:
+            roll = rng.random()
+            text += '\n' if roll < defects / 3 else (',,\n' if roll < defects / 2 else ',\n')
+        text += item
+        ends.append(len(text))
+    text += ('\n]' if wrapped else '') + ('\n```' if '```' in prefix else '')
+    if truncate:
+        cut = rng.randint(len(prefix) + 1, len(text))
+        return text[:cut], sum(1 for end in ends if end <= cut)
+    return text, count
+
+
+def corpus(docs, seed):
+    """各场景的语料: {场景: [(文本, 能恢复的条目数)]}"""
+    rng = random.Random(seed)
+    return {
+        'clean': [fuzz_document(rng, rng.randint(3, 8), 0.0, False) for _ in range(docs)],
+        'handwritten': HANDWRITTEN,
+        'fuzz': [fuzz_document(rng, rng.randint(3, 8), 0.25, False) for _ in range(docs)],
+        'truncated': [fuzz_document(rng, rng.randint(3, 8), 0.0, True) for _ in range(docs)],
+        'fuzz+truncated': [fuzz_document(rng, rng.randint(3, 8), 0.25, True) for _ in range(docs)],
+    }
+
+
+def measure(parse, documents, rounds=3):
+    """返回 (有效条目数, MB/s)"""
+    size = sum(len(text.encode('utf-8')) for text, _ in documents)
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [parse(text) for text, _ in documents]
+        best = min(best, time.perf_counter() - start)
+    recovered = sum(len(validate_items(result, 'news')) for result in results)
+    for result in results:
+        json.dumps(result, ensure_ascii=False).encode('utf-8')  # 不成对的代理项会在这里报错
+    return recovered, size / 1024 / 1024 / best if best else float('inf')
+
+
+def scaling(seed, sizes):
+    """容错解析在不同规模下的耗时（变异 + 截断的单个大响应）"""
+    rng = random.Random(seed)
+    rows = []
+    for count in sizes:
+        text, expected = fuzz_document(rng, count, 0.25, False)
+        text = text[:-len(text) // 50]
+        start = time.perf_counter()
+        value, stats = salvage_json(text)
+        seconds = time.perf_counter() - start
+        rows.append((count, len(text.encode('utf-8')), seconds, len(validate_items(value, 'news')), stats))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='容错 JSON 解析基准测试')
+    parser.add_argument('--docs', type=int, default=500, help='每个变异场景的响应数')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--sizes', default='1000,10000,100000', help='规模测试的条目数，逗号分隔')
+    args = parser.parse_args()
+
+    print(f"{'场景':>16} {'响应':>6} {'可恢复':>8} {'原解析':>8} {'容错解析':>8} {'原 MB/s':>9} {'容错 MB/s':>10}")
+    for name, documents in corpus(args.docs, args.seed).items():
+        expected = sum(count for _, count in documents)
+        legacy, legacy_speed = measure(legacy_parse, documents)
+        salvaged, salvage_speed = measure(salvage_parse, documents)
+        print(f"{name:>16} {len(documents):>6} {expected:>8} {legacy:>8} {salvaged:>8} "
+              f"{legacy_speed:>9.1f} {salvage_speed:>10.1f}")
+
+    print(f"\n{'条目数':>8} {'大小(KB)':>10} {'耗时(s)':>9} {'MB/s':>7} {'恢复条目':>8}  修复")
+    for count, size, seconds, recovered, stats in scaling(args.seed, [int(n) for n in args.sizes.split(',')]):
+        print(f"{count:>8} {size // 1024:>10} {seconds:>9.3f} {size / 1024 / 1024 / seconds:>7.1f} "
+              f"{recovered:>8}  {stats.summary()}")
+
+
+if __name__ == '__main__':
+    main()
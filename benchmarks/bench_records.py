@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+条目表示方式基准测试
+对比 dict、__slots__ 记录（NewsItem/CaseItem）和按列存储（ItemColumns）三种表示：
+容器本身占用的内存（不含各表示共用的文本）和整页渲染耗时
+
+用法: python benchmarks/bench_records.py [--count 1000000] [--skip-render]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from generate_html import DashboardGenerator
+from records import CaseItem, ItemColumns, NewsItem
+
+
+def synthetic_fields(count):
+    """count 条新闻和 count 个案例的字段值（元组），各表示共用同一批字符串"""
+    industries = ['金融', '制造', '互联网', '医疗']
+    news = [(f'合成新闻标题 {i}：大模型发布与项目管理实践', f'第 {i} 条合成摘要，用于基准测试。',
+             'high' if i % 3 == 0 else 'medium', ['人工智能', f'标签{i % 50}'], f'2026年{i % 12 + 1}月')
+            for i in range(count)]
+    cases = [(f'合成案例 {i}', f'公司{i % 200}', industries[i % 4], f'第 {i} 个合成案例描述，说明如何使用AI。',
+              ['效率提升30%', '成本降低20%'])
+             for i in range(count)]
+    return news, cases
+
+
+def build(kind, news, cases):
+    """用同一批字段值构造一种表示"""
+    if kind == 'dict':
+        return ([dict(zip(NewsItem.FIELDS, values)) for values in news],
+                [dict(zip(CaseItem.FIELDS, values)) for values in cases])
+    if kind == 'record':
+        return [NewsItem(*values) for values in news], [CaseItem(*values) for values in cases]
+    return (ItemColumns(NewsItem, (NewsItem(*values) for values in news)),
+            ItemColumns(CaseItem, (CaseItem(*values) for values in cases)))
+
+
+def bench_kind(kind, news, cases, workdir, render=True):
+    """构造并渲染一种表示，返回内存和耗时"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    news_items, case_items = build(kind, news, cases)
+    build_s = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'kind': kind,
+        'items': len(news) + len(cases),
+        'memory_mb': round(retained / 1024 / 1024, 1),
+        'bytes_per_item': round(retained / (len(news) + len(cases)), 1),
+        'build_s': round(build_s, 3),
+        'render_s': None,
+    }
+    if render:
+        data = {
+            'update_time': '2026年01月01日 10:30',
+            'news': news_items,
+            'cases': case_items,
+            'stats': {'news_count': len(news), 'case_count': len(cases)},
+        }
+        generator = DashboardGenerator(os.path.join(workdir, 'unused.json'), use_fragment_cache=False, data=data)
+        start = time.perf_counter()
+        generator.generate_html(output_file=f'bench_{kind}.html', force=True)
+        result['render_s'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='条目表示方式基准测试')
+    parser.add_argument('--count', type=int, default=1000000, help='条目总数（新闻和案例各一半）')
+    parser.add_argument('--skip-render', action='store_true', help='只测内存')
+    args = parser.parse_args()
+
+    news, cases = synthetic_fields(args.count // 2)
+    with tempfile.TemporaryDirectory() as workdir:
+        config.OUTPUT_DIR = workdir
+        results = [bench_kind(kind, news, cases, workdir, render=not args.skip_render)
+                   for kind in ('dict', 'record', 'columns')]
+
+    print(f"\n{'表示':>10} {'条目数':>10} {'内存(MB)':>10} {'字节/条':>10} {'构造(s)':>10} {'渲染(s)':>10}")
+    for r in results:
+        print(f"{r['kind']:>10} {r['items']:>10} {r['memory_mb']:>10} {r['bytes_per_item']:>10} "
+              f"{r['build_s']:>10} {r['render_s'] if r['render_s'] is not None else '-':>10}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+网页渲染基准测试
+用合成数据渲染不同规模的页面，记录耗时和渲染过程中的内存峰值
+
+用法: python benchmarks/bench_render.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from generate_html import DashboardGenerator
+
+
+def synthetic_data(count):
+    """生成 count 条新闻和 count 个案例的合成数据"""
+    news = [{
+        'title': f'合成新闻标题 {i}：大模型发布与项目管理实践',
+        'summary': f'第 {i} 条合成摘要，用于渲染基准测试。' * 3,
+        'priority': 'high' if i % 3 == 0 else 'medium',
+        'tags': ['人工智能', f'标签{i % 50}'],
+        'date': f'2026年{i % 12 + 1}月',
+    } for i in range(count)]
+    cases = [{
+        'title': f'合成案例 {i}',
+        'company': f'公司{i % 200}',
+        'industry': ['金融', '制造', '互联网', '医疗'][i % 4],
+        'description': f'第 {i} 个合成案例描述，说明如何使用AI。' * 2,
+        'impact': ['效率提升30%', '成本降低20%'],
+    } for i in range(count)]
+    return {
+        'update_time': '2026年01月01日 10:30',
+        'news': news,
+        'cases': cases,
+        'stats': {'news_count': count, 'case_count': count},
+    }
+
+
+def bench_size(count, workdir):
+    """渲染一次指定规模的页面，返回耗时和内存峰值"""
+    data_file = os.path.join(workdir, f'data_{count}.json')
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_data(count), f, ensure_ascii=False)
+
+    generator = DashboardGenerator(data_file, use_fragment_cache=False)
+
+    # 只统计渲染过程新增的内存，不含已加载的数据本身
+    tracemalloc.start()
+    start = time.perf_counter()
+    generator.generate_html(output_file=f'bench_{count}.html', force=True)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = os.path.getsize(os.path.join(config.OUTPUT_DIR, f'bench_{count}.html'))
+    return {
+        'items': count * 2,
+        'seconds': round(elapsed, 4),
+        'us_per_item': round(elapsed / (count * 2) * 1e6, 2),
+        'peak_kb': round(peak / 1024, 1),
+        'output_mb': round(size / 1024 / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='网页渲染基准测试')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='每类条目数，逗号分隔')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config.OUTPUT_DIR = workdir
+        results = [bench_size(int(size), workdir) for size in args.sizes.split(',')]
+
+    print(f"\n{'条目数':>10} {'耗时(s)':>10} {'µs/条':>10} {'内存峰值(KB)':>14} {'输出(MB)':>10}")
+    for r in results:
+        print(f"{r['items']:>10} {r['seconds']:>10} {r['us_per_item']:>10} {r['peak_kb']:>14} {r['output_mb']:>10}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
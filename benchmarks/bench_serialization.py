@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+数据序列化基准测试
+对每个后端测量写出、整体读取、逐条遍历和随机读取单条的耗时以及文件大小，
+并校验各后端读回的数据一致、json 与 orjson 的输出逐字节相同
+
+用法: python benchmarks/bench_serialization.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import serialization
+from bench_render import synthetic_data
+from serialization import dump_file, load_file
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_backend(name, data, workdir, samples=10):
+    """单个后端的各项耗时"""
+    path = os.path.join(workdir, f'data.{name}')
+    size, dump_s = timed(dump_file, path, data, name)
+
+    loaded, load_s = timed(load_file, path, name)
+    # 快照的 load 只解析头部，遍历时才解码条目
+    _, iterate_s = timed(lambda: sum(len(item) for item in loaded['news']) + sum(len(item) for item in loaded['cases']))
+
+    rng = random.Random(0)
+    count = len(data['news'])
+    picks = [rng.randrange(count) for _ in range(samples)]
+
+    def random_access():
+        # 每次都从文件重新打开，模拟只需要几条数据的读者
+        for index in picks:
+            load_file(path, name)['news'][index]
+    _, random_s = timed(random_access)
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return {
+        'backend': name,
+        'size_mb': round(size / 1024 / 1024, 2),
+        'dump_s': round(dump_s, 4),
+        'load_s': round(load_s, 4),
+        'iterate_s': round(iterate_s, 4),
+        'random_item_ms': round(random_s / samples * 1000, 3),
+    }, loaded, raw
+
+
+def bench_size(count, workdir):
+    """在一个数据规模下对比所有可用的后端"""
+    data = synthetic_data(count)
+    backends = ['json', 'snapshot'] + (['orjson'] if serialization.orjson is not None else [])
+    results, loaded, raw = [], {}, {}
+    for name in backends:
+        result, loaded[name], raw[name] = bench_backend(name, data, workdir)
+        result['items'] = count * 2
+        results.append(result)
+
+    # 一致性校验
+    for name in backends:
+        view = loaded[name]
+        restored = view.to_dict() if isinstance(view, serialization.Snapshot) else view
+        assert restored == data, f"{name} 读回的数据不一致"
+    if 'orjson' in raw:
+        assert raw['orjson'] == raw['json'], "orjson 与 json 的输出不同"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据序列化基准测试')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='每类条目数，逗号分隔')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes.split(','):
+            results.extend(bench_size(int(size), workdir))
+
+    print(f"\n{'条目数':>10} {'后端':>10} {'大小(MB)':>10} {'写出(s)':>10} {'读取(s)':>10} "
+          f"{'遍历(s)':>10} {'随机单条(ms)':>14}")
+    for r in results:
+        print(f"{r['items']:>10} {r['backend']:>10} {r['size_mb']:>10} {r['dump_s']:>10} {r['load_s']:>10} "
+              f"{r['iterate_s']:>10} {r['random_item_ms']:>14}")
+    print("✅ 各后端读回的数据一致")
+    return results
+
+
+if __name__ == '__main__':
+    main()
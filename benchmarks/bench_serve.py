@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+本地预览（serve --watch）刷新延迟基准测试
+在临时目录中准备一份较大的 data.json 和较长的历史库（含已生成的归档），启动监视模式的服务器并连上 SSE，
+反复修改 data.json 中的一条新闻（以及 touch 一次模板文件），测量从文件写入完成到浏览器收到 reload 事件的时间
+
+用法: python benchmarks/bench_serve.py --items 1000 --days 365 --edits 20
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import dev_server
+from history_store import HistoryStore
+from serialization import dump_file
+
+
+def make_data(count, rng):
+    news = [{'title': f'模拟新闻 {i}', 'summary': f'第 {i} 条摘要。' * 5, 'priority': rng.choice(['high', 'medium']),
+             'tags': ['大模型', f'标签{i % 9}'], 'date': '2026年10月'} for i in range(count)]
+    cases = [{'title': f'模拟案例 {i}', 'company': '公司', 'industry': '制造', 'description': '描述。' * 10,
+              'impact': ['效率提升 30%']} for i in range(count)]
+    return {'update_time': '2026年10月01日 10:30', 'news': news, 'cases': cases,
+            'stats': {'news_count': count, 'case_count': count}}
+
+
+def build_history(days, rng):
+    """历史库和归档目录（监视模式不重建归档，这里只需要它们存在）"""
+    store = HistoryStore(config.HISTORY_DB)
+    start = datetime(2026, 10, 1, 10, 30) - timedelta(days=days)
+    for day in range(days):
+        data = make_data(10, rng)
+        store.append_run(data['news'], data['cases'], start + timedelta(days=day))
+    store.close()
+    archive = os.path.join(config.OUTPUT_DIR, config.ARCHIVE_DIR)
+    os.makedirs(archive, exist_ok=True)
+    for day in range(days):
+        with open(os.path.join(archive, f'{day}.html'), 'w', encoding='utf-8') as f:
+            f.write('<html></html>')
+
+
+class EventClient:
+    """SSE 客户端：后台线程读取事件，记录收到每个 reload 事件的时间"""
+
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection('127.0.0.1', port)
+        self.conn.request('GET', dev_server.LIVE_RELOAD_PATH)
+        self.response = self.conn.getresponse()
+        self.received = threading.Event()
+        self.at = None
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.response:
+            if line.startswith(b'event: reload'):
+                self.at = time.perf_counter()
+                self.received.set()
+
+    def wait(self, timeout=10):
+        if not self.received.wait(timeout):
+            raise TimeoutError('没有收到 reload 事件')
+        self.received.clear()
+        return self.at
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地预览刷新延迟基准测试')
+    parser.add_argument('--items', type=int, default=1000, help='data.json 中的新闻和案例条数')
+    parser.add_argument('--days', type=int, default=365, help='历史库和归档的天数')
+    parser.add_argument('--edits', type=int, default=20, help='修改 data.json 的次数')
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        data = make_data(args.items, rng)
+        dump_file(config.DATA_FILE, data, config.DATA_BACKEND)
+        build_history(args.days, rng)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            renderer = dev_server.DevRenderer()
+            renderer.render()
+        live_reload = dev_server.LiveReload()
+        server = dev_server.start_server('127.0.0.1', 0, live_reload)
+        stop = threading.Event()
+
+        def quiet_watch():
+            with contextlib.redirect_stdout(io.StringIO()):
+                dev_server.watch(renderer, live_reload, config.SERVE_POLL_INTERVAL, stop)
+
+        watcher = threading.Thread(target=quiet_watch, daemon=True)
+        watcher.start()
+        time.sleep(0.2)
+        client = EventClient(server.server_address[1])
+
+        latencies = []
+        for edit in range(args.edits):
+            data['news'][rng.randrange(args.items)]['title'] = f'修改后的新闻 {edit}'
+            dump_file(config.DATA_FILE, data, config.DATA_BACKEND)
+            written = time.perf_counter()
+            latencies.append((client.wait() - written) * 1000)
+            time.sleep(config.SERVE_POLL_INTERVAL * 2)
+
+        template = os.path.join(ROOT, 'generate_html.py')
+        stat = os.stat(template)
+        try:
+            os.utime(template)
+            written = time.perf_counter()
+            template_latency = (client.wait() - written) * 1000
+        finally:
+            os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        stop.set()
+        watcher.join()
+        server.shutdown()
+        os.chdir(ROOT)
+
+    latencies.sort()
+    print(f"{args.items} 条新闻 + {args.items} 个案例，历史 {args.days} 天，轮询间隔 {config.SERVE_POLL_INTERVAL * 1000:.0f}ms")
+    print(f"修改 data.json → reload 事件: p50 {latencies[len(latencies) // 2]:.0f}ms，"
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.0f}ms，最大 {latencies[-1]:.0f}ms（{len(latencies)} 次）")
+    print(f"修改模板（重新加载模块，全部条目重新渲染）→ reload 事件: {template_latency:.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
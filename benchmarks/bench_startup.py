@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时测试
+用 `python -X importtime` 统计各子命令需要导入的模块耗时，
+校验 render 不导入 openai 且导入总耗时低于预算（超出时退出码为 1）
+
+用法: python benchmarks/bench_startup.py [--budget-ms 100] [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 各子命令执行时导入的模块（与 dashboard.py 中的延迟导入一致）
+COMMAND_IMPORTS = {
+    'render': ['dashboard', 'generate_html', 'build_search_index'],
+    'collect': ['dashboard', 'collect_content'],
+}
+# render 不应该导入的重量级模块
+FORBIDDEN = {'render': ['openai', 'httpx']}
+# 解释器启动时（python -c pass）就会导入的模块
+INTERPRETER_STARTUP = set()
+
+
+def importtime(modules):
+    """
+    在新进程中导入 modules，解析 -X importtime 的输出
+
+    Returns:
+        (总耗时 µs, {顶层模块: 累计耗时 µs}, 导入的全部模块名集合)
+    """
+    code = ';'.join(f'import {name}' for name in modules)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    top_level, imported = {}, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        imported.add(name.strip())
+        # 顶层导入没有缩进（'| ' 之后紧跟模块名）；site 等解释器自身的启动导入不计入
+        if not name[1:].startswith(' ') and name.strip() not in INTERPRETER_STARTUP:
+            top_level[name.strip()] = int(cumulative)
+    return sum(top_level.values()), top_level, imported
+
+
+def measure(command, runs):
+    """多次测量取中位数（第一次运行会写 .pyc，不计入）"""
+    importtime(COMMAND_IMPORTS[command])
+    samples = [importtime(COMMAND_IMPORTS[command]) for _ in range(runs)]
+    samples.sort(key=lambda sample: sample[0])
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='子命令启动耗时测试')
+    parser.add_argument('--budget-ms', type=float, default=100.0, help='render 导入耗时上限（毫秒）')
+    parser.add_argument('--runs', type=int, default=5, help='每个子命令测量次数')
+    args = parser.parse_args()
+
+    INTERPRETER_STARTUP.update(importtime([])[1])
+    failures = []
+    for command in COMMAND_IMPORTS:
+        total, top_level, imported = measure(command, args.runs)
+        print(f"\n⏱️  {command}: 导入耗时 {total / 1000:.1f} ms")
+        for name, us in sorted(top_level.items(), key=lambda pair: -pair[1])[:5]:
+            print(f"    {name:<24} {us / 1000:>8.1f} ms")
+
+        leaked = [name for name in FORBIDDEN.get(command, []) if name in imported]
+        if leaked:
+            failures.append(f"{command} 导入了 {', '.join(leaked)}")
+        if command == 'render' and total > args.budget_ms * 1000:
+            failures.append(f"render 导入耗时 {total / 1000:.1f} ms 超过预算 {args.budget_ms} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print(f"\n✅ render 未导入 openai，导入耗时在 {args.budget_ms} ms 以内")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
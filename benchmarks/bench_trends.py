@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+趋势汇总基准测试
+按天生成不同长度的历史（每天 1~2 次运行，同一天重跑以最后一次为准），分别测量：
+追加一次运行（含增量更新汇总）、从汇总表读取趋势并渲染面板、以及直接从原始历史重新统计同样趋势的耗时。
+前两项应与历史长度无关，重新统计随历史线性变慢
+
+用法: python benchmarks/bench_trends.py --days 30,365,1825 --per-day 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_html import DashboardGenerator
+from history_store import HistoryStore, trend_periods
+
+TAGS = ['大模型', '开源', '芯片', '监管', '融资', '智能体', '多模态', '项目管理', '风险管理', '自动化']
+INDUSTRIES = ['制造', '金融', '医疗', '零售', '建筑', '能源']
+
+
+def make_run(rng, per_day):
+    news = [{'title': f'新闻 {rng.random()}', 'summary': '摘要', 'priority': rng.choice(['high', 'medium']),
+             'tags': rng.sample(TAGS, 3), 'date': '2026年1月'} for _ in range(per_day)]
+    cases = [{'title': f'案例 {rng.random()}', 'company': '公司', 'industry': rng.choice(INDUSTRIES),
+              'description': '描述', 'impact': ['效率提升']} for _ in range(per_day // 2)]
+    return news, cases
+
+
+def build(days, per_day, seed):
+    """days 天的内存历史库，返回 (store, 最后一天)"""
+    rng = random.Random(seed)
+    store = HistoryStore(':memory:')
+    start = datetime(2026, 10, 1, 10, 30) - timedelta(days=days)
+    for day in range(days):
+        for rerun in range(rng.choice([1, 1, 2])):
+            store.append_run(*make_run(rng, per_day), start + timedelta(days=day, minutes=rerun))
+    return store, start + timedelta(days=days)
+
+
+def recompute(store, weeks, today):
+    """不用汇总表：从原始历史重新统计每周条数、重要占比、标签和行业"""
+    first = datetime.strptime(trend_periods(today.strftime('%Y-%m-%d'))['week'], '%Y-%m-%d')
+    first -= timedelta(weeks=weeks - 1)
+    result = {'weeks': {}, 'tags': {}, 'industries': {}}
+    for run_day, run_id in store.daily_runs():
+        week = trend_periods(run_day)['week']
+        rows = store.conn.execute('SELECT priority FROM news WHERE run_id = ?', (run_id,)).fetchall()
+        entry = result['weeks'].setdefault(week, [0, 0])
+        entry[0] += len(rows)
+        entry[1] += sum(row['priority'] == 'high' for row in rows)
+        for row in store.conn.execute('SELECT tag FROM news_tags JOIN news ON news.id = news_tags.news_id '
+                                      'WHERE news.run_id = ?', (run_id,)):
+            key = (week, row['tag'])
+            result['tags'][key] = result['tags'].get(key, 0) + 1
+        for row in store.conn.execute('SELECT industry FROM cases WHERE run_id = ?', (run_id,)):
+            key = (week, row['industry'])
+            result['industries'][key] = result['industries'].get(key, 0) + 1
+    # 与汇总表一样只保留窗口内的周，但统计时仍要扫完整个历史
+    week_keys = {(first + timedelta(weeks=n)).strftime('%Y-%m-%d') for n in range(weeks)}
+    result['weeks'] = {week: value for week, value in result['weeks'].items() if week in week_keys}
+    return result
+
+
+def best_of(func, rounds=5):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='趋势汇总基准测试')
+    parser.add_argument('--days', default='30,365,1825', help='历史天数，逗号分隔')
+    parser.add_argument('--per-day', type=int, default=10, help='每次运行的新闻条数（案例为一半）')
+    parser.add_argument('--weeks', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    generator = DashboardGenerator(data={}, use_fragment_cache=False)
+    rng = random.Random(args.seed)
+    print(f"{'历史天数':>8} {'汇总行数':>8} {'追加(ms)':>9} {'趋势+渲染(ms)':>14} {'重新统计(ms)':>13}")
+    for days in (int(n) for n in args.days.split(',')):
+        store, today = build(days, args.per_day, args.seed)
+        rows = sum(store.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                   for table in ('trend_priorities', 'trend_tags', 'trend_industries'))
+        minute = iter(range(1, 10000))
+        append = best_of(lambda: store.append_run(*make_run(rng, args.per_day),
+                                                  today + timedelta(minutes=next(minute))))
+        render = best_of(lambda: generator.trends_html(store.trends(args.weeks, today=today)))
+        raw = best_of(lambda: recompute(store, args.weeks, today), rounds=3)
+        print(f"{days:>8} {rows:>8} {append:>9.2f} {render:>14.2f} {raw:>13.1f}")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+本地模拟的 DashScope 兼容模式接口（POST .../chat/completions）
+用于在不消耗通义千问额度的情况下测量采集性能
+
+支持：可配置的延迟分布、流式（SSE）响应、错误注入、预置的新闻/案例 JSON、
+批量提示词（返回以任务编号为键的对象）、按 max_tokens 截断、级联模式的精写请求、
+每次都会出现的"老新闻"（--repeat-ratio，增量提示词中列为已收录的换成新条目）、
+不规范的 JSON（--malformed-rate：尾随逗号、弯引号、Python 字面量）；
+联网搜索的请求在 prompt_tokens 里额外计入搜索结果的 token（与实际计费方式一致）
+
+用法: python benchmarks/mock_qwen_server.py --port 8765 --latency lognormal:2.0:0.5 --error-rate 0.1
+然后: QWEN_API_BASE=http://127.0.0.1:8765/v1 QWEN_API_KEY=mock python collect_content.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 用于拼出互不相似的标题，避免被近似去重合并
+_COMPANIES = ['OpenAI', 'Google', 'Anthropic', 'Meta', 'Microsoft', 'NVIDIA', '阿里云', '百度', '腾讯', '字节跳动',
+              '华为', '深度求索', '月之暗面', '智谱', 'Mistral', 'Apple', 'Amazon', 'IBM', 'Salesforce', 'Atlassian']
+# 级联模式精写提示词中的条目编号
+_REFINE_ID = re.compile(r'"id": ?(\d+)')
+
+# 批量提示词中的任务行，如: q1. [新闻] 搜索关于"..."的最新AI动态新闻，找到5条
+_BATCH_TASK = re.compile(r'^(q\d+)\. \[(新闻|案例)\].*?找到(\d+)', re.MULTILINE)
+
+_SUBJECTS = ['推理模型', '多模态助手', '代码智能体', '语音合成', '企业知识库', '芯片集群', '开源权重', '安全评测',
+             '排期优化', '风险预警', '需求分析', '文档生成', '视频理解', '机器人控制', '搜索引擎', '数据标注']
+
+
+def _title(rng, suffix):
+    return f'{rng.choice(_COMPANIES)}{rng.choice(["发布", "推出", "开源", "升级", "收购"])}{rng.choice(_SUBJECTS)}{suffix}'
+
+
+def canned_news(count, seed=0):
+    """预置的新闻条目"""
+    rng = random.Random(seed)
+    return [{
+        'title': _title(rng, f' #{seed}.{i}'),
+        'summary': f'这是第 {i} 条模拟新闻摘要，用于本地基准测试。它说明了要点和对项目管理的影响。',
+        'priority': 'high' if i % 3 == 0 else 'medium',
+        'tags': ['人工智能', f'模拟{i % 5}'],
+        'date': f'2026年{i % 12 + 1}月'
+    } for i in range(count)]
+
+
+def canned_cases(count, seed=0):
+    """预置的案例条目"""
+    rng = random.Random(-seed - 1)
+    return [{
+        'title': _title(rng, f'实践 #{seed}.{i}'),
+        'company': rng.choice(_COMPANIES),
+        'industry': ['金融', '制造', '互联网'][i % 3],
+        'description': f'第 {i} 个模拟案例，说明如何在项目管理中使用AI。',
+        'impact': ['效率提升30%', '延期减少20%']
+    } for i in range(count)]
+
+
+def malform(content):
+    """把标准 JSON 改成大模型常见的不规范写法：对象和数组末尾加逗号、title 键用弯引号"""
+    content = re.sub(r'(["\]])(\s*[}\]])', r'\1,\2', content)
+    return content.replace('"title"', '“title”').replace(': true', ': True')
+
+
+def with_repeats(make, count, seed, task, prompt, ratio):
+    """
+    把前 ratio 比例的条目换成该查询每次都会返回的老条目（按任务文本固定）；
+    提示词里列为已收录的老条目换成新条目（模拟模型遵守增量提示词，继续搜索更新的内容）
+    """
+    repeats = int(round(count * ratio))
+    if not repeats:
+        return make(count, seed=seed)
+    known = prompt.split('已经收录', 1)[1] if '已经收录' in prompt else ''
+    recurring = make(repeats, seed=10 ** 6 + zlib.crc32(task.encode('utf-8')) % 10 ** 6)
+    recurring = [item for item in recurring if item['title'][:16] not in known]
+    return recurring + make(count - len(recurring), seed=seed)
+
+
+class LatencyModel:
+    """
+    延迟分布，格式:
+        fixed:秒
+        uniform:最小:最大
+        lognormal:中位数:sigma
+    """
+
+    def __init__(self, spec='fixed:0.05', seed=None):
+        kind, *params = spec.split(':')
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"未知的延迟分布: {spec}")
+
+    def sample(self):
+        with self._lock:
+            if self.kind == 'fixed':
+                return self.params[0]
+            if self.kind == 'uniform':
+                return self.rng.uniform(self.params[0], self.params[1])
+            median, sigma = self.params
+            return self.rng.lognormvariate(0, sigma) * median
+
+
+class MockState:
+    """服务器共享状态：配置和请求计数"""
+
+    def __init__(self, latency='fixed:0.05', error_rate=0.0, error_status=429,
+                 items_per_response=None, stream_chunk=24, search_tokens=1500, repeat_ratio=0.0,
+                 malformed_rate=0.0, seed=None):
+        self.latency = LatencyModel(latency, seed)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.items_per_response = items_per_response
+        self.stream_chunk = stream_chunk
+        self.search_tokens = search_tokens
+        self.repeat_ratio = repeat_ratio
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def next_request(self):
+        """登记一次请求，返回 (序号, 是否注入错误)"""
+        with self.lock:
+            self.requests += 1
+            fail = self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return self.requests, fail
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """处理 /chat/completions 请求"""
+
+    server_version = 'MockDashScope/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        state = self.server.state
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._send_json(404, {'error': {'message': 'not found'}})
+
+        seq, fail = state.next_request()
+        time.sleep(state.latency.sample())
+        if fail:
+            return self._send_json(state.error_status, {
+                'error': {'message': 'injected error', 'type': 'mock_error', 'code': str(state.error_status)}
+            })
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        content = json.dumps(self._payload(prompt, seq), ensure_ascii=False)
+        with state.lock:
+            malformed = state.rng.random() < state.malformed_rate
+        if malformed:
+            content = malform(content)
+        finish_reason = 'stop'
+        # 模拟的 token 数按字符计
+        if body.get('max_tokens') and len(content) > body['max_tokens']:
+            content = content[:body['max_tokens']]
+            finish_reason = 'length'
+        prompt_tokens = len(prompt)
+        if body.get('enable_search'):
+            prompt_tokens += state.search_tokens
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(content),
+            'total_tokens': prompt_tokens + len(content)
+        }
+        if body.get('stream'):
+            return self._send_stream(body.get('model', 'mock'), content, usage, finish_reason)
+        return self._send_json(200, {
+            'id': f'mock-{seq}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': f'```json\n{content}\n```'},
+                'finish_reason': finish_reason
+            }],
+            'usage': usage
+        })
+
+    def _payload(self, prompt, seq):
+        """按提示词判断内容类型，返回预置条目"""
+        first_line = prompt.split('\n', 1)[0]
+        if first_line.startswith('以下是联网搜索得到的'):
+            items = prompt.split('\n\n')[1]  # 只取条目段落，不含格式示例
+            return self._refined(first_line, [int(n) for n in _REFINE_ID.findall(items)])
+        state = self.server.state
+        count = state.items_per_response
+        batch = _BATCH_TASK.finditer(prompt)
+        batch = [(match.group(0).split('. ', 1)[1], *match.groups()) for match in batch]
+        if batch:
+            return {key: with_repeats(canned_cases if kind == '案例' else canned_news, count or int(n),
+                                      seq * 100 + i, task, prompt, state.repeat_ratio)
+                    for i, (task, key, kind, n) in enumerate(batch)}
+        wanted = re.search(r'找到(\d+)', prompt)
+        count = count or (int(wanted.group(1)) if wanted else 5)
+        make = canned_cases if '案例' in first_line else canned_news
+        return with_repeats(make, count, seq, first_line, prompt, state.repeat_ratio)
+
+    def _refined(self, first_line, ids):
+        """精写请求：按编号返回改写后的字段"""
+        if '案例' in first_line:
+            return [{'id': n, 'industry': '金融科技', 'description': f'精写后的案例描述 {n}，说明如何使用AI。',
+                     'impact': ['交付周期缩短25%', '风险识别率提升40%']} for n in ids]
+        return [{'id': n, 'summary': f'精写后的新闻摘要 {n}，说明要点和对项目管理的影响。',
+                 'priority': 'high' if n % 2 == 0 else 'medium', 'tags': ['人工智能', '项目管理']} for n in ids]
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model, content, usage, finish_reason='stop'):
+        """以 SSE 分块发送，和兼容模式的流式格式一致"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        chunk_size = self.server.state.stream_chunk
+        pieces = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+        for index, piece in enumerate(pieces):
+            chunk = {
+                'id': 'mock-stream',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': piece},
+                             'finish_reason': finish_reason if index == len(pieces) - 1 else None}]
+            }
+            if index == len(pieces) - 1:
+                chunk['usage'] = usage
+            try:
+                self.wfile.write(f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'.encode('utf-8'))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+        try:
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(port=0, **options):
+    """
+    在后台线程启动模拟服务器
+
+    Returns:
+        tuple: (server, base_url)，用 server.shutdown() 关闭
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='模拟的 DashScope 兼容模式接口')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='fixed:0.05', help='fixed:秒 | uniform:最小:最大 | lognormal:中位数:sigma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='注入错误的比例（0~1）')
+    parser.add_argument('--error-status', type=int, default=429, help='注入错误时的 HTTP 状态码')
+    parser.add_argument('--items', type=int, default=None, help='每次响应的条目数（默认按提示词要求的条数）')
+    parser.add_argument('--search-tokens', type=int, default=1500, help='联网搜索请求额外计入的提示词 token')
+    parser.add_argument('--repeat-ratio', type=float, default=0.0, help='每次响应中重复出现的老条目比例（0~1）')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='返回不规范 JSON 的响应比例（0~1）')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, latency=args.latency, error_rate=args.error_rate,
+                                    error_status=args.error_status, items_per_response=args.items,
+                                    search_tokens=args.search_tokens, repeat_ratio=args.repeat_ratio,
+                                    malformed_rate=args.malformed_rate,
+                                    seed=args.seed)
+    print(f"🧪 模拟服务器已启动: {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试套件
+1. 启动本地模拟的 DashScope 接口，通过 QWEN_API_BASE 让 AINewsCollector 端到端跑完整个采集流程
+2. 在多个数据规模下测量 DashboardGenerator 的渲染耗时
+结果写成 JSON，便于在不同提交之间比较
+
+用法: python benchmarks/run_suite.py --latency lognormal:0.5:0.4 --error-rate 0.1 --output result.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_qwen_server import start_server
+
+# 采集场景：(名称, 配置覆盖)
+SCENARIOS = [
+    ('sequential', {'CONCURRENT_MODE': False, 'STREAM_MODE': False}),
+    ('concurrent', {'CONCURRENT_MODE': True, 'STREAM_MODE': False}),
+    ('concurrent_stream', {'CONCURRENT_MODE': True, 'STREAM_MODE': True}),
+    ('batched', {'CONCURRENT_MODE': True, 'STREAM_MODE': False, 'BATCH_MODE': True}),
+    ('cascade', {'CONCURRENT_MODE': True, 'STREAM_MODE': False, 'CASCADE_MODE': True}),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+@contextlib.contextmanager
+def overrides(module, values):
+    """临时修改模块属性"""
+    saved = {key: getattr(module, key) for key in values}
+    for key, value in values.items():
+        setattr(module, key, value)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            setattr(module, key, value)
+
+
+def bench_collect(name, settings, server, repeat):
+    """在临时目录里端到端运行一次采集（不使用缓存），返回耗时统计"""
+    import config
+    from collect_content import AINewsCollector
+
+    timings = []
+    news_count = case_count = 0
+    requests_before = server.state.requests
+    errors_before = server.state.errors
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as workdir, overrides(config, settings):
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    collector = AINewsCollector(use_cache=False)
+                    news, cases = collector.collect_all()
+                    collected = time.perf_counter()
+                    collector.save_data(news, cases)
+                    saved = time.perf_counter()
+            finally:
+                os.chdir(cwd)
+        cost = collector.metrics.snapshot()['cost']
+        timings.append({'collect_s': collected - start, 'save_s': saved - collected,
+                        'cost': sum(entry['cost'] for entry in cost.values())})
+        news_count, case_count = len(news), len(cases)
+
+    collect = sorted(t['collect_s'] for t in timings)
+    return {
+        'scenario': name,
+        'settings': settings,
+        'repeat': repeat,
+        'collect_s_median': round(collect[len(collect) // 2], 4),
+        'collect_s_min': round(collect[0], 4),
+        'collect_s_max': round(collect[-1], 4),
+        'save_s_median': round(sorted(t['save_s'] for t in timings)[len(timings) // 2], 4),
+        'cost_median': round(sorted(t['cost'] for t in timings)[len(timings) // 2], 6),
+        'news': news_count,
+        'cases': case_count,
+        'requests': server.state.requests - requests_before,
+        'injected_errors': server.state.errors - errors_before,
+    }
+
+
+def bench_render(sizes):
+    """在临时目录中按不同规模渲染"""
+    import config
+    from bench_render import bench_size
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, overrides(config, {'OUTPUT_DIR': workdir}):
+        for size in sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(bench_size(size, workdir))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='采集/渲染基准测试套件')
+    parser.add_argument('--latency', default='lognormal:0.3:0.5', help='模拟接口延迟分布，见 mock_qwen_server.py')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=429)
+    parser.add_argument('--rps', type=float, default=None, help='覆盖 RATE_LIMIT_RPS（默认使用 config 的值）')
+    parser.add_argument('--repeat', type=int, default=3, help='每个采集场景重复次数')
+    parser.add_argument('--sizes', default='100,1000,10000', help='渲染规模（每类条目数），逗号分隔')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='结果文件，默认 benchmarks/results/<commit>.json')
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, error_rate=args.error_rate,
+                                    error_status=args.error_status, seed=args.seed)
+    # config 在导入时读取环境变量，必须先设置再导入
+    os.environ['QWEN_API_BASE'] = base_url
+    os.environ['QWEN_API_KEY'] = 'mock'
+    import config
+    config.QWEN_API_BASE = base_url
+    config.QWEN_API_KEY = 'mock'
+
+    print(f"🧪 模拟服务器: {base_url}（延迟 {args.latency}，错误率 {args.error_rate}）")
+    rate_override = {'RATE_LIMIT_RPS': args.rps} if args.rps else {}
+    collect_results = []
+    for name, settings in SCENARIOS:
+        result = bench_collect(name, dict(settings, **rate_override), server, args.repeat)
+        collect_results.append(result)
+        print(f"  📡 {name:<18} 采集 {result['collect_s_median']:.3f}s（中位数）"
+              f" 新闻 {result['news']} 案例 {result['cases']} 请求 {result['requests']}"
+              f" 费用 ¥{result['cost_median']:.4f}")
+    server.shutdown()
+
+    render_results = bench_render([int(size) for size in args.sizes.split(',')])
+    for r in render_results:
+        print(f"  🎨 渲染 {r['items']:>7} 条: {r['seconds']:.3f}s，内存峰值 {r['peak_kb']} KB")
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'mock': {'latency': args.latency, 'error_rate': args.error_rate, 'error_status': args.error_status},
+        'collect': collect_results,
+        'render': render_results,
+    }
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 结果已写入 {output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
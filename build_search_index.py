@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 站内搜索索引
+在 generate_html.py 之后运行：基于 docs/data 的 JSON 分片构建倒排索引
+
+- 中文按相邻两字（bigram）切分，英文/数字按词切分
+- 词项按 FNV-1a 哈希分到固定数量的分片，页面只加载查询用到的分片
+- 倒排表按文档号升序做差分编码，再以 36 进制写成逗号分隔的字符串
+"""
+
+import json
+import os
+import re
+import assets
+import config
+from generate_html import write_json_if_changed
+
+# 中文连续片段 / 英文数字单词
+_TOKEN_PATTERN = re.compile(r'[㐀-鿿豈-﫿]+|[a-z0-9]+')
+
+_FNV_OFFSET = 0x811c9dc5
+_FNV_PRIME = 0x01000193
+
+# 页面端的搜索脚本（与 tokenize/fnv1a/encode_postings 保持一致）
+SEARCH_JS = r"""(function () {
+  var script = document.currentScript;
+  var base = script.getAttribute('data-base') || '';
+  var box = document.getElementById('search-box');
+  var out = document.getElementById('search-results');
+  var cache = {};
+  var manifest = null;
+
+  function load(url) {
+    if (!cache[url]) cache[url] = fetch(base + url).then(function (r) { return r.json(); });
+    return cache[url];
+  }
+  function fnv1a(text) {
+    var bytes = new TextEncoder().encode(text), h = 0x811c9dc5;
+    for (var i = 0; i < bytes.length; i++) { h ^= bytes[i]; h = Math.imul(h, 0x01000193) >>> 0; }
+    return h >>> 0;
+  }
+  function tokenize(text) {
+    var tokens = [], parts = (text || '').toLowerCase().match(/[㐀-鿿豈-﫿]+|[a-z0-9]+/g) || [];
+    parts.forEach(function (p) {
+      if (!/[㐀-鿿豈-﫿]/.test(p) || p.length === 1) { tokens.push(p); return; }
+      for (var i = 0; i < p.length - 1; i++) tokens.push(p.substr(i, 2));
+    });
+    return Array.from(new Set(tokens));
+  }
+  function decode(text) {
+    var cur = 0;
+    return text.split(',').map(function (d) { cur += parseInt(d, 36); return cur; });
+  }
+  function intersect(a, b) {
+    var out = [], i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+      if (a[i] === b[j]) { out.push(a[i]); i++; j++; } else if (a[i] < b[j]) i++; else j++;
+    }
+    return out;
+  }
+  function escape(text) {
+    return String(text).replace(/[&<>"]/g, function (c) { return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]; });
+  }
+  async function search(query) {
+    var tokens = tokenize(query);
+    if (!tokens.length) { out.innerHTML = ''; return; }
+    manifest = manifest || await load('search/manifest.json');
+    var lists = await Promise.all(tokens.map(async function (t) {
+      var shard = await load('search/' + manifest.prefix + (fnv1a(t) % manifest.shards).toString(16).padStart(2, '0') + '.json');
+      return shard[t] ? decode(shard[t]) : [];
+    }));
+    lists.sort(function (a, b) { return a.length - b.length; });
+    var docs = lists.reduce(intersect).reverse().slice(0, manifest.max_results);
+    var items = await Promise.all(docs.map(async function (doc) {
+      var kind = doc % 2 === 0 ? 'news' : 'cases', pos = doc >> 1;
+      var file = kind + '-' + String(Math.floor(pos / manifest.doc_shard_size)).padStart(5, '0') + '.json';
+      var shard = await load(manifest.doc_dir + '/' + file);
+      return shard.items[pos % manifest.doc_shard_size];
+    }));
+    out.innerHTML = items.length ? items.map(function (item) {
+      var meta = item.company ? item.company + ' · ' + item.industry : (item.tags || []).join(' · ');
+      return '<div class="search-hit"><a href="' + manifest.archive_dir + '/' + item.run_day + '.html">' +
+        escape(item.title) + '</a><span>' + escape(item.run_day + ' · ' + meta) + '</span></div>';
+    }).join('') : '<div class="search-hit">没有找到相关内容</div>';
+  }
+  var timer = null;
+  box.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { search(box.value); }, 150);
+  });
+})();
+"""
+
+
+def tokenize(text):
+    """中文 bigram + 英文单词切分，返回去重后的词项集合"""
+    tokens = set()
+    for part in _TOKEN_PATTERN.findall((text or '').lower()):
+        if part.isascii() or len(part) == 1:
+            tokens.add(part)
+        else:
+            tokens.update(part[i:i + 2] for i in range(len(part) - 1))
+    return tokens
+
+
+def fnv1a(text):
+    """32 位 FNV-1a 哈希（UTF-8 字节），与页面脚本一致"""
+    h = _FNV_OFFSET
+    for byte in text.encode('utf-8'):
+        h = ((h ^ byte) * _FNV_PRIME) & 0xffffffff
+    return h
+
+
+def encode_postings(doc_ids):
+    """升序文档号 -> 差分编码的 36 进制字符串"""
+    parts, prev = [], 0
+    for doc_id in doc_ids:
+        parts.append(_base36(doc_id - prev))
+        prev = doc_id
+    return ','.join(parts)
+
+
+def _base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    if number == 0:
+        return '0'
+    out = []
+    while number:
+        number, rem = divmod(number, 36)
+        out.append(digits[rem])
+    return ''.join(reversed(out))
+
+
+def item_text(kind, item):
+    """参与索引的字段：新闻的标题、摘要、标签；案例的标题、公司、行业"""
+    if kind == 'news':
+        return ' '.join([item.get('title', ''), item.get('summary', '')] + list(item.get('tags', [])))
+    return ' '.join([item.get('title', ''), item.get('company', ''), item.get('industry', '')])
+
+
+def iter_documents(data_dir):
+    """
+    按清单遍历 JSON 分片中的所有条目
+
+    文档号: 第 i 条新闻为 2i，第 i 个案例为 2i+1，历史只追加，文档号永远不变
+
+    Yields:
+        tuple: (doc_id, kind, item)
+    """
+    with open(os.path.join(data_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    for kind, parity in (('news', 0), ('cases', 1)):
+        position = 0
+        for shard in manifest[kind]['shards']:
+            with open(os.path.join(data_dir, shard['file']), 'r', encoding='utf-8') as f:
+                for item in json.load(f)['items']:
+                    yield position * 2 + parity, kind, item
+                    position += 1
+
+
+def build_search_index(output_dir=None):
+    """
+    构建搜索索引并写入 <OUTPUT_DIR>/search/
+
+    Returns:
+        dict: 统计信息，没有 JSON 分片时返回 None
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    data_dir = os.path.join(output_dir, config.SHARD_DIR)
+    if not os.path.exists(os.path.join(data_dir, 'manifest.json')):
+        print(f"⚠️  没有找到 JSON 分片清单，跳过搜索索引: {data_dir}")
+        return None
+
+    postings = {}
+    doc_count = 0
+    for doc_id, kind, item in iter_documents(data_dir):
+        doc_count += 1
+        for token in tokenize(item_text(kind, item)):
+            postings.setdefault(token, []).append(doc_id)
+
+    shard_count = config.SEARCH_SHARD_COUNT
+    shards = [dict() for _ in range(shard_count)]
+    # tokenize 返回集合，迭代顺序随 PYTHONHASHSEED 变化；按词项排序，内容不变时分片文件逐字节相同
+    for token in sorted(postings):
+        shards[fnv1a(token) % shard_count][token] = encode_postings(sorted(postings[token]))
+
+    search_dir = os.path.join(output_dir, 'search')
+    os.makedirs(search_dir, exist_ok=True)
+    written = 0
+    for number, shard in enumerate(shards):
+        written += write_json_if_changed(os.path.join(search_dir, f'idx-{number:02x}.json'), shard)
+
+    write_json_if_changed(os.path.join(search_dir, 'manifest.json'), {
+        'shards': shard_count,
+        'prefix': 'idx-',
+        'docs': doc_count,
+        'doc_dir': config.SHARD_DIR,
+        'doc_shard_size': config.SHARD_SIZE,
+        'archive_dir': config.ARCHIVE_DIR,
+        'max_results': config.SEARCH_MAX_RESULTS
+    })
+    written += write_text_if_changed(os.path.join(search_dir, 'search.js'), SEARCH_JS)
+    if config.ASSETS_PRECOMPRESS:
+        assets.precompress_tree(output_dir)
+
+    return {'docs': doc_count, 'tokens': len(postings), 'shards': shard_count, 'written': written}
+
+
+def write_text_if_changed(path, text):
+    """内容不变时不写，保持时间戳（预压缩副本据此跳过）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+
+def search_box_html(base=''):
+    """页面上的搜索框和脚本引用（base 为页面到 OUTPUT_DIR 根目录的相对路径）"""
+    return (f'\n            <div class="search-panel">'
+            f'<input id="search-box" class="search-box" type="search" placeholder="🔍 搜索历史动态和案例...">'
+            f'<div id="search-results" class="search-results"></div></div>'
+            f'\n            <script src="{base}search/search.js" data-base="{base}" defer></script>')
+
+
+def main():
+    """主函数"""
+    print("\n" + "=" * 60)
+    print("🔎 构建搜索索引...")
+    print("=" * 60)
+
+    stats = build_search_index()
+    if stats:
+        print(f"✅ 索引完成: {stats['docs']} 篇文档，{stats['tokens']} 个词项，"
+              f"{stats['shards']} 个分片（本次写入 {stats['written']} 个）")
+    return stats
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 大模型响应缓存
+磁盘持久化，按 CACHE_EXPIRE_HOURS 过期，按条数做 LRU 淘汰
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class ResponseCache:
+    """磁盘上的响应缓存，每个条目一个 JSON 文件"""
+
+    def __init__(self, cache_dir, expire_hours=24, max_entries=256):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            expire_hours: 过期时间（小时）
+            max_entries: 最多保留的条目数，超出后淘汰最久未使用的条目
+        """
+        self.cache_dir = cache_dir
+        self.ttl = expire_hours * 3600
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts):
+        """由任意可 JSON 序列化的部分生成缓存键"""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def get(self, key):
+        """
+        读取缓存
+
+        Returns:
+            缓存的值；不存在、已过期或已损坏时返回 None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry.get('created', 0) > self.ttl:
+            self._remove(path)
+            return None
+
+        # 用文件修改时间记录最近访问，供 LRU 淘汰使用
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def set(self, key, value):
+        """写入缓存（原子写入：先写临时文件再替换）"""
+        entry = {'created': time.time(), 'value': value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+
+            overflow = len(entries) - self.max_entries
+            if overflow <= 0:
+                return
+            entries.sort()
+            for _, path in entries[:overflow]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
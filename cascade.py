@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 模型级联的本地初筛
+便宜模型联网搜索出的候选条目在本地去重后按启发式打分排序，
+只有排在前面的条目才交给 qwen-max 精写
+"""
+
+from datetime import datetime, timedelta
+from history_store import normalize_date
+
+# 与项目管理相关的关键词，命中越多越优先
+PM_KEYWORDS = ['项目管理', '项目', '排期', '进度', '风险', '资源', '协作', '交付', '敏捷', '团队',
+               '效率', '自动化', '智能体', 'agent', 'project', 'management', 'workflow', 'planning']
+
+# 精写阶段由 qwen-max 改写的字段（标题、日期、公司保持初筛结果，与去重索引一致）
+REFINE_FIELDS = {
+    'news': ('summary', 'priority', 'tags'),
+    'case': ('industry', 'description', 'impact'),
+}
+
+
+def triage_score(item, content_type, today=None):
+    """
+    候选条目的本地排序分
+
+    新闻：高优先级 +3，近 90 天 +2（近一年 +1），每命中一个项目管理关键词 +1；
+    案例：每条带数字的量化效果 +1（最多 3），每命中一个项目管理关键词 +1。
+
+    Args:
+        item: 候选条目
+        content_type: 'news' 或 'case'
+        today: 当前时间（datetime），默认现在
+
+    Returns:
+        int: 分数，越高越优先
+    """
+    today = today or datetime.now()
+    fields = ('title', 'summary') if content_type == 'news' else ('title', 'description')
+    text = ' '.join(str(item.get(field, '')) for field in fields).lower()
+    score = sum(1 for keyword in PM_KEYWORDS if keyword in text)
+
+    if content_type == 'news':
+        if item.get('priority') == 'high':
+            score += 3
+        date_key = normalize_date(item.get('date'), default='')
+        if date_key >= (today - timedelta(days=90)).strftime('%Y-%m-%d'):
+            score += 2
+        elif date_key >= (today - timedelta(days=365)).strftime('%Y-%m-%d'):
+            score += 1
+    else:
+        quantified = [effect for effect in item.get('impact', []) if any(ch.isdigit() for ch in str(effect))]
+        score += min(3, len(quantified))
+    return score
@@ -4,44 +4,36 @@ AI+项目管理信息面板 - 内容搜索和抓取
 使用阿里云通义千问API（启用联网搜索）
 """
 
+import argparse
+import contextlib
+import copy
+import hashlib
 import json
+import threading
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from openai import OpenAI
 import config
+from batching import BatchPlanner
+from cache import ResponseCache
+from cascade import REFINE_FIELDS, triage_score
+from delta import DeltaContext
+from history_store import HistoryStore
+from json_salvage import salvage_json
+from json_stream import JSONObjectStreamParser
+from keyword_scheduler import KeywordScheduler
+from metrics import MetricsRecorder, timed_stage
+from near_dup import NearDuplicateIndex, write_report
+from rate_limiter import TokenBucket
+from records import validate_items
+from serialization import dump_file
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, ResilientCaller
 
-class AINewsCollector:
-    """AI新闻和案例收集器"""
-    
-    def __init__(self):
-        """初始化API客户端"""
-        if not config.QWEN_API_KEY:
-            raise ValueError("未设置 QWEN_API_KEY，请检查配置")
-        
-        self.client = OpenAI(
-            api_key=config.QWEN_API_KEY,
-            base_url=config.QWEN_API_BASE
-        )
-        self.model = config.QWEN_MODEL
-        print(f"✅ 使用模型: {self.model}")
-    
-    def search_and_summarize(self, query, content_type='news', count=5):
-        """
-        搜索并总结内容（启用联网搜索）
-        
-        Args:
-            query: 搜索查询
-            content_type: 'news' 或 'case'
-            count: 需要的条数
-        
-        Returns:
-            list: 总结后的内容列表
-        """
-        try:
-            # 构建提示词
-            if content_type == 'news':
-                prompt = f"""请搜索关于"{query}"的最新AI动态新闻（2025-2026年）。
+# 系统提示词
+SYSTEM_PROMPT = '你是一个专业的AI信息分析师。你必须使用联网搜索功能获取最新的真实信息，然后用中文总结。不要编造内容。'
+
+# 提示词模板（用 str.format 填充 query 和 count）
+NEWS_PROMPT_TEMPLATE = """请搜索关于"{query}"的最新AI动态新闻（2025-2026年）。
 
 要求：
 1. 必须搜索互联网获取最新信息
@@ -60,9 +52,8 @@ class AINewsCollector:
     "date": "2026年2月"
   }}
 ]"""
-            
-            else:  # case
-                prompt = f"""请搜索关于"{query}"的真实应用案例。
+
+CASE_PROMPT_TEMPLATE = """请搜索关于"{query}"的真实应用案例。
 
 要求：
 1. 必须搜索互联网获取真实案例
@@ -81,138 +72,924 @@ class AINewsCollector:
     "impact": ["效果1", "效果2", "效果3"]
   }}
 ]"""
-            
+
+# 增量模式：附在搜索提示词后面，只要上次更新之后的新内容
+DELTA_PROMPT_TEMPLATE = """
+
+增量更新：上次更新于{since}，只返回此后发布或有新进展的{kind}。
+以下{kind}已经收录（标题前缀），不要重复返回：
+{known}
+新{kind}不足{count}条时可以少返回，不要用已收录的内容凑数。"""
+
+# 批量模式：多个查询合并为一次请求，返回以任务编号为键的 JSON 对象
+BATCH_PROMPT_TEMPLATE = """请完成以下{total}个搜索任务。每个任务都必须搜索互联网获取2025-2026年的最新真实信息，不要编造。
+
+{tasks}
+
+新闻条目格式：
+{{"title": "新闻标题", "summary": "新闻摘要（2-3句话），说明要点和影响", "priority": "high", "tags": ["标签1", "标签2"], "date": "2026年2月"}}
+priority 为 high 或 medium，优先选择对项目管理有影响的AI进展。
+
+案例条目格式：
+{{"title": "案例标题", "company": "公司名称", "industry": "行业", "description": "案例描述，说明如何使用AI", "impact": ["效果1", "效果2"]}}
+必须是包含具体公司名称的真实案例，优先选择有明确数据支持的案例。
+
+请严格按照以下JSON格式返回，键为任务编号，值为该任务的条目数组，不要有任何其他文字：
+{{
+{keys}
+}}"""
+
+# 级联模式的精写提示词：只改写指定字段，不联网搜索
+REFINE_PROMPT_TEMPLATE = """以下是联网搜索得到的{kind}条目（JSON 数组，每条带有编号 id）。请逐条改写：
+{instruction}
+不要改动标题，不要编造原文没有的事实或数据。
+
+{items}
+
+请严格按照以下JSON格式返回，每条保留原来的 id，不要有任何其他文字：
+[
+  {example}
+]"""
+
+REFINE_INSTRUCTIONS = {
+    'news': ('新闻',
+             '1. 摘要改写为2-3句话，说明要点和对项目管理的影响\n'
+             '2. 重新判断重要性级别（high/medium）\n'
+             '3. 给出2-4个准确的标签',
+             '{"id": 0, "summary": "新闻摘要，说明要点和影响", "priority": "high", "tags": ["标签1", "标签2"]}'),
+    'case': ('案例',
+             '1. 描述改写为2-3句话，说明如何在项目管理中使用AI\n'
+             '2. 量化效果整理为2-3条简短的条目\n'
+             '3. 行业使用规范名称',
+             '{"id": 0, "industry": "行业", "description": "案例描述，说明如何使用AI", "impact": ["效果1", "效果2"]}'),
+}
+
+BATCH_TASK_TEMPLATES = {
+    'news': '{key}. [新闻] 搜索关于"{query}"的最新AI动态新闻，找到{count}条',
+    'case': '{key}. [案例] 搜索关于"{query}"的AI项目管理实际应用案例，找到{count}个',
+}
+
+class ItemSink:
+    """流式收集时跨查询共享的计数器：按标题去重，收满后通知提前结束"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self._seen = set()
+        self._lock = threading.Lock()
+    
+    def offer(self, item):
+        """登记一个条目，返回它是否是新条目"""
+        with self._lock:
+            title = item.get('title')
+            if title in self._seen:
+                return False
+            self._seen.add(title)
+            return True
+    
+    @property
+    def full(self):
+        return len(self._seen) >= self.limit
+
+class AINewsCollector:
+    """AI新闻和案例收集器"""
+    
+    # 使用更精确的搜索关键词
+    news_keywords = [
+        "AI latest news 2026",  # 英文搜索通常更准确
+        "artificial intelligence breakthroughs 2025 2026",
+        "AI项目管理 2026 最新",
+    ]
+    case_keywords = [
+        "AI project management case study 2025 2026",
+        "企业AI项目管理实践案例",
+    ]
+    
+    def __init__(self, use_cache=True, refresh_cache=False):
+        """
+        初始化API客户端
+        
+        Args:
+            use_cache: 是否启用响应缓存
+            refresh_cache: 忽略已有缓存重新请求（结果仍会写入缓存）
+        """
+        if not config.QWEN_API_KEY:
+            raise ValueError("未设置 QWEN_API_KEY，请检查配置")
+        
+        # openai 导入较慢（约 0.7 秒），只在真正采集时导入
+        from openai import OpenAI
+        
+        # 重试由 ResilientCaller 负责，关闭 SDK 自带的重试
+        self.client = OpenAI(
+            api_key=config.QWEN_API_KEY,
+            base_url=config.QWEN_API_BASE,
+            timeout=config.REQUEST_TIMEOUT,
+            max_retries=0
+        )
+        self.model = config.QWEN_MODEL
+        # 令牌桶限流：所有请求（包括并发请求）共享
+        self.rate_limiter = TokenBucket(
+            rate=config.RATE_LIMIT_RPS,
+            burst=config.RATE_LIMIT_BURST,
+            max_in_flight=config.MAX_IN_FLIGHT
+        )
+        # 容错：重试、对冲请求和熔断
+        self.resilience = ResilientCaller(
+            max_retries=config.MAX_RETRIES,
+            backoff_base=config.RETRY_BACKOFF_BASE,
+            backoff_cap=config.RETRY_BACKOFF_MAX,
+            breaker=CircuitBreaker(config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_SECONDS),
+            latency=LatencyTracker(
+                percentile=config.HEDGE_PERCENTILE,
+                min_samples=config.HEDGE_MIN_SAMPLES,
+                initial_delay=config.HEDGE_INITIAL_DELAY
+            ),
+            hedge=config.HEDGE_ENABLED,
+            max_hedges=config.HEDGE_MAX_IN_FLIGHT
+        )
+        # 批量模式的分批规划（按实际 token 用量自适应）
+        self.batch_planner = BatchPlanner(
+            max_queries=config.BATCH_MAX_QUERIES,
+            max_output_tokens=int(config.BATCH_MAX_TOKENS * 0.75)
+        )
+        # 响应缓存：有效期内重复运行不再调用API
+        self.cache = ResponseCache(
+            config.CACHE_DIR,
+            expire_hours=config.CACHE_EXPIRE_HOURS,
+            max_entries=config.CACHE_MAX_ENTRIES
+        ) if use_cache else None
+        self.refresh_cache = refresh_cache
+        # 近似去重索引：跨运行持久化
+        self.load_near_dup()
+        # 上次运行的时间和近期标题：增量提示词和新条目统计（多主题时按查询覆盖）
+        self.delta = self.load_delta()
+        self.delta_by_query = {}
+        # 关键词产出统计（按统计文件路径缓存，多主题时每个主题各一份）
+        self.schedulers = {}
+        self._announced = set()
+        # 每次调用和各阶段的耗时、token 用量
+        self.metrics = MetricsRecorder(config.MODEL_PRICES)
+        # 最近一次 search_stage 中失败的查询数 {content_type: n}，失败时流水线不复用该阶段的输出
+        self.search_failures = {}
+        if config.CASCADE_MODE:
+            print(f"✅ 使用模型: {config.CASCADE_TRIAGE_MODEL}（初筛）→ {self.model}（精写）")
+        else:
+            print(f"✅ 使用模型: {self.model}")
+    
+    def load_near_dup(self):
+        """加载 config.NEAR_DUP_INDEX 指向的近似去重索引（多主题时每个主题各一份），清空合并记录"""
+        self.near_dup = NearDuplicateIndex.load(
+            config.NEAR_DUP_INDEX,
+            threshold=config.NEAR_DUP_THRESHOLD,
+            num_perm=config.NEAR_DUP_NUM_PERM
+        ) if config.NEAR_DUP_ENABLED else None
+        self.near_dup_merges = []
+        self._run_entry_ids = set()
+    
+    def load_delta(self):
+        """从 config.HISTORY_DB 加载上次更新时间和近期收录的标题"""
+        return DeltaContext.load(
+            config.HISTORY_DB,
+            days=config.DELTA_LOOKBACK_DAYS,
+            prompt_limit=config.DELTA_MAX_KNOWN,
+            length=config.DELTA_FINGERPRINT_CHARS
+        )
+    
+    def _delta_for(self, query):
+        return self.delta_by_query.get(query, self.delta)
+    
+    def scheduler(self):
+        """config.KEYWORD_STATS_FILE 对应的关键词调度器"""
+        path = config.KEYWORD_STATS_FILE
+        if path not in self.schedulers:
+            self.schedulers[path] = KeywordScheduler.load(
+                path,
+                alpha=config.KEYWORD_EWMA_ALPHA,
+                exploration=config.KEYWORD_EXPLORATION,
+                rotate_ratio=config.KEYWORD_ROTATE_RATIO,
+                rotate_after=config.KEYWORD_ROTATE_AFTER,
+                bench_runs=config.KEYWORD_BENCH_RUNS
+            )
+        return self.schedulers[path]
+    
+    def keyword_pool(self, content_type):
+        """关键词调度的候选：内置关键词在前，再加上 config.SEARCH_KEYWORDS 中的同类关键词"""
+        if content_type == 'news':
+            keywords = self.news_keywords + config.SEARCH_KEYWORDS.get('ai_news', [])
+        else:
+            keywords = self.case_keywords + config.SEARCH_KEYWORDS.get('pm_cases', [])
+        return list(dict.fromkeys(keywords))
+    
+    def _scheduled_tasks(self, content_type):
+        """按关键词历史产出分配的查询和条数"""
+        tasks = self.scheduler().plan(
+            content_type,
+            self.keyword_pool(content_type),
+            budget=config.KEYWORD_BUDGET,
+            count=config.KEYWORD_ITEMS_PER_CALL,
+            min_count=config.KEYWORD_MIN_COUNT,
+            max_count=config.KEYWORD_MAX_COUNT
+        )
+        if content_type not in self._announced:
+            self._announced.add(content_type)
+            kind = '新闻' if content_type == 'news' else '案例'
+            print(f"  🎯 {kind}关键词调度: " + '，'.join(f'"{query}"×{count}' for query, _, count in tasks))
+        return tasks
+    
+    def search_and_summarize(self, query, content_type='news', count=5, sink=None, model=None, stage='search'):
+        """
+        搜索并总结内容（启用联网搜索）
+        
+        Args:
+            query: 搜索查询
+            content_type: 'news' 或 'case'
+            count: 需要的条数
+            sink: 流式模式下共享的 ItemSink，收满后提前结束
+            model: 使用的模型，默认 QWEN_MODEL
+            stage: 成本报告里的阶段名（级联模式的初筛为 'triage'）
+        
+        Returns:
+            list: 总结后的内容列表
+        """
+        if sink is not None and sink.full:
+            print(f"  ⏭️  已收集足够条目，跳过: {query}")
+            return []
+        
+        # 构建提示词
+        prompt = self._build_prompt(query, content_type, count)
+        
+        # 缓存命中时直接返回，不调用API
+        model = model or self.model
+        cached = self._cached(query, content_type, count, model)
+        if cached is not None:
+            return self._use_cached(query, content_type, cached, model, stage)
+        
+        call = self.metrics.start_call(query, content_type, model, stage)
+        cache_key = self._cache_key(query, content_type, count, model)
+        
+        try:
             print(f"  🔍 搜索: {query}")
             
-            # 调用通义千问API - 关键：启用联网搜索
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': '你是一个专业的AI信息分析师。你必须使用联网搜索功能获取最新的真实信息，然后用中文总结。不要编造内容。'
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                temperature=0.5,
-                # 🔥 关键设置：启用联网搜索
-                extra_body={
-                    "enable_search": True  # 阿里云通义千问的联网搜索参数
-                }
+            # 调用通义千问API（失败重试、慢请求对冲、故障熔断）
+            results, complete, attempt = self.resilience.call(
+                lambda index, cancellation: self._attempt(query, prompt, content_type, sink, call,
+                                                          index, cancellation),
+                label=query, stats=call
             )
+            self.metrics.adopt_attempt(call, attempt)
             
-            # 解析响应
-            content = response.choices[0].message.content.strip()
-            
-            # 提取JSON（去除可能的markdown标记）
-            content = self._extract_json(content)
-            
-            # 解析JSON
-            results = json.loads(content)
+            # 中断或被截断的结果不完整，不写缓存
+            if self.cache and results and complete:
+                self.cache.set(cache_key, results)
             
-            # 验证数据完整性
-            results = self._validate_data(results, content_type)
-            
-            print(f"  ✅ 成功获取 {len(results)} 条内容")
+            self.metrics.finish_call(call)
+            print(f"  ✅ [{query}] 成功获取 {len(results)} 条内容（{call['wall_s']:.1f}s）")
             return results
             
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON解析错误: {e}")
-            print(f"  原始内容: {content[:300]}...")
+        except CircuitOpenError as e:
+            self.metrics.finish_call(call, error=e)
+            print(f"  ⛔ [{query}] 跳过: {e}")
             return []
         except Exception as e:
-            print(f"  ❌ 搜索失败: {e}")
+            self.metrics.finish_call(call, error=e)
+            print(f"  ❌ [{query}] 搜索失败: {e}")
             return []
     
-    def _extract_json(self, content):
-        """提取JSON内容"""
-        # 去除markdown代码块标记
-        if '```json' in content:
-            content = content.split('```json')[1].split('```')[0].strip()
-        elif '```' in content:
-            content = content.split('```')[1].split('```')[0].strip()
+    def _cached(self, query, content_type, count, model=None):
+        """查询缓存，未启用缓存、强制刷新或未命中时返回 None"""
+        if self.cache is None or self.refresh_cache:
+            return None
+        return self.cache.get(self._cache_key(query, content_type, count, model))
+    
+    def _use_cached(self, query, content_type, cached, model=None, stage='search'):
+        """使用缓存结果并记录指标"""
+        print(f"  ⚡ 缓存命中: {query}")
+        call = self.metrics.start_call(query, content_type, model or self.model, stage)
+        call['cached'] = True
+        call['items_parsed'] = call['items_valid'] = len(cached)
+        self.metrics.finish_call(call)
+        return cached
+    
+    def _request_slot(self, index, cancellation):
+        """
+        一次实际请求占用的限流名额
+        
+        主请求占用共享的令牌和并发名额，输掉对冲时提前归还；对冲请求同样消耗令牌（不超过 RATE_LIMIT_RPS），
+        但并发只受 ResilientCaller 的对冲名额（HEDGE_MAX_IN_FLIGHT）限制，不排在它要绕开的积压后面，
+        也不占其他查询的名额
+        """
+        if index:
+            self.rate_limiter.acquire_token()
+            return contextlib.nullcontext()
+        return self.rate_limiter.slot(cancellation)
+    
+    def _attempt(self, query, prompt, content_type, sink, call, index, cancellation):
+        """
+        一次实际请求（重试和对冲请求都会再次调用）
+        
+        每次请求的解析计数写入独立的记录，胜出的那次再并入调用记录
+        
+        Args:
+            index: 0 为主请求，1 为对冲请求
+            cancellation: 另一次请求胜出后被取消
+        
+        Returns:
+            tuple: (results, complete, attempt)
+        """
+        attempt = self.metrics.start_call(query, content_type, call['model'], call['stage'])
+        with self._request_slot(index, cancellation):
+            # 调用耗时从第一次拿到限流令牌开始计算，不计排队等待的时间
+            if index == 0 and call['retries'] == 0:
+                call['started'] = time.perf_counter()
+            attempt['started'] = time.perf_counter()
+            if config.STREAM_MODE:
+                results, complete = self._stream_items(query, prompt, content_type, sink, attempt, cancellation)
+            else:
+                results, complete = self._complete_items(prompt, content_type, attempt)
+        return results, complete, attempt
+    
+    def _complete_items(self, prompt, content_type, call):
+        """
+        非流式：等待完整响应后整体解析
+        
+        Returns:
+            tuple: (results, complete)，complete 为 False 表示响应被截断
+        """
+        response = self._create_completion(prompt, model=call['model'])
+        self.metrics.record_usage(call, getattr(response, 'usage', None))
+        
+        # 解析响应：容错解析修复常见的 JSON 缺陷，跳过无法修复的条目
+        content = response.choices[0].message.content.strip()
+        results, salvage = salvage_json(content)
+        self._record_salvage(call, salvage)
+        if not results and salvage.salvaged:
+            raise ValueError(f"无法从响应中解析出 JSON 数组（{salvage.summary() or '没有找到数据'}）")
+        call['items_parsed'] = len(results)
+        
+        # 验证数据完整性
+        results = self._validate_data(results, content_type)
+        call['items_valid'] = len(results)
+        return results, not salvage.truncated
+    
+    def _stream_items(self, query, prompt, content_type, sink, call, cancellation=None):
+        """
+        流式：每个对象的右花括号一到就解析、校验并登记
+        
+        Args:
+            cancellation: 对冲的另一方胜出后被取消，此时停止读取并关闭响应
+        
+        Returns:
+            tuple: (results, complete)，complete 为 False 表示响应中断或被截断；
+                收满后主动提前结束的结果视为完整（缓存键含要求的条数，可以缓存）
+        """
+        parser = JSONObjectStreamParser()
+        results = []
+        complete = True
+        stopped = False
+        call['streamed'] = True
+        stream = self._create_completion(prompt, stream=True, model=call['model'])
+        try:
+            for chunk in stream:
+                if cancellation is not None and cancellation.cancelled:
+                    stopped = True
+                    break
+                # 开启 include_usage 后，最后一个块只携带 usage
+                self.metrics.record_usage(call, getattr(chunk, 'usage', None))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                self.metrics.mark_first_token(call)
+                for obj in parser.feed(delta):
+                    call['items_parsed'] += 1
+                    for item in self._validate_data([obj], content_type):
+                        results.append(item)
+                        call['items_valid'] += 1
+                        if sink is not None:
+                            sink.offer(item)
+                if sink is not None and sink.full:
+                    print(f"  ⏹️  [{query}] 已收集足够条目，提前结束")
+                    stopped = True
+                    break
+        except Exception as e:
+            # 中途出错时保留已经完整解析的条目
+            if not results:
+                raise
+            print(f"  ⚠️  [{query}] 响应中断，保留已解析的 {len(results)} 条: {e}")
+            complete = False
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+        self._record_salvage(call, parser.salvage, parser.skipped)
+        
+        if complete and not stopped and parser.pending:
+            print(f"  ⚠️  [{query}] 响应被截断，保留已解析的 {len(results)} 条")
+            complete = False
+        return results, complete
+    
+    def _build_prompt(self, query, content_type, count):
+        """根据内容类型构建提示词（增量模式下附上已收录的标题）"""
+        template = NEWS_PROMPT_TEMPLATE if content_type == 'news' else CASE_PROMPT_TEMPLATE
+        return template.format(query=query, count=count) + self._delta_section(query, content_type, count)
+    
+    def _delta_section(self, query, content_type, count):
+        """增量提示词；未开启增量模式或没有历史时为空串"""
+        if not config.DELTA_MODE:
+            return ''
+        delta = self._delta_for(query)
+        known = delta.known(content_type)
+        if delta.since is None and not known:
+            return ''
+        kind = '新闻' if content_type == 'news' else '案例'
+        return DELTA_PROMPT_TEMPLATE.format(since=delta.since or '近期', kind=kind, count=count,
+                                            known='；'.join(known) or '（无）')
+    
+    def _cache_key(self, query, content_type, count, model=None):
+        """缓存键：模型、类型、查询、条数、提示词模板和增量部分的哈希"""
+        template = NEWS_PROMPT_TEMPLATE if content_type == 'news' else CASE_PROMPT_TEMPLATE
+        template += self._delta_section(query, content_type, count)
+        template_hash = hashlib.sha256((SYSTEM_PROMPT + template).encode('utf-8')).hexdigest()
+        return ResponseCache.make_key(model or self.model, content_type, query, count, template_hash)
+    
+    def _create_completion(self, prompt, stream=False, max_tokens=None, model=None, search=True):
+        """
+        调用通义千问API
         
-        # 使用正则提取JSON数组
-        match = re.search(r'\[.*\]', content, re.DOTALL)
-        if match:
-            return match.group()
+        Args:
+            model: 使用的模型，默认 QWEN_MODEL
+            search: 是否启用联网搜索（级联模式的精写阶段不需要）
+        """
+        options = {}
+        if stream:
+            # 流式时要求在最后一个块返回 usage
+            options['stream_options'] = {'include_usage': True}
+        if max_tokens:
+            options['max_tokens'] = max_tokens
+        return self.client.chat.completions.create(
+            model=model or self.model,
+            messages=[
+                {
+                    'role': 'system',
+                    'content': SYSTEM_PROMPT
+                },
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ],
+            temperature=0.5,
+            stream=stream,
+            **options,
+            # 🔥 关键设置：启用联网搜索
+            extra_body={
+                "enable_search": search  # 阿里云通义千问的联网搜索参数
+            }
+        )
+    
+    def _record_salvage(self, call, salvage, skipped=0):
+        """
+        记录容错解析的统计
         
-        return content
+        Args:
+            salvage: SalvageStats
+            skipped: 流式解析中连容错解析也无法恢复的对象数
+        """
+        call['json_repairs'] += salvage.total_repairs
+        call['items_dropped'] += salvage.dropped + skipped
+        if salvage.salvaged or skipped:
+            summary = salvage.summary() or f'跳过 {skipped} 个损坏的条目'
+            print(f"  🩹 [{call['query']}] JSON 容错解析: {summary}")
     
     def _validate_data(self, results, content_type):
-        """验证和修复数据"""
-        if not isinstance(results, list):
-            return []
+        """
+        验证和修复数据：一次遍历完成必需字段检查和类型修正
+        （标签/效果统一为字符串数组，优先级归为 high/medium，日期转为字符串）
+        
+        Returns:
+            list: 修正后的条目（dict，便于缓存和写入历史库）
+        """
+        return [record.to_dict() for record in validate_items(results, content_type)]
+    
+    def _news_tasks(self, keywords=None):
+        """
+        AI动态的搜索任务列表: (query, content_type, count)
+        
+        keywords 为 None 时用内置关键词：开启 KEYWORD_SCHEDULER 时按历史产出分配，否则取前2个各5条
+        """
+        if keywords is None:
+            if config.KEYWORD_SCHEDULER:
+                return self._scheduled_tasks('news')
+            keywords = self.news_keywords[:2]  # 使用前2个关键词
+        return [(keyword, 'news', 5) for keyword in keywords]
+    
+    def _case_tasks(self, keywords=None):
+        """案例的搜索任务列表: (query, content_type, count)；keywords 为 None 时用内置关键词（同上）"""
+        if keywords is None:
+            if config.KEYWORD_SCHEDULER:
+                return self._scheduled_tasks('case')
+            keywords = self.case_keywords[:2]
+        return [(keyword, 'case', 5) for keyword in keywords]
+    
+    def _new_sinks(self):
+        """流式模式下每种内容一个 ItemSink，收满 NEWS_COUNT/CASE_COUNT 即提前结束"""
+        if not (config.STREAM_MODE and config.STREAM_EARLY_STOP):
+            return {}
+        return {'news': ItemSink(config.NEWS_COUNT), 'case': ItemSink(config.CASE_COUNT)}
+    
+    def _run_tasks(self, tasks, model=None, stage='search'):
+        """
+        执行一组搜索任务
+        
+        并发模式下所有任务同时发起，由令牌桶统一控制速率；
+        否则逐个执行。返回结果与 tasks 顺序一致。
+        
+        Args:
+            tasks: [(query, content_type, count), ...]
+            model: 使用的模型，默认 QWEN_MODEL
+            stage: 成本报告里的阶段名
+        
+        Returns:
+            list: 每个任务对应的结果列表
+        """
+        if config.BATCH_MODE and len(tasks) > 1:
+            return self._run_batched(tasks, model, stage)
+        return self._run_each(tasks, model, stage)
+    
+    def _run_each(self, tasks, model=None, stage='search'):
+        """每个任务单独请求（初筛要的是宽候选列表，不提前结束）"""
+        sinks = self._new_sinks() if stage == 'search' else {}
+        if not config.CONCURRENT_MODE or len(tasks) <= 1:
+            return [self.search_and_summarize(q, t, c, sinks.get(t), model, stage) for q, t, c in tasks]
         
-        valid_results = []
-        for item in results:
-            if content_type == 'news':
-                # 验证新闻必需字段
-                if all(key in item for key in ['title', 'summary', 'priority', 'tags', 'date']):
-                    # 确保tags是数组
-                    if isinstance(item['tags'], str):
-                        item['tags'] = [item['tags']]
-                    valid_results.append(item)
+        with ThreadPoolExecutor(max_workers=config.MAX_IN_FLIGHT) as pool:
+            futures = [pool.submit(self.search_and_summarize, q, t, c, sinks.get(t), model, stage)
+                       for q, t, c in tasks]
+            return [future.result() for future in futures]
+    
+    def _run_batched(self, tasks, model=None, stage='search'):
+        """
+        批量模式：多个查询合并为一次请求，按任务编号拆回各自的结果
+        
+        已缓存的查询不进批次；批量响应无法解析或缺少某个查询的结果时，
+        这些查询退回单独请求。
+        """
+        results = [None] * len(tasks)
+        pending = []
+        for index, (query, content_type, count) in enumerate(tasks):
+            cached = self._cached(query, content_type, count, model)
+            if cached is not None:
+                results[index] = self._use_cached(query, content_type, cached, model, stage)
             else:
-                # 验证案例必需字段
-                if all(key in item for key in ['title', 'company', 'industry', 'description', 'impact']):
-                    # 确保impact是数组
-                    if isinstance(item['impact'], str):
-                        item['impact'] = [item['impact']]
-                    valid_results.append(item)
+                pending.append((index, tasks[index]))
+        
+        batches = [[pending[position] for position, _ in batch]
+                   for batch in self.batch_planner.plan([task for _, task in pending])]
+        # 只有一个查询的批次直接走单独请求（可以流式接收）
+        batches = [batch for batch in batches if len(batch) > 1]
+        if batches:
+            print(f"  📦 批量模式: {len(pending)} 个查询合并为 {len(batches)} 次请求")
+        if config.CONCURRENT_MODE and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=config.MAX_IN_FLIGHT) as pool:
+                outcomes = list(pool.map(lambda batch: self._search_batch(batch, model, stage), batches))
+        else:
+            outcomes = [self._search_batch(batch, model, stage) for batch in batches]
+        for outcome in outcomes:
+            for index, items in outcome.items():
+                results[index] = items
         
-        return valid_results
+        fallback = [index for index, _ in pending if results[index] is None]
+        if fallback and batches:
+            print(f"  ↩️  {len(fallback)} 个查询退回单独请求")
+        if fallback:
+            for index, items in zip(fallback, self._run_each([tasks[i] for i in fallback], model, stage)):
+                results[index] = items
+        return results
     
+    def _build_batch_prompt(self, tasks):
+        """批量提示词，任务编号为 q1、q2..."""
+        lines, keys = [], []
+        for number, (query, content_type, count) in enumerate(tasks, 1):
+            key = f'q{number}'
+            lines.append(BATCH_TASK_TEMPLATES[content_type].format(key=key, query=query, count=count))
+            kind = '新闻' if content_type == 'news' else '案例'
+            keys.append(f'  "{key}": [{kind}条目, ...]')
+        prompt = BATCH_PROMPT_TEMPLATE.format(total=len(tasks), tasks='\n'.join(lines), keys=',\n'.join(keys))
+        # 增量部分每类内容只附一次
+        sections = {}
+        for query, content_type, count in tasks:
+            sections.setdefault(content_type, self._delta_section(query, content_type, count))
+        return prompt + ''.join(sections.values())
+    
+    def _search_batch(self, batch, model=None, stage='search'):
+        """
+        执行一次批量请求
+        
+        Args:
+            batch: [(任务序号, (query, content_type, count)), ...]
+        
+        Returns:
+            dict: {任务序号: 校验后的条目列表}，只包含成功拆出结果的任务
+        """
+        tasks = [task for _, task in batch]
+        label = f'批量×{len(tasks)}'
+        prompt = self._build_batch_prompt(tasks)
+        model = model or self.model
+        call = self.metrics.start_call(' | '.join(query for query, _, _ in tasks), 'batch', model, stage)
+        
+        def attempt(index, cancellation):
+            with self._request_slot(index, cancellation):
+                return self._create_completion(prompt, max_tokens=config.BATCH_MAX_TOKENS, model=model)
+        
+        print(f"  🔍 {label}: {' / '.join(query for query, _, _ in tasks)}")
+        choice = None
+        try:
+            response = self.resilience.call(attempt, label=label, stats=call)
+            choice = response.choices[0]
+            data, salvage = salvage_json(choice.message.content.strip(), dict)
+            self._record_salvage(call, salvage)
+            if not data:
+                raise ValueError(f"无法从响应中解析出 JSON 对象（{salvage.summary() or '没有找到数据'}）")
+        except Exception as e:
+            self.metrics.finish_call(call, error=e)
+            if getattr(choice, 'finish_reason', None) == 'length':
+                print(f"  ✂️  [{label}] 响应被截断，每批查询数降为 {self.batch_planner.shrink()}")
+            print(f"  ⚠️  [{label}] 批量请求失败: {e}")
+            return {}
+        
+        self.metrics.record_usage(call, getattr(response, 'usage', None))
+        outcome = {}
+        for number, (index, (query, content_type, count)) in enumerate(batch, 1):
+            items = data.get(f'q{number}')
+            valid = self._validate_data(items, content_type)
+            call['items_parsed'] += len(items) if isinstance(items, list) else 0
+            call['items_valid'] += len(valid)
+            if not valid:
+                # 缺少的查询会单独重试并记一条调用，这里不记，避免同一查询出现两条记录
+                print(f"  ⚠️  [{label}] 缺少 {query} 的结果")
+                continue
+            # 每个查询单独记一条（不含 token），便于回填去重后保留的条数
+            part = self.metrics.start_call(query, content_type, model, stage)
+            part.update(started=call['started'], batch=label,
+                        items_parsed=len(items) if isinstance(items, list) else 0, items_valid=len(valid))
+            self.metrics.finish_call(part)
+            outcome[index] = valid
+            # 截断的响应里最后一个查询的结果不完整，整批都不写缓存
+            if self.cache and not salvage.truncated:
+                self.cache.set(self._cache_key(query, content_type, count, model), valid)
+        
+        if choice.finish_reason == 'length':
+            print(f"  ✂️  [{label}] 响应被截断，每批查询数降为 {self.batch_planner.shrink()}")
+        self.batch_planner.observe(tasks, call['completion_tokens'], call['items_parsed'])
+        self.metrics.finish_call(call)
+        print(f"  ✅ [{label}] 成功获取 {call['items_valid']} 条内容，拆回 {len(outcome)}/{len(tasks)} 个查询"
+              f"（{call['wall_s']:.1f}s）")
+        return outcome
+    
+    def _merge(self, tasks, result_lists, content_type, limit, order=None):
+        """
+        合并多个查询的结果：精确去重 + 近似去重，并截断；回填每个查询最终保留的条数
+        
+        Args:
+            order: 可选的打分函数，去重后按分数从高到低排序再截断（分数相同保持原顺序）
+        """
+        all_items = [item for results in result_lists for item in results]
+        unique_items = self._deduplicate(all_items, 'title')
+        if order is not None:
+            unique_items.sort(key=order, reverse=True)
+        if self.near_dup is None:
+            kept = unique_items[:limit]
+        else:
+            kept = self._near_deduplicate(unique_items, content_type, limit)
+        
+        kept_ids = {id(item) for item in kept}
+        fetched = novel = 0
+        scheduler = self.scheduler()
+        for (query, _, count), results in zip(tasks, result_lists):
+            delta = self._delta_for(query)
+            query_novel = sum(1 for item in results if delta.is_novel(item, content_type))
+            query_kept = sum(1 for item in results if id(item) in kept_ids)
+            self.metrics.set_kept(query, content_type, query_kept, novel=query_novel)
+            scheduler.record(content_type, query, count, self.metrics.last_call(query, content_type), query_kept)
+            fetched += len(results)
+            novel += query_novel
+        if fetched:
+            kind = '新闻' if content_type == 'news' else '案例'
+            print(f"  🆕 {kind}: 采集 {fetched} 条，其中 {novel} 条不在近期历史中，保留 {len(kept)} 条")
+        return kept
+    
+    @timed_stage('collect_ai_news')
     def collect_ai_news(self):
         """收集AI动态新闻"""
         print("\n📰 开始收集AI动态新闻...")
-        all_news = []
-        
-        # 使用更精确的搜索关键词
-        keywords = [
-            "AI latest news 2026",  # 英文搜索通常更准确
-            "artificial intelligence breakthroughs 2025 2026",
-            "AI项目管理 2026 最新",
-        ]
-        
-        for keyword in keywords[:2]:  # 使用前2个关键词
-            news = self.search_and_summarize(
-                query=keyword,
-                content_type='news',
-                count=5
-            )
-            all_news.extend(news)
-            time.sleep(2)  # 避免请求过快
-        
-        # 去重
-        unique_news = self._deduplicate(all_news, 'title')
-        return unique_news[:config.NEWS_COUNT]
+        tasks = self._news_tasks()
+        return self._merge(tasks, self._run_tasks(tasks), 'news', config.NEWS_COUNT)
     
+    @timed_stage('collect_pm_cases')
     def collect_pm_cases(self):
         """收集项目管理案例"""
         print("\n💼 开始收集项目管理案例...")
-        all_cases = []
-        
-        keywords = [
-            "AI project management case study 2025 2026",
-            "企业AI项目管理实践案例",
-        ]
-        
-        for keyword in keywords[:2]:
-            cases = self.search_and_summarize(
-                query=keyword,
-                content_type='case',
-                count=5
-            )
-            all_cases.extend(cases)
-            time.sleep(2)
+        tasks = self._case_tasks()
+        return self._merge(tasks, self._run_tasks(tasks), 'case', config.CASE_COUNT)
+    
+    @timed_stage('collect_all')
+    def collect_all(self):
+        """
+        一次性并发收集AI动态和案例
+        
+        Returns:
+            tuple: (news, cases)
+        """
+        news_tasks = self._news_tasks()
+        case_tasks = self._case_tasks()
+        if config.CASCADE_MODE:
+            return self._collect_cascade(news_tasks, case_tasks)
+        mode = '并发' if config.CONCURRENT_MODE else '顺序'
+        print(f"\n📡 开始收集内容（{mode}模式，共 {len(news_tasks) + len(case_tasks)} 个查询）...")
         
-        # 去重
-        unique_cases = self._deduplicate(all_cases, 'title')
-        return unique_cases[:config.CASE_COUNT]
+        results = self._run_tasks(news_tasks + case_tasks)
+        news = self._merge(news_tasks, results[:len(news_tasks)], 'news', config.NEWS_COUNT)
+        cases = self._merge(case_tasks, results[len(news_tasks):], 'case', config.CASE_COUNT)
+        return news, cases
+    
+    def _collect_cascade(self, news_tasks, case_tasks):
+        """
+        级联模式：CASCADE_TRIAGE_MODEL 联网搜索出较宽的候选列表，本地去重（含历史）并按
+        triage_score 排序截断，最后只为保留下来的条目调用 QWEN_MODEL 精写摘要和标签
+        
+        Returns:
+            tuple: (news, cases)
+        """
+        triage_model = config.CASCADE_TRIAGE_MODEL
+        news_tasks = [(query, content_type, config.CASCADE_CANDIDATES) for query, content_type, _ in news_tasks]
+        case_tasks = [(query, content_type, config.CASCADE_CANDIDATES) for query, content_type, _ in case_tasks]
+        print(f"\n🪜 级联模式: {triage_model} 初筛 {len(news_tasks) + len(case_tasks)} 个查询，"
+              f"{self.model} 精写保留的条目")
+        
+        results = self._run_tasks(news_tasks + case_tasks, triage_model, 'triage')
+        today = datetime.now()
+        news = self._merge(news_tasks, results[:len(news_tasks)], 'news', config.NEWS_COUNT,
+                           order=lambda item: triage_score(item, 'news', today))
+        cases = self._merge(case_tasks, results[len(news_tasks):], 'case', config.CASE_COUNT,
+                            order=lambda item: triage_score(item, 'case', today))
+        print(f"  🧹 本地过滤: {sum(len(r) for r in results)} 个候选 → 新闻 {len(news)} 条，案例 {len(cases)} 个")
+        
+        if config.CONCURRENT_MODE:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(self._refine, [news, cases], ['news', 'case']))
+        else:
+            self._refine(news, 'news')
+            self._refine(cases, 'case')
+        return news, cases
+    
+    def stage_tasks(self, content_type, keywords=None):
+        """一种内容的搜索任务（级联模式下放宽为 CASCADE_CANDIDATES 个候选）"""
+        tasks = self._news_tasks(keywords) if content_type == 'news' else self._case_tasks(keywords)
+        if config.CASCADE_MODE:
+            tasks = [(query, kind, config.CASCADE_CANDIDATES) for query, kind, _ in tasks]
+        return tasks
+    
+    def search_stage(self, content_type, keywords=None, topic=''):
+        """
+        流水线的搜索阶段：只执行一种内容的查询
+        
+        Args:
+            keywords: 搜索关键词，默认用内置关键词
+            topic: 多主题时的主题名（用于输出，并写入本阶段调用记录的 topic 字段）
+        
+        Returns:
+            list: 每个查询的结果列表（未合并、未去重）
+        """
+        tasks = self.stage_tasks(content_type, keywords)
+        label = (f'[{topic}] ' if topic else '') + ('新闻' if content_type == 'news' else '案例')
+        first_call = len(self.metrics.calls)
+        if config.CASCADE_MODE:
+            print(f"\n🪜 {label}初筛: {config.CASCADE_TRIAGE_MODEL}，{len(tasks)} 个查询")
+            results = self._run_tasks(tasks, config.CASCADE_TRIAGE_MODEL, 'triage')
+        else:
+            print(f"\n📡 搜索{label}: {len(tasks)} 个查询")
+            results = self._run_tasks(tasks)
+        calls = self.metrics.calls[first_call:]
+        self.search_failures[content_type] = sum(
+            1 for call in calls if call['type'] == content_type and call['error'])
+        if topic:
+            # 多主题并发搜索时调用记录交错，按本阶段的查询认领（批量请求要求所有查询都属于本阶段）
+            queries = {query for query, _, _ in tasks}
+            for call in calls:
+                if call.get('topic') is None and (
+                        call['type'] == content_type and call['query'] in queries
+                        or call['type'] == 'batch' and set(call['query'].split(' | ')) <= queries):
+                    call['topic'] = topic
+        return results
+    
+    def search_complete(self, content_type, results):
+        """
+        最近一次 search_stage 的结果能否复用：有条目且没有失败的查询
+        
+        与响应缓存一致，空结果和失败的结果不复用，接口暂时故障后重跑会重新搜索
+        """
+        return any(results) and not self.search_failures.get(content_type)
+    
+    def dedupe_stage(self, news_results, case_results, news_keywords=None, case_keywords=None):
+        """
+        流水线的去重阶段：合并各查询结果，精确去重 + 近似去重后截断
+        
+        Args:
+            news_keywords / case_keywords: 与 search_stage 相同的关键词
+        
+        Returns:
+            tuple: (news, cases)
+        """
+        news_order = case_order = None
+        if config.CASCADE_MODE:
+            today = datetime.now()
+            news_order = lambda item: triage_score(item, 'news', today)
+            case_order = lambda item: triage_score(item, 'case', today)
+        news = self._merge(self.stage_tasks('news', news_keywords), news_results, 'news', config.NEWS_COUNT,
+                           order=news_order)
+        cases = self._merge(self.stage_tasks('case', case_keywords), case_results, 'case', config.CASE_COUNT,
+                            order=case_order)
+        return news, cases
+    
+    def refine_stage(self, items, content_type, topic=''):
+        """
+        流水线的精写阶段：返回精写后的副本（不修改上游阶段的输出）
+        
+        Args:
+            topic: 多主题时的主题名（用于输出，并写入调用记录的 topic 字段）
+        """
+        items = copy.deepcopy(items)
+        self._refine(items, content_type, topic)
+        return items
+    
+    def _build_refine_prompt(self, items, content_type):
+        """精写提示词：只带上需要的字段"""
+        kind, instruction, example = REFINE_INSTRUCTIONS[content_type]
+        fields = ('title', 'summary', 'date') if content_type == 'news' else \
+            ('title', 'company', 'industry', 'description', 'impact')
+        lines = [json.dumps(dict({field: item.get(field) for field in fields}, id=number), ensure_ascii=False)
+                 for number, item in enumerate(items)]
+        return REFINE_PROMPT_TEMPLATE.format(kind=kind, instruction=instruction,
+                                             items='[\n' + ',\n'.join(lines) + '\n]', example=example)
+    
+    def _refine(self, items, content_type, topic=''):
+        """
+        用 QWEN_MODEL 精写条目的摘要/标签（原地修改，不联网搜索）
+        
+        精写失败或某条缺失时保留初筛模型的内容。
+        
+        Returns:
+            int: 成功精写的条数
+        """
+        if not items:
+            return 0
+        label = (f'[{topic}] ' if topic else '') + f"精写{REFINE_INSTRUCTIONS[content_type][0]}"
+        prompt = self._build_refine_prompt(items, content_type)
+        cache_key = ResponseCache.make_key(self.model, 'refine', content_type,
+                                           hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+        refined = self.cache.get(cache_key) if self.cache and not self.refresh_cache else None
+        
+        if refined is not None:
+            print(f"  ⚡ 缓存命中: {label}")
+        else:
+            call = self.metrics.start_call(label, content_type, self.model, 'refine')
+            if topic:
+                call['topic'] = topic
+            
+            def attempt(index, cancellation):
+                with self._request_slot(index, cancellation):
+                    return self._create_completion(prompt, model=self.model, search=False)
+            
+            print(f"  ✍️  {label}: {len(items)} 条")
+            try:
+                response = self.resilience.call(attempt, label=label, stats=call)
+                self.metrics.record_usage(call, getattr(response, 'usage', None))
+                refined, salvage = salvage_json(response.choices[0].message.content.strip())
+                self._record_salvage(call, salvage)
+                if not refined:
+                    raise ValueError(f"无法从响应中解析出 JSON 数组（{salvage.summary() or '没有找到数据'}）")
+            except Exception as e:
+                self.metrics.finish_call(call, error=e)
+                print(f"  ⚠️  [{label}] 精写失败，保留初筛内容: {e}")
+                return 0
+            call['items_parsed'] = len(refined)
+            self.metrics.finish_call(call)
+            if self.cache:
+                self.cache.set(cache_key, refined)
+        
+        updated = set()
+        for entry in refined:
+            number = entry.get('id') if isinstance(entry, dict) else None
+            if not isinstance(number, int) or not 0 <= number < len(items) or number in updated:
+                continue
+            merged = dict(items[number], **{field: entry[field] for field in REFINE_FIELDS[content_type]
+                                           if field in entry})
+            valid = self._validate_data([merged], content_type)
+            if valid:
+                items[number].update(valid[0])
+                updated.add(number)
+        print(f"  ✅ [{label}] 精写 {len(updated)}/{len(items)} 条")
+        return len(updated)
     
     def _deduplicate(self, items, key):
         """根据指定键去重"""
@@ -224,10 +1001,79 @@ class AINewsCollector:
                 unique.append(item)
         return unique
     
+    def _near_dup_text(self, item, content_type):
+        """用于近似去重的文本：新闻用标题，案例用公司+标题"""
+        if content_type == 'news':
+            return item.get('title', '')
+        return f"{item.get('company', '')} {item.get('title', '')}"
+    
+    def _near_deduplicate(self, items, content_type, limit):
+        """
+        近似去重：与本次已保留的条目以及往日历史条目比较
+        
+        与当天早些时候运行的结果相似的条目会保留，这样同一天重跑能得到相同的页面。
+        被合并的条目记入 self.near_dup_merges。
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        kept = []
+        for item in items:
+            if len(kept) >= limit:
+                break
+            text = self._near_dup_text(item, content_type)
+            sig = self.near_dup.signature(text)
+            match_id, similarity = self.near_dup.query(sig, kind=content_type)
+            
+            if match_id is not None:
+                matched = self.near_dup.entries[match_id]
+                scope = 'run' if match_id in self._run_entry_ids else 'history'
+                if scope == 'run' or (matched['day'] or today) < today:
+                    self.near_dup_merges.append({
+                        'type': content_type,
+                        'scope': scope,
+                        'dropped': text,
+                        'kept': matched['text'],
+                        'kept_day': matched['day'],
+                        'similarity': round(similarity, 3)
+                    })
+                    print(f"  🔁 近似重复({scope}, {similarity:.2f}): {text} ≈ {matched['text']}")
+                    continue
+                # 当天重跑：沿用已有条目，不重复加入索引
+                kept.append(item)
+                continue
+            
+            entry_id = hashlib.sha1(f'{content_type}:{text}'.encode('utf-8')).hexdigest()[:16]
+            self.near_dup.add(entry_id, sig, content_type, text, today)
+            self._run_entry_ids.add(entry_id)
+            kept.append(item)
+        return kept
+    
+    @timed_stage('save_data')
     def save_data(self, news, cases):
-        """保存数据到JSON文件"""
+        """
+        保存数据：追加到历史库，再从历史库导出 data.json
+        
+        data.json 只是最近一次运行的视图，完整历史保存在 config.HISTORY_DB
+        """
+        store = HistoryStore(config.HISTORY_DB)
+        try:
+            run_id = store.append_run(news or [], cases or [])
+            latest = store.export_run(run_id)
+            trends = store.trends(config.TREND_WEEKS, config.TREND_TOP) if config.TREND_ENABLED else None
+        finally:
+            store.close()
+        news, cases = latest['news'], latest['cases']
+        print(f"\n🗄️  已追加到历史库 {config.HISTORY_DB} (run_id: {run_id})")
+        
+        if self.near_dup is not None:
+            self.near_dup.save(config.NEAR_DUP_INDEX)
+            write_report(config.NEAR_DUP_REPORT, self.near_dup_merges)
+            print(f"🔁 近似去重: 合并 {len(self.near_dup_merges)} 条，索引共 {len(self.near_dup)} 条，"
+                  f"报告见 {config.NEAR_DUP_REPORT}")
+        self.scheduler().save()
+        
         data = {
-            'update_time': datetime.now().strftime('%Y年%m月%d日 %H:%M'),
+            'run_id': run_id,
+            'update_time': latest['update_time'],
             'news': news if news else [
                 {
                     "title": "正在获取最新数据...",
@@ -251,41 +1097,79 @@ class AINewsCollector:
                 'case_count': len(cases) if cases else 0
             }
         }
+        if trends:
+            data['trends'] = trends
         
-        with open('data.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        dump_file(config.DATA_FILE, data, config.DATA_BACKEND)
+        if config.DATA_SNAPSHOT:
+            dump_file(config.DATA_SNAPSHOT, data, 'snapshot')
         
-        print(f"\n💾 数据已保存到 data.json")
+        print(f"\n💾 数据已保存到 {config.DATA_FILE}")
         return data
 
-def main():
-    """主函数"""
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='AI+项目管理信息面板 - 内容更新')
+    parser.add_argument('--no-cache', action='store_true', help='不读取也不写入响应缓存')
+    parser.add_argument('--refresh', action='store_true', help='忽略已有缓存重新请求，并刷新缓存')
+    return parser.parse_args(argv)
+
+def write_metrics(collector):
+    """写出采集阶段的运行指标并打印成本"""
+    collector.metrics.write(config.METRICS_FILE, config.METRICS_PROM_FILE)
+    snapshot = collector.metrics.snapshot()
+    totals = snapshot['totals']
+    print(f"📈 指标已写入 {config.METRICS_FILE} / {config.METRICS_PROM_FILE}"
+          f"（{totals['calls']} 次调用，{totals['prompt_tokens']}+{totals['completion_tokens']} tokens）")
+    for stage, entry in snapshot['cost'].items():
+        print(f"💰 {stage}（{', '.join(entry['models'])}）: {entry['calls']} 次调用，"
+              f"{entry['prompt_tokens']}+{entry['completion_tokens']} tokens，¥{entry['cost']:.4f}")
+
+def print_summary(data):
+    """打印本次更新的条目数"""
+    print("\n" + "=" * 60)
+    print(f"✅ 更新完成！")
+    print(f"📊 AI动态: {data['stats']['news_count']} 条")
+    print(f"💡 实践案例: {data['stats']['case_count']} 个")
+    print(f"⏰ 更新时间: {data['update_time']}")
+    print("=" * 60)
+
+def collect(use_cache=True, refresh_cache=False):
+    """
+    采集并保存一次数据
+    
+    Returns:
+        dict: 写入 data.json 的数据，出错时返回 None（已打印错误）
+    """
     print("=" * 60)
     print("🚀 AI+项目管理信息面板 - 内容更新")
     print("=" * 60)
     
     try:
         # 初始化收集器
-        collector = AINewsCollector()
+        collector = AINewsCollector(use_cache=use_cache, refresh_cache=refresh_cache)
         
-        # 收集内容
-        news = collector.collect_ai_news()
-        cases = collector.collect_pm_cases()
+        # 收集内容（新闻与案例查询一起发起）
+        news, cases = collector.collect_all()
         
         # 保存数据
         data = collector.save_data(news, cases)
         
-        print("\n" + "=" * 60)
-        print(f"✅ 更新完成！")
-        print(f"📊 AI动态: {len(news)} 条")
-        print(f"💡 实践案例: {len(cases)} 个")
-        print(f"⏰ 更新时间: {data['update_time']}")
-        print("=" * 60)
+        # 写出运行指标
+        write_metrics(collector)
+        print_summary(data)
+        return data
         
     except Exception as e:
         print(f"\n❌ 发生错误: {e}")
         import traceback
         traceback.print_exc()
+        return None
+
+def main(argv=None):
+    """主函数"""
+    args = parse_args(argv)
+    return collect(use_cache=not args.no_cache, refresh_cache=args.refresh)
 
 if __name__ == '__main__':
     main()
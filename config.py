@@ -10,13 +10,53 @@ import os
 # 请在 GitHub Secrets 中设置 QWEN_API_KEY
 QWEN_API_KEY = os.getenv('QWEN_API_KEY', '')
 QWEN_MODEL = 'qwen-max'  # 可选: qwen-turbo (便宜), qwen-plus (推荐), qwen-max (最强)
-QWEN_API_BASE = 'https://dashscope.aliyuncs.com/compatible-mode/v1'
+QWEN_API_BASE = os.getenv('QWEN_API_BASE', 'https://dashscope.aliyuncs.com/compatible-mode/v1')  # 基准测试时可指向本地模拟服务器
 
 # ===== 内容配置 =====
 # 每天更新的条数
 NEWS_COUNT = 10  # AI动态数量
 CASE_COUNT = 10  # 实践案例数量
 
+# ===== 并发与限流配置 =====
+CONCURRENT_MODE = True  # 并发发起所有搜索请求（False 则逐个执行）
+RATE_LIMIT_RPS = 1.0  # 每秒最多发起的请求数（令牌桶速率）
+RATE_LIMIT_BURST = 2  # 令牌桶容量（允许的突发请求数）
+MAX_IN_FLIGHT = 4  # 同时进行中的最大请求数
+
+# ===== 容错配置 =====
+REQUEST_TIMEOUT = 90  # 单次请求超时（秒），联网搜索通常需要 10~40 秒
+MAX_RETRIES = 3  # 超时、连接错误、429、5xx 的最多重试次数
+RETRY_BACKOFF_BASE = 2.0  # 指数退避的基础等待（秒），实际等待在 [0, base*2^n] 内随机
+RETRY_BACKOFF_MAX = 30.0  # 单次退避最长等待（秒）
+HEDGE_ENABLED = True  # 慢请求超过延迟阈值后再发一个相同请求，取先返回的
+HEDGE_PERCENTILE = 0.9  # 对冲阈值取最近成功请求耗时的分位数
+HEDGE_MIN_SAMPLES = 4  # 样本不足时使用 HEDGE_INITIAL_DELAY
+HEDGE_INITIAL_DELAY = 45.0  # 样本不足时的对冲阈值（秒），None 表示不对冲
+HEDGE_MAX_IN_FLIGHT = 2  # 同时进行中的对冲请求数上限（对冲请求照常消耗 RATE_LIMIT_* 的令牌，但不占 MAX_IN_FLIGHT 的名额；用完时不再对冲）
+CIRCUIT_FAILURE_THRESHOLD = 4  # 连续故障多少次后熔断
+CIRCUIT_RESET_SECONDS = 60.0  # 熔断持续时间（秒），之后放行一个探测请求
+
+# ===== 批量查询配置 =====
+BATCH_MODE = False  # 把多个查询（可跨新闻/案例）合并为一次请求；批量请求不使用流式，解析失败时退回单独请求
+BATCH_MAX_QUERIES = 4  # 每次请求最多合并的查询数（响应被截断后自动减半）
+BATCH_MAX_TOKENS = 8000  # 批量请求的 max_tokens（qwen-max 单次最多输出 8192），分批时按 75% 预留余量
+
+# ===== 模型级联配置 =====
+CASCADE_MODE = False  # 便宜模型联网搜索出候选，本地去重排序后只把保留的条目交给 QWEN_MODEL 精写摘要和标签
+CASCADE_TRIAGE_MODEL = 'qwen-turbo'  # 初筛（联网搜索）使用的模型
+CASCADE_CANDIDATES = 10  # 初筛时每个查询返回的候选条数
+
+# 每千 token 价格（元）: (输入, 输出)，用于成本报告
+MODEL_PRICES = {
+    'qwen-turbo': (0.0003, 0.0006),
+    'qwen-plus': (0.0008, 0.002),
+    'qwen-max': (0.0024, 0.0096),
+}
+
+# ===== 流式响应配置 =====
+STREAM_MODE = True  # 流式接收响应，逐条解析（被截断的响应也能保留完整条目）
+STREAM_EARLY_STOP = True  # 收满 NEWS_COUNT/CASE_COUNT 条不重复内容后提前结束
+
 # 搜索关键词
 SEARCH_KEYWORDS = {
     'ai_news': [
@@ -35,6 +75,48 @@ SEARCH_KEYWORDS = {
     ]
 }
 
+# ===== 多主题面板配置 =====
+# 写法同 SEARCH_KEYWORDS，每个主题一个面板：news / cases 为该主题的全部搜索关键词，title / description 可选。
+# `python dashboard.py topics` 一次并发采集所有主题（共享限流器和 API 并发），再用进程池分别渲染到
+# OUTPUT_DIR/<主题名>/；每个主题的 data.json、历史库和近似去重索引保存在 TOPICS_DIR/<主题名>/
+TOPICS = {
+    'ai-pm': {
+        'title': 'AI+项目管理 智能信息面板',
+        'news': SEARCH_KEYWORDS['ai_news'][:2],
+        'cases': SEARCH_KEYWORDS['pm_cases'][:2],
+    },
+}
+TOPICS_DIR = 'topics'
+TOPIC_RENDER_WORKERS = 4  # 渲染面板的进程数
+
+# ===== 增量采集配置 =====
+DELTA_MODE = False  # 提示词中附上上次更新时间和已收录的标题，只要新内容（新条目统计始终进行）
+DELTA_LOOKBACK_DAYS = 14  # 已收录标题的回看天数
+DELTA_MAX_KNOWN = 30  # 每类写进提示词的已收录标题数上限
+DELTA_FINGERPRINT_CHARS = 24  # 标题指纹长度（规范化后的字符数），提示词中的标题截断到它的两倍
+
+# ===== 关键词调度配置 =====
+# 始终按关键词记录耗时、token、解析成功率和去重后保留的条数；开启调度后，内置关键词和 SEARCH_KEYWORDS
+# 组成候选，按单位耗时/token 的产出分配每次运行的查询和条数，持续产出偏低的关键词轮换出去
+KEYWORD_SCHEDULER = False  # 关闭时固定使用前 2 个内置关键词，每个 5 条
+KEYWORD_STATS_FILE = 'keyword_stats.json'  # 关键词统计（随历史库一起提交）
+KEYWORD_BUDGET = 2  # 每类内容每次运行的查询数
+KEYWORD_ITEMS_PER_CALL = 5  # 平均每个查询要求的条数（每类总条数 = 查询数 × 该值）
+KEYWORD_MIN_COUNT = 3  # 单个查询要求的条数下限
+KEYWORD_MAX_COUNT = 8  # 单个查询要求的条数上限
+KEYWORD_EWMA_ALPHA = 0.3  # 统计的指数加权平均中最近一次运行的权重
+KEYWORD_EXPLORATION = 0.3  # 试用次数少的关键词的加分系数（越大越愿意试用）
+KEYWORD_ROTATE_RATIO = 0.5  # 得分低于最佳关键词的该比例视为产出偏低
+KEYWORD_ROTATE_AFTER = 3  # 连续几次运行产出偏低后轮换出去
+KEYWORD_BENCH_RUNS = 7  # 轮换出去的关键词暂停的运行次数
+
+# ===== 近似去重配置 =====
+NEAR_DUP_ENABLED = True  # 跨运行的近似重复检测（MinHash + LSH）
+NEAR_DUP_THRESHOLD = 0.5  # 判定为重复的标题相似度阈值（0~1，越低合并越多）
+NEAR_DUP_NUM_PERM = 64  # MinHash 签名长度（修改后旧索引作废）
+NEAR_DUP_INDEX = 'near_dup_index.json'  # 持久化的 LSH 索引
+NEAR_DUP_REPORT = 'dedup_report.json'  # 本次运行的合并报告
+
 # ===== 更新时间配置 =====
 # GitHub Actions 使用 UTC 时间
 # 中国时间 10:30 = UTC 02:30
@@ -48,13 +130,63 @@ SITE_AUTHOR = 'AI Assistant'
 # ===== 其他配置 =====
 # 缓存过期时间（小时）
 CACHE_EXPIRE_HOURS = 24
+CACHE_DIR = '.cache/llm'  # 大模型响应缓存目录
+CACHE_MAX_ENTRIES = 256  # 最多缓存的响应条数（超出按LRU淘汰）
 
 # 日志级别
 LOG_LEVEL = 'INFO'
 
+# 运行指标（每次调用的耗时/token 用量和各阶段耗时）
+METRICS_FILE = 'metrics.json'
+METRICS_PROM_FILE = 'metrics.prom'  # Prometheus textfile 格式
+
+# ===== 静态资源配置 =====
+ASSETS_DIR = 'assets'  # 样式表目录（位于 OUTPUT_DIR 下），文件名带内容哈希，可长期缓存
+ASSETS_MINIFY = True  # 去掉 HTML 和 CSS 中多余的空白与注释
+ASSETS_PRECOMPRESS = True  # 为 OUTPUT_DIR 下的文本文件写出 .gz 和 .br 副本（.br 需要安装 brotli）
+
+# ===== 数据文件与序列化 =====
+DATA_FILE = 'data.json'  # 最近一次运行的数据
+DATA_BACKEND = 'auto'  # data.json 的编解码: json / orjson / auto（已安装 orjson 时使用，输出与 json 相同）
+DATA_SNAPSHOT = '.cache/data.snap'  # 同时写出的二进制快照，渲染时 mmap 按条读取；None 表示不写
+
+# 历史数据库（每次运行追加，data.json 由它导出）
+HISTORY_DB = 'history.db'  # 旁边的 history.jsonl 是它的文本导出（提交到仓库），历史库不存在时由它重建
+
 # 输出目录
 OUTPUT_DIR = 'docs'  # GitHub Pages 会自动发布这个目录
 
+# ===== 历史归档配置 =====
+ARCHIVE_ENABLED = True  # 根据历史库生成按天/按月的归档页（index.html 只保留最新一天）
+ARCHIVE_DIR = 'archive'  # 归档页目录（位于 OUTPUT_DIR 下）
+ARCHIVE_PAGE_SIZE = 20  # 月度归档每页的新闻/案例条数
+SHARD_DIR = 'data'  # JSON 分片和清单目录（位于 OUTPUT_DIR 下）
+SHARD_SIZE = 500  # 每个 JSON 分片的条目数
+
+# ===== 趋势统计配置 =====
+TREND_ENABLED = True  # 首页显示标签和行业趋势（读取历史库中随每次运行增量更新的汇总表）
+TREND_WEEKS = 8  # 趋势统计的周数（含本周）
+TREND_TOP = 8  # 上升标签和行业分布各显示的条数
+
+# ===== 站内搜索配置 =====
+SEARCH_ENABLED = True  # 生成搜索索引并在首页显示搜索框（依赖归档的 JSON 分片）
+SEARCH_SHARD_COUNT = 64  # 倒排索引分片数（按词项哈希分片）
+SEARCH_MAX_RESULTS = 20  # 每次搜索最多显示的结果数
+
+# 网页片段缓存（按条目内容哈希复用渲染结果）
+RENDER_CACHE_FILE = '.cache/render_cache.json'
+RENDER_CACHE_MAX_FRAGMENTS = 20000  # 片段缓存最多保留的条目数，超出时淘汰最久未用到的（归档未变化的页面不渲染，不能只留本次用到的）
+RENDER_BUFFER_SIZE = 64 * 1024  # 网页写入缓冲区大小（字节）
+
+# ===== 本地预览配置 =====
+SERVE_HOST = '127.0.0.1'  # python dashboard.py serve 监听的地址
+SERVE_PORT = 8000
+SERVE_POLL_INTERVAL = 0.05  # --watch 时轮询数据、配置和模板文件的间隔（秒）
+
+# ===== 流水线配置 =====
+STAGE_CACHE_DIR = '.cache/stages'  # 各阶段最近一次的输出，输入哈希不变时复用，--from 时供下游读取
+PIPELINE_MAX_WORKERS = 4  # 同时执行的阶段数上限（互不依赖的阶段并行）
+
 # ===== API 配置提示 =====
 def check_config():
     """检查配置是否完整"""
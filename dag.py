@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 流水线阶段调度
+每个阶段声明输入和输出，按依赖关系组成 DAG：互不依赖的阶段并行执行，
+阶段输出按输入哈希缓存到磁盘，输入不变时直接复用；--from 只重跑指定阶段及其下游
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from serialization import dump_file, load_file
+
+
+def value_hash(value):
+    """输出值的内容哈希（要求可 JSON 序列化）"""
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class Stage:
+    """流水线中的一个阶段"""
+
+    def __init__(self, name, func, inputs=(), outputs=(), cache=True, key=None, cacheable=None):
+        """
+        Args:
+            name: 阶段名（--from 使用）
+            func: func(**inputs) -> {输出名: 值}，输出值须可 JSON 序列化
+            inputs: 依赖的输出名
+            outputs: 本阶段产生的输出名
+            cache: 输入哈希不变时是否复用上次的输出（有副作用的阶段应设为 False）
+            key: 可选的无参函数，返回计入输入哈希的额外内容（如查询列表、日期）
+            cacheable: 可选函数 cacheable(outputs)，返回 False 时这次的输出下次不复用
+                （如搜索全部失败或没有结果；仍会保存，供 --from 从下游开始重跑）
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.cache = cache
+        self.key = key
+        self.cacheable = cacheable
+
+
+class StageCache:
+    """每个阶段保存最近一次的输入哈希和输出"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.json')
+
+    def load(self, name):
+        try:
+            return load_file(self._path(name))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, name, key, outputs, hashes):
+        dump_file(self._path(name), {'key': key, 'outputs': outputs, 'hashes': hashes})
+
+
+class Pipeline:
+    """按依赖关系并行执行阶段"""
+
+    def __init__(self, stages, cache_dir, max_workers=4):
+        """
+        Args:
+            stages: Stage 列表
+            cache_dir: 阶段输出缓存目录
+            max_workers: 同时执行的阶段数上限
+
+        Raises:
+            ValueError: 输出重名、输入没有对应的阶段或存在环
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = StageCache(cache_dir)
+        self.max_workers = max_workers
+        self.producer = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producer:
+                    raise ValueError(f"输出 {output} 同时由 {self.producer[output]} 和 {stage.name} 产生")
+                self.producer[output] = stage.name
+        for stage in stages:
+            missing = [name for name in stage.inputs if name not in self.producer]
+            if missing:
+                raise ValueError(f"阶段 {stage.name} 的输入没有对应的阶段: {', '.join(missing)}")
+        self.order = self._topological_order()
+        self.values = {}  # 最近一次 run 已得到的输出（出错时为出错前的部分结果）
+
+    def upstream(self, name):
+        """阶段直接依赖的阶段名"""
+        return {self.producer[item] for item in self.stages[name].inputs}
+
+    def _topological_order(self):
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"阶段之间存在环: {' → '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dependency in sorted(self.upstream(name)):
+                visit(dependency, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def downstream(self, name):
+        """name 及所有（直接或间接）依赖它的阶段"""
+        if name not in self.stages:
+            raise ValueError(f"未知的阶段: {name}（可选: {', '.join(self.order)}）")
+        result = {name}
+        for other in self.order:
+            if self.upstream(other) & result:
+                result.add(other)
+        return result
+
+    def run(self, from_stage=None, force=False):
+        """
+        执行流水线
+
+        Args:
+            from_stage: 重跑该阶段及其下游（不看输入哈希），上游阶段沿用上次缓存的输出
+            force: 忽略输入哈希，重跑所有阶段
+
+        Returns:
+            dict: {输出名: 值}
+
+        Raises:
+            RuntimeError: --from 的上游阶段没有缓存
+        """
+        rerun = self.downstream(from_stage) if from_stage else set(self.stages)
+        force = force or from_stage is not None
+        self.values, self._hashes = {}, {}
+        done, running = set(), {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while len(done) < len(self.stages):
+                for name in self.order:
+                    if name not in done and name not in running and self.upstream(name) <= done:
+                        running[name] = pool.submit(self._execute, self.stages[name], name in rerun, force)
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future in finished:
+                        # 出错时抛出；已提交的阶段在退出 with 时等待完成
+                        outputs, hashes = future.result()
+                        self.values.update(outputs)
+                        self._hashes.update(hashes)
+                        done.add(name)
+                        del running[name]
+        return self.values
+
+    def _execute(self, stage, rerun, force):
+        """执行或复用一个阶段，返回 (outputs, hashes)"""
+        entry = self.cache.load(stage.name)
+        if not rerun:
+            if entry is None:
+                raise RuntimeError(f"阶段 {stage.name} 没有缓存的输出，无法从下游开始重跑")
+            print(f"📦 [{stage.name}] 沿用上次的输出")
+            return entry['outputs'], entry['hashes']
+
+        digest = hashlib.sha256(stage.name.encode('utf-8'))
+        if stage.key is not None:
+            digest.update(value_hash(stage.key()).encode('utf-8'))
+        for item in stage.inputs:
+            digest.update(f'{item}={self._hashes[item]}'.encode('utf-8'))
+        key = digest.hexdigest()
+        if stage.cache and not force and entry is not None and entry['key'] == key:
+            print(f"⚡ [{stage.name}] 输入未变，复用缓存的输出")
+            return entry['outputs'], entry['hashes']
+
+        start = time.perf_counter()
+        outputs = stage.func(**{item: self.values[item] for item in stage.inputs}) or {}
+        if set(outputs) != set(stage.outputs):
+            raise ValueError(f"阶段 {stage.name} 的输出 {sorted(outputs)} 与声明的 {sorted(stage.outputs)} 不一致")
+        hashes = {item: value_hash(value) for item, value in outputs.items()}
+        if stage.cacheable is not None and not stage.cacheable(outputs):
+            print(f"⚠️  [{stage.name}] 输出不完整，下次不复用")
+            key = None
+        self.cache.save(stage.name, key, outputs, hashes)
+        print(f"▶️  [{stage.name}] 完成（{time.perf_counter() - start:.1f}s）")
+        return outputs, hashes
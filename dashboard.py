@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 统一命令行入口
+
+用法:
+    python dashboard.py collect [--no-cache] [--refresh]   采集内容，写出 data.json
+    python dashboard.py render [--force]                   从 data.json 生成网页和搜索索引
+    python dashboard.py all [--no-cache] [--refresh] [--force] [--from STAGE]
+                                                           按阶段 DAG 在同一进程内采集并渲染，数据在内存中传递
+    python dashboard.py topics [--only a,b] [--render-only] [--no-cache] [--refresh] [--force]
+                                                           按 config.TOPICS 采集并渲染多个主题面板
+    python dashboard.py serve [--watch] [--host HOST] [--port PORT]
+                                                           本地预览 OUTPUT_DIR；--watch 时文件变化后重新渲染首页并自动刷新浏览器
+
+all 的阶段: search_news / search_cases（并行）→ dedupe →（级联模式: refine_news / refine_cases）
+→ save → render → search_index。输入不变的阶段复用上次的输出，--from 只重跑该阶段及其下游。
+各子命令只在执行时导入自己需要的模块：render 不会导入 openai。
+"""
+
+import argparse
+import sys
+import config
+
+
+def run_collect(args):
+    """采集内容，返回数据（出错时为 None）"""
+    from collect_content import collect
+    return collect(use_cache=not args.no_cache, refresh_cache=args.refresh)
+
+
+def run_render(args, data=None):
+    """生成网页，再构建搜索索引"""
+    from generate_html import render
+    success = render(data=data, force=args.force)
+    if success and config.SEARCH_ENABLED:
+        from build_search_index import main as build_search_index
+        build_search_index()
+    return success
+
+
+def build_pipeline(args):
+    """从搜索到发布的阶段 DAG"""
+    import threading
+    from datetime import datetime
+    from collect_content import AINewsCollector, print_summary, write_metrics
+    from dag import Pipeline, Stage
+    from generate_html import render
+
+    holder, lock = {}, threading.Lock()
+
+    def collector():
+        """第一次需要时才创建（上游全部复用缓存时不初始化 API 客户端）"""
+        with lock:
+            if 'collector' not in holder:
+                holder['collector'] = AINewsCollector(use_cache=not args.no_cache, refresh_cache=args.refresh)
+            return holder['collector']
+
+    def search_key(keywords):
+        # 同一天内查询和模型不变时复用搜索结果（与近似去重"当天重跑结果不变"一致）
+        return lambda: {
+            'keywords': keywords,
+            'model': config.QWEN_MODEL,
+            'triage_model': config.CASCADE_MODE and config.CASCADE_TRIAGE_MODEL,
+            'delta': config.DELTA_MODE,
+            'scheduler': config.KEYWORD_SCHEDULER,
+            'day': datetime.now().strftime('%Y-%m-%d'),
+        }
+
+    # 级联模式下去重的结果只是候选，精写后才是 news / cases
+    dedupe_outputs = ['news_candidates', 'case_candidates'] if config.CASCADE_MODE else ['news', 'cases']
+
+    def dedupe(news_results, case_results):
+        return dict(zip(dedupe_outputs, collector().dedupe_stage(news_results, case_results)))
+
+    def save(news, cases):
+        data = collector().save_data(news, cases)
+        write_metrics(collector())
+        print_summary(data)
+        return {'data': data}
+
+    def search_index(site):
+        from build_search_index import main as build_search_index
+        return {'search_index': build_search_index() if site else None}
+
+    stages = [
+        Stage('search_news', lambda: {'news_results': collector().search_stage('news')},
+              outputs=['news_results'], key=search_key(AINewsCollector.news_keywords),
+              cacheable=lambda outputs: collector().search_complete('news', outputs['news_results'])),
+        Stage('search_cases', lambda: {'case_results': collector().search_stage('case')},
+              outputs=['case_results'], key=search_key(AINewsCollector.case_keywords),
+              cacheable=lambda outputs: collector().search_complete('case', outputs['case_results'])),
+        # 去重只做本地计算，但要写近似去重索引、记录关键词产出，每次都执行
+        Stage('dedupe', dedupe, inputs=['news_results', 'case_results'], outputs=dedupe_outputs, cache=False),
+    ]
+    if config.CASCADE_MODE:
+        stages += [
+            Stage('refine_news', lambda news_candidates: {'news': collector().refine_stage(news_candidates, 'news')},
+                  inputs=['news_candidates'], outputs=['news']),
+            Stage('refine_cases', lambda case_candidates: {'cases': collector().refine_stage(case_candidates, 'case')},
+                  inputs=['case_candidates'], outputs=['cases']),
+        ]
+    # 有副作用的阶段（写历史库、写网页）每次都执行；网页本身按内容哈希跳过未变化的页面
+    stages += [
+        Stage('save', save, inputs=['news', 'cases'], outputs=['data'], cache=False),
+        Stage('render', lambda data: {'site': render(data=data, force=args.force)},
+              inputs=['data'], outputs=['site'], cache=False),
+    ]
+    if config.SEARCH_ENABLED:
+        stages.append(Stage('search_index', search_index, inputs=['site'], outputs=['search_index'], cache=False))
+    return Pipeline(stages, config.STAGE_CACHE_DIR, max_workers=config.PIPELINE_MAX_WORKERS)
+
+
+def run_all(args):
+    """
+    按阶段 DAG 执行；采集出错时用已有的 data.json 渲染（与分步执行时一致）
+    """
+    pipeline = build_pipeline(args)
+    try:
+        values = pipeline.run(from_stage=args.from_stage, force=args.refresh or args.no_cache)
+    except Exception as e:
+        print(f"\n❌ 流水线出错: {e}")
+        import traceback
+        traceback.print_exc()
+        if args.from_stage or 'data' in pipeline.values:
+            return False
+        return run_render(args)
+    return values.get('site', False)
+
+
+def run_topics(args):
+    """多主题：共享采集器并发采集，进程池渲染到 OUTPUT_DIR/<主题名>/"""
+    import topics as topic_builds
+    selected = topic_builds.select_topics(args.only)
+    datas = {}
+    if not args.render_only:
+        from collect_content import AINewsCollector
+        collector = AINewsCollector(use_cache=not args.no_cache, refresh_cache=args.refresh)
+        print(f"\n🗂️  采集 {len(selected)} 个主题: {', '.join(selected)}")
+        datas = topic_builds.collect_topics(collector, selected)
+    results = topic_builds.render_topics(selected, datas, force=args.force)
+    print("\n" + "=" * 60)
+    for name, success in results.items():
+        print(f"{'✅' if success else '❌'} {name}: {config.OUTPUT_DIR}/{name}/index.html")
+    print("=" * 60)
+    return all(results.values())
+
+
+def run_serve(args):
+    """本地预览服务器，--watch 时常驻渲染器并自动刷新页面"""
+    from dev_server import serve
+    return serve(args.host, args.port, watch_files=args.watch)
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='AI+项目管理信息面板')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    collect_parser = commands.add_parser('collect', help='采集内容并写出 data.json')
+    render_parser = commands.add_parser('render', help='从 data.json 生成网页和搜索索引')
+    all_parser = commands.add_parser('all', help='采集并生成网页（同一进程，数据在内存中传递）')
+    topics_parser = commands.add_parser('topics', help='按 config.TOPICS 采集并生成多个主题面板')
+    serve_parser = commands.add_parser('serve', help='本地预览生成的网页')
+
+    for sub in (collect_parser, all_parser, topics_parser):
+        sub.add_argument('--no-cache', action='store_true', help='不读取也不写入响应缓存')
+        sub.add_argument('--refresh', action='store_true', help='忽略已有缓存重新请求，并刷新缓存')
+    for sub in (render_parser, all_parser, topics_parser):
+        sub.add_argument('--force', action='store_true', help='忽略内容哈希，强制重新生成')
+    all_parser.add_argument('--from', dest='from_stage', metavar='STAGE',
+                            help='只重跑该阶段及其下游（如 render），上游沿用上次的输出')
+    topics_parser.add_argument('--only', metavar='NAMES', help='只处理这些主题（逗号分隔）')
+    topics_parser.add_argument('--render-only', action='store_true', help='不采集，用各主题已有的 data.json 渲染')
+    serve_parser.add_argument('--watch', action='store_true',
+                              help='监视数据、配置和模板文件，变化后重新渲染首页并通知浏览器刷新')
+    serve_parser.add_argument('--host', help=f'监听地址（默认 {config.SERVE_HOST}）')
+    serve_parser.add_argument('--port', type=int, help=f'端口（默认 {config.SERVE_PORT}）')
+
+    collect_parser.set_defaults(handler=run_collect)
+    render_parser.set_defaults(handler=run_render)
+    all_parser.set_defaults(handler=run_all)
+    topics_parser.set_defaults(handler=run_topics)
+    serve_parser.set_defaults(handler=run_serve)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """主函数，返回进程退出码"""
+    args = parse_args(argv)
+    result = args.handler(args)
+    return 0 if result else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
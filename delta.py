@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 增量采集
+从历史库取出上次更新时间和近期已收录条目的标题指纹：
+增量模式下写进提示词，让模型只返回新内容；无论是否开启，都用来统计采集到的条目有多少是新的
+"""
+
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from history_store import HistoryStore, history_exists
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def title_fingerprint(title, length=24):
+    """
+    标题指纹：全角转半角、小写、去掉标点和空白后取前 length 个字符
+
+    Args:
+        title: 原始标题
+        length: 指纹长度（字符）
+
+    Returns:
+        str: 指纹（标题为空时为空串）
+    """
+    text = unicodedata.normalize('NFKC', str(title or '')).lower()
+    return _NON_WORD.sub('', text)[:length]
+
+
+class DeltaContext:
+    """上次运行的时间和已收录条目"""
+
+    def __init__(self, since, titles, prompt_limit=30, length=24):
+        """
+        Args:
+            since: 上次更新时间（如 "2026年02月15日 10:30"），没有历史时为 None
+            titles: {content_type: [标题, ...]}，最近收录的在前
+            prompt_limit: 每类写进提示词的标题数
+            length: 指纹长度
+        """
+        self.since = since
+        self.length = length
+        self.titles = titles
+        self.prompt_limit = prompt_limit
+        self.fingerprints = {kind: {title_fingerprint(title, length) for title in values} - {''}
+                             for kind, values in titles.items()}
+
+    @classmethod
+    def load(cls, db_path, days=14, prompt_limit=30, length=24, today=None):
+        """
+        从历史库加载最近 days 天收录的标题
+
+        历史库不存在但有文本导出（如 CI 缓存失效）时，打开 HistoryStore 会先从导出重建
+
+        Returns:
+            DeltaContext: 历史库和导出都不存在时返回空上下文（所有条目都算新的）
+        """
+        if not history_exists(db_path):
+            return cls(None, {'news': [], 'case': []}, prompt_limit, length)
+        today = today or datetime.now()
+        start_day = (today - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        store = HistoryStore(db_path)
+        try:
+            since = store.last_update_time()
+            titles = {'news': store.recent_titles('news', start_day),
+                      'case': store.recent_titles('cases', start_day)}
+        finally:
+            store.close()
+        return cls(since, titles, prompt_limit, length)
+
+    def known(self, content_type):
+        """写进提示词的已收录标题（按指纹去重，截断到指纹长度以压缩提示词）"""
+        seen, known = set(), []
+        for title in self.titles.get(content_type, []):
+            fingerprint = title_fingerprint(title, self.length)
+            if fingerprint and fingerprint not in seen:
+                seen.add(fingerprint)
+                known.append(unicodedata.normalize('NFKC', title).strip()[:self.length * 2])
+            if len(known) >= self.prompt_limit:
+                break
+        return known
+
+    def is_novel(self, item, content_type):
+        """条目的标题指纹不在近期历史中"""
+        return title_fingerprint(item.get('title'), self.length) not in self.fingerprints.get(content_type, ())
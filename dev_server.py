@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 本地预览服务器
+serve 用标准库 HTTP 服务器托管 OUTPUT_DIR。--watch 时常驻一个 DashboardGenerator，轮询数据文件、
+config.py 和模板文件（generate_html.py / assets.py / records.py）的修改时间：
+数据变化时重新读取数据，片段缓存留在内存中，只渲染变化的条目；配置或模板变化时重新加载这些模块。
+写出首页后通过 SSE（Server-Sent Events）通知打开的页面刷新。
+
+监视模式只重写首页，不重建归档和搜索索引，改动生效的时间与归档大小无关；
+需要更新归档时运行 python dashboard.py render。
+"""
+
+import functools
+import importlib
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import assets
+import config
+import generate_html
+import records
+from history_store import HistoryStore
+
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_SCRIPT = (f'<script>new EventSource("{LIVE_RELOAD_PATH}")'
+                      '.addEventListener("reload",function(){location.reload()})</script>')
+
+# 修改后需要重新加载的模块（与 generate_html.template_fingerprint 覆盖的文件一致），按依赖顺序
+TEMPLATE_MODULES = (config, assets, records, generate_html)
+
+
+class FileWatcher:
+    """按修改时间和大小轮询一组文件（只 stat 几个文件，轮询间隔可以很短）"""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.signatures = {path: self._signature(path) for path in self.paths}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self):
+        """返回上次调用以来变化过的文件"""
+        changed = []
+        for path in self.paths:
+            signature = self._signature(path)
+            if signature != self.signatures[path]:
+                self.signatures[path] = signature
+                changed.append(path)
+        return changed
+
+
+class LiveReload:
+    """刷新通知：每次重新渲染版本号加一，SSE 连接等待版本号变化"""
+
+    def __init__(self):
+        self.version = 0
+        self.clients = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """等到版本号不等于 version 或超时，返回当前版本号"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class DevRenderer:
+    """常驻的首页渲染器"""
+
+    def __init__(self):
+        self.generator = None
+        self._load_generator()
+
+    @staticmethod
+    def template_files():
+        return [os.path.abspath(module.__file__) for module in TEMPLATE_MODULES]
+
+    @staticmethod
+    def data_files():
+        return [path for path in (config.DATA_FILE, config.DATA_SNAPSHOT) if path]
+
+    def _load_generator(self):
+        self.generator = generate_html.DashboardGenerator(config.DATA_FILE, snapshot_file=config.DATA_SNAPSHOT)
+
+    def nav_html(self):
+        """首页导航：归档月份直接从历史库读取，不重建归档"""
+        if not config.ARCHIVE_ENABLED or not os.path.exists(config.HISTORY_DB):
+            return ''
+        store = HistoryStore(config.HISTORY_DB)
+        try:
+            months = sorted({day[:7] for day, _ in store.daily_runs()})
+        finally:
+            store.close()
+        return self.generator.index_nav(months)
+
+    def render(self, changed=()):
+        """
+        按变化的文件重新渲染首页
+
+        Args:
+            changed: 变化的文件路径；包含配置或模板文件时先重新加载模块
+
+        Returns:
+            bool: 是否渲染成功
+        """
+        templates = set(self.template_files())
+        if templates.intersection(os.path.abspath(path) for path in changed):
+            for module in TEMPLATE_MODULES:
+                importlib.reload(module)
+            self._load_generator()
+        elif changed and not self.generator.reload():
+            return False
+        return self.generator.generate_html(nav_html=self.nav_html())
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """静态文件 + SSE 刷新通知；监视模式下在 HTML 页面末尾插入刷新脚本"""
+
+    live_reload = None  # 由 serve() 设置，None 表示不监视
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if self.live_reload is not None and path == LIVE_RELOAD_PATH:
+            return self._event_stream()
+        local = self.translate_path(path)
+        if os.path.isdir(local):
+            local = os.path.join(local, 'index.html')
+        if self.live_reload is not None and local.endswith('.html') and os.path.isfile(local):
+            return self._html_with_script(local)
+        return super().do_GET()
+
+    def _html_with_script(self, local):
+        with open(local, 'rb') as f:
+            body = f.read()
+        marker = body.rfind(b'</body>')
+        script = LIVE_RELOAD_SCRIPT.encode('utf-8')
+        body = body[:marker] + script + body[marker:] if marker >= 0 else body + script
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _event_stream(self):
+        """保持连接，版本号变化时发送 reload 事件，空闲时定期发送注释行以发现断开的连接"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        live_reload = self.live_reload
+        live_reload.clients += 1
+        try:
+            version = live_reload.version
+            self.wfile.write(b'retry: 500\n\n')
+            self.wfile.flush()
+            while True:
+                current = live_reload.wait(version, timeout=15)
+                if current != version:
+                    version = current
+                    self.wfile.write(f'event: reload\ndata: {version}\n\n'.encode('utf-8'))
+                else:
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            live_reload.clients -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host, port, live_reload=None):
+    """在后台线程中启动 HTTP 服务器，返回 server（port 为 0 时由系统分配端口）"""
+    handler = type('Handler', (LiveReloadHandler,), {'live_reload': live_reload})
+    server = ThreadingHTTPServer((host, port), functools.partial(handler, directory=config.OUTPUT_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(renderer, live_reload, interval, stop=None):
+    """
+    轮询数据、配置和模板文件，变化后重新渲染首页并通知页面刷新
+
+    Args:
+        interval: 轮询间隔（秒）
+        stop: threading.Event，设置后退出（默认一直运行）
+    """
+    stop = stop or threading.Event()
+    watcher = FileWatcher(renderer.data_files() + renderer.template_files())
+    while not stop.wait(interval):
+        changed = watcher.changed()
+        if not changed:
+            continue
+        start = time.perf_counter()
+        try:
+            success = renderer.render(changed)
+        except Exception as e:
+            # 编辑中的文件可能暂时不完整，等下一次修改
+            print(f"❌ 重新渲染失败: {type(e).__name__}: {e}")
+            continue
+        if success:
+            live_reload.notify()
+            names = ', '.join(os.path.basename(path) for path in changed)
+            print(f"🔄 {names} 已变化，{(time.perf_counter() - start) * 1000:.0f}ms 内重新渲染，"
+                  f"通知 {live_reload.clients} 个页面刷新")
+
+
+def serve(host=None, port=None, watch_files=False):
+    """
+    启动本地预览服务器，直到 Ctrl+C
+
+    Args:
+        watch_files: 监视文件变化并自动刷新页面
+    """
+    host = host or config.SERVE_HOST
+    port = config.SERVE_PORT if port is None else port
+    live_reload = renderer = None
+    if watch_files:
+        renderer = DevRenderer()
+        if not renderer.render():
+            return False
+        live_reload = LiveReload()
+    server = start_server(host, port, live_reload)
+    print(f"\n🌐 本地预览: http://{host}:{server.server_address[1]}/"
+          f"{'（监视文件变化，自动刷新）' if watch_files else ''}，按 Ctrl+C 停止")
+    try:
+        if watch_files:
+            watch(renderer, live_reload, config.SERVE_POLL_INTERVAL)
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\n👋 已停止")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return True
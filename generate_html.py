@@ -3,69 +3,569 @@
 AI+项目管理信息面板 - 网页生成器
 """
 
+import argparse
+import hashlib
+import itertools
 import json
+import os
+import re
+import tempfile
 from datetime import datetime
+import assets
 import config
-import os
+import records
+from history_store import HistoryStore
+from metrics import MetricsRecorder, timed_stage
+from serialization import LazyItems, load_file
+
+def content_hash(obj):
+    """对可 JSON 序列化的对象计算稳定的内容哈希"""
+    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def template_fingerprint():
+    """模板和配置的指纹：本文件、config.py、assets.py 或 records.py 改动后所有缓存失效"""
+    digest = hashlib.sha256()
+    for path in (__file__, config.__file__, assets.__file__, records.__file__):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+# 页面样式：写成带内容哈希的独立样式表，所有页面共用
+PAGE_CSS = '''* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'PingFang SC', 'Microsoft YaHei', sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 20px;
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+.header {
+    background: white;
+    border-radius: 16px;
+    padding: 30px;
+    margin-bottom: 30px;
+    box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+}
+
+.header h1 {
+    font-size: 32px;
+    color: #2d3748;
+    margin-bottom: 10px;
+}
+
+.header p {
+    color: #718096;
+    font-size: 16px;
+}
+
+.update-time {
+    display: inline-block;
+    background: #e6fffa;
+    color: #047857;
+    padding: 6px 12px;
+    border-radius: 6px;
+    font-size: 14px;
+    margin-top: 10px;
+}
+
+.auto-badge {
+    display: inline-block;
+    background: #fef3c7;
+    color: #d97706;
+    padding: 6px 12px;
+    border-radius: 6px;
+    font-size: 14px;
+    margin-left: 10px;
+}
+
+.archive-nav {
+    margin-top: 15px;
+    font-size: 14px;
+    line-height: 2.2;
+}
+
+.archive-nav a {
+    display: inline-block;
+    background: #edf2f7;
+    color: #4a5568;
+    padding: 2px 10px;
+    border-radius: 6px;
+    margin-right: 6px;
+    text-decoration: none;
+}
+
+.archive-nav a.current {
+    background: #667eea;
+    color: white;
+}
+
+.search-panel {
+    margin-top: 15px;
+}
+
+.search-box {
+    width: 100%;
+    padding: 10px 14px;
+    border: 2px solid #e2e8f0;
+    border-radius: 8px;
+    font-size: 15px;
+}
+
+.search-box:focus {
+    outline: none;
+    border-color: #667eea;
+}
+
+.search-hit {
+    padding: 8px 4px;
+    border-bottom: 1px solid #f7fafc;
+    font-size: 14px;
+}
+
+.search-hit a {
+    color: #2d3748;
+    font-weight: 600;
+    margin-right: 10px;
+}
+
+.search-hit span {
+    color: #a0aec0;
+    font-size: 12px;
+}
+
+.dashboard {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 30px;
+}
+
+@media (max-width: 968px) {
+    .dashboard, .trend-bar {
+        grid-template-columns: 1fr;
+    }
+}
+
+.panel {
+    background: white;
+    border-radius: 16px;
+    padding: 30px;
+    box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+}
+
+.panel-header {
+    display: flex;
+    align-items: center;
+    margin-bottom: 25px;
+    padding-bottom: 20px;
+    border-bottom: 2px solid #f7fafc;
+}
+
+.panel-icon {
+    font-size: 32px;
+    margin-right: 15px;
+}
+
+.panel-title {
+    font-size: 24px;
+    color: #2d3748;
+    font-weight: 600;
+}
+
+.news-item {
+    margin-bottom: 25px;
+    padding: 20px;
+    background: #f7fafc;
+    border-radius: 12px;
+    border-left: 4px solid #667eea;
+    transition: all 0.3s ease;
+}
+
+.news-item:hover {
+    transform: translateX(5px);
+    box-shadow: 0 4px 12px rgba(102, 126, 234, 0.2);
+}
+
+.news-title {
+    font-size: 18px;
+    color: #2d3748;
+    font-weight: 600;
+    margin-bottom: 10px;
+    display: flex;
+    align-items: center;
+    flex-wrap: wrap;
+}
+
+.priority-badge {
+    display: inline-block;
+    padding: 4px 10px;
+    border-radius: 12px;
+    font-size: 12px;
+    font-weight: 600;
+    margin-left: 10px;
+}
+
+.priority-high {
+    background: #fee2e2;
+    color: #dc2626;
+}
+
+.priority-medium {
+    background: #fef3c7;
+    color: #d97706;
+}
+
+.news-summary {
+    color: #4a5568;
+    font-size: 15px;
+    line-height: 1.6;
+    margin-bottom: 10px;
+}
+
+.news-meta {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-top: 12px;
+    font-size: 13px;
+    color: #a0aec0;
+    flex-wrap: wrap;
+    gap: 10px;
+}
+
+.news-tag {
+    display: inline-block;
+    background: #e0e7ff;
+    color: #4f46e5;
+    padding: 4px 10px;
+    border-radius: 6px;
+    margin-right: 6px;
+    font-size: 12px;
+}
+
+.case-item {
+    margin-bottom: 25px;
+    padding: 20px;
+    background: #f0fdf4;
+    border-radius: 12px;
+    border-left: 4px solid #10b981;
+    transition: all 0.3s ease;
+}
+
+.case-item:hover {
+    transform: translateX(5px);
+    box-shadow: 0 4px 12px rgba(16, 185, 129, 0.2);
+}
+
+.case-title {
+    font-size: 18px;
+    color: #2d3748;
+    font-weight: 600;
+    margin-bottom: 10px;
+}
+
+.case-company {
+    display: inline-block;
+    background: #d1fae5;
+    color: #047857;
+    padding: 4px 10px;
+    border-radius: 6px;
+    font-size: 13px;
+    font-weight: 600;
+    margin-bottom: 12px;
+}
+
+.case-description {
+    color: #4a5568;
+    font-size: 15px;
+    line-height: 1.6;
+    margin-bottom: 12px;
+}
+
+.case-impact {
+    background: white;
+    padding: 12px;
+    border-radius: 8px;
+    margin-top: 12px;
+}
+
+.impact-title {
+    font-size: 13px;
+    color: #059669;
+    font-weight: 600;
+    margin-bottom: 6px;
+}
+
+.impact-value {
+    color: #2d3748;
+    font-size: 14px;
+    line-height: 1.8;
+}
+
+.stats-bar {
+    display: flex;
+    gap: 15px;
+    margin-bottom: 20px;
+}
+
+.stat-item {
+    flex: 1;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 15px;
+    border-radius: 10px;
+    text-align: center;
+}
+
+.stat-number {
+    font-size: 24px;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+
+.stat-label {
+    font-size: 12px;
+    opacity: 0.9;
+}
+
+.trend-bar {
+    display: grid;
+    grid-template-columns: repeat(3, 1fr);
+    gap: 15px;
+    margin-bottom: 20px;
+}
+
+.trend-panel {
+    background: white;
+    border-radius: 12px;
+    padding: 15px 20px;
+    box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+}
+
+.trend-title {
+    font-size: 14px;
+    font-weight: 600;
+    color: #2d3748;
+    margin-bottom: 10px;
+}
+
+.trend-row {
+    display: flex;
+    justify-content: space-between;
+    font-size: 13px;
+    color: #4a5568;
+    padding: 3px 0;
+}
+
+.trend-up {
+    color: #059669;
+    font-weight: 600;
+}
+
+.trend-empty {
+    font-size: 13px;
+    color: #a0aec0;
+}
+
+.trend-chart {
+    display: flex;
+    align-items: flex-end;
+    gap: 6px;
+    height: 90px;
+}
+
+.trend-column {
+    flex: 1;
+    display: flex;
+    flex-direction: column;
+    justify-content: flex-end;
+    align-items: center;
+    height: 100%;
+    font-size: 11px;
+    color: #718096;
+}
+
+.trend-fill {
+    width: 100%;
+    background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
+    border-radius: 4px 4px 0 0;
+    margin: 2px 0;
+}
+
+.footer {
+    text-align: center;
+    color: white;
+    margin-top: 30px;
+    padding: 20px;
+    font-size: 14px;
+    opacity: 0.9;
+}
+
+.footer a {
+    color: white;
+    text-decoration: underline;
+}
+'''
 
 class DashboardGenerator:
     """信息面板网页生成器"""
     
-    def __init__(self, data_file='data.json'):
-        """初始化生成器"""
+    def __init__(self, data_file='data.json', use_fragment_cache=True, snapshot_file=None, data=None):
+        """
+        初始化生成器
+        
+        Args:
+            data_file: 数据文件（JSON，或 serialization 写出的快照）
+            use_fragment_cache: 是否缓存条目片段（渲染超大数据量时可关闭以保持内存平稳）
+            snapshot_file: 与 data_file 内容相同的快照，不比 data_file 旧时优先 mmap 读取
+            data: 已在内存中的数据（同一进程内刚采集完时传入，不再读文件）
+        """
         self.data_file = data_file
-        self.data = self._load_data()
+        self.snapshot_file = snapshot_file
+        self.data = data if data is not None else self._load_data()
+        self.template_hash = template_fingerprint()
+        # 条目片段缓存：内容哈希 -> 渲染好的HTML，按最近使用的先后排列（最久未用的在前）
+        self.use_fragment_cache = use_fragment_cache
+        self.fragments = self._load_fragments() if use_fragment_cache else {}
+        self._rendered_count = 0
+        self._reused_count = 0
+        self._stylesheet = None
+        self.metrics = MetricsRecorder(config.MODEL_PRICES)
     
     def _load_data(self):
-        """加载数据"""
+        """加载数据（快照只解析头部，条目在渲染时逐条解码）"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            if self.snapshot_file and os.path.exists(self.snapshot_file) and \
+                    os.path.getmtime(self.snapshot_file) >= os.path.getmtime(self.data_file):
+                return load_file(self.snapshot_file)
+            return load_file(self.data_file, config.DATA_BACKEND)
         except FileNotFoundError:
             print(f"❌ 数据文件不存在: {self.data_file}")
             return None
     
+    def reload(self):
+        """
+        常驻进程（serve --watch）中重新读取数据文件
+        
+        片段缓存留在内存中，没变的条目不再渲染
+        
+        Returns:
+            bool: 是否读到数据
+        """
+        self._rendered_count = self._reused_count = 0
+        self.data = self._load_data()
+        return bool(self.data)
+    
+    def _load_fragments(self):
+        """加载片段缓存（模板变化后整体作废）"""
+        try:
+            with open(config.RENDER_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if cache.get('template_hash') != self.template_hash:
+            return {}
+        return cache.get('fragments', {})
+    
+    def _save_fragments(self):
+        """
+        保存片段缓存，超过 RENDER_CACHE_MAX_FRAGMENTS 条时淘汰最久未用到的
+        
+        本次跳过的页面（如未变化的归档）的片段照样保留，下次完整渲染不必从头开始
+        """
+        excess = len(self.fragments) - config.RENDER_CACHE_MAX_FRAGMENTS
+        for key in list(itertools.islice(self.fragments, max(excess, 0))):
+            del self.fragments[key]
+        cache_dir = os.path.dirname(config.RENDER_CACHE_FILE) or '.'
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'template_hash': self.template_hash, 'fragments': self.fragments},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, config.RENDER_CACHE_FILE)
+    
+    def _fragment(self, kind, item, render):
+        """按条目内容哈希取缓存片段，未命中时渲染"""
+        if not self.use_fragment_cache:
+            self._rendered_count += 1
+            return render(item)
+        
+        key = content_hash([kind, item.values()])
+        # 取出后重新插入，字典顺序即最近使用的顺序
+        html = self.fragments.pop(key, None)
+        if html is None:
+            html = render(item)
+            self._rendered_count += 1
+        else:
+            self._reused_count += 1
+        self.fragments[key] = html
+        return html
+    
+    def iter_news_html(self, news_list):
+        """逐条生成AI动态HTML片段"""
+        for news in news_list:
+            yield self._fragment('news', records.NewsItem.coerce(news), self._render_news_item)
+    
     def generate_news_html(self, news_list):
         """生成AI动态HTML"""
-        html = ""
-        for news in news_list:
-            priority_class = 'priority-high' if news.get('priority') == 'high' else 'priority-medium'
-            priority_emoji = '🔴' if news.get('priority') == 'high' else '🟡'
-            priority_text = '重要' if news.get('priority') == 'high' else '关注'
-            
-            tags_html = ''.join([f'<span class="news-tag">{tag}</span>' for tag in news.get('tags', [])])
-            
-            html += f'''
+        return ''.join(self.iter_news_html(news_list))
+    
+    def _render_news_item(self, news):
+        """渲染单条AI动态（NewsItem）"""
+        high = news.priority == 'high'
+        priority_class = 'priority-high' if high else 'priority-medium'
+        priority_emoji = '🔴' if high else '🟡'
+        priority_text = '重要' if high else '关注'
+        
+        tags_html = ''.join([f'<span class="news-tag">{tag}</span>' for tag in news.tags])
+        
+        return f'''
                 <div class="news-item">
                     <div class="news-title">
-                        {news.get('title', '未知标题')}
+                        {news.title}
                         <span class="priority-badge {priority_class}">{priority_emoji} {priority_text}</span>
                     </div>
                     <div class="news-summary">
-                        {news.get('summary', '暂无摘要')}
+                        {news.summary}
                     </div>
                     <div class="news-meta">
                         <div>
                             {tags_html}
                         </div>
-                        <span>{news.get('date', '未知日期')}</span>
+                        <span>{news.date}</span>
                     </div>
                 </div>
             '''
-        return html
+    
+    def iter_cases_html(self, cases_list):
+        """逐个生成案例HTML片段"""
+        for case in cases_list:
+            yield self._fragment('case', records.CaseItem.coerce(case), self._render_case_item)
     
     def generate_cases_html(self, cases_list):
         """生成案例HTML"""
-        html = ""
-        for case in cases_list:
-            impact_html = '<br>'.join([f"• {item}" for item in case.get('impact', [])])
-            
-            html += f'''
+        return ''.join(self.iter_cases_html(cases_list))
+    
+    def _render_case_item(self, case):
+        """渲染单个案例（CaseItem）"""
+        impact_html = '<br>'.join([f"• {item}" for item in case.impact])
+        
+        return f'''
                 <div class="case-item">
-                    <div class="case-title">{case.get('title', '未知案例')}</div>
-                    <span class="case-company">{case.get('industry', '行业')} · {case.get('company', '未知公司')}</span>
+                    <div class="case-title">{case.title}</div>
+                    <span class="case-company">{case.industry} · {case.company}</span>
                     <div class="case-description">
-                        {case.get('description', '暂无描述')}
+                        {case.description}
                     </div>
                     <div class="case-impact">
                         <div class="impact-title">📊 实际效果</div>
@@ -73,293 +573,126 @@ class DashboardGenerator:
                     </div>
                 </div>
             '''
-        return html
     
-    def generate_html(self, output_file='index.html'):
-        """生成完整的HTML页面"""
+    def _existing_hash(self, output_path):
+        """读取已生成页面开头记录的内容哈希（压缩后的页面没有换行，按前缀查找）"""
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                head = f.read(256)
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+        match = re.search(r'<!-- content-hash: ([0-9a-f]+) -->', head)
+        return match.group(1) if match else None
+    
+    def stylesheet_href(self):
+        """共用样式表的路径（相对网站根目录），第一次调用时写出"""
+        if self._stylesheet is None:
+            self._stylesheet = assets.write_stylesheet(PAGE_CSS, config.OUTPUT_DIR, config.ASSETS_DIR,
+                                                       minify=config.ASSETS_MINIFY)
+        return self._stylesheet
+    
+    @timed_stage('generate_html')
+    def generate_html(self, output_file='index.html', force=False, nav_html=''):
+        """
+        生成完整的HTML页面
+        
+        数据和模板/配置都没变时跳过写入；条目片段按内容哈希缓存，只渲染变化的条目
+        
+        Args:
+            output_file: 输出文件名（位于 config.OUTPUT_DIR）
+            force: 忽略内容哈希，强制重新生成
+            nav_html: 页头下方的导航（如归档入口）
+        """
         if not self.data:
             print("❌ 无数据，无法生成网页")
             return False
         
-        news_html = self.generate_news_html(self.data.get('news', []))
-        cases_html = self.generate_cases_html(self.data.get('cases', []))
+        written = self._write_page(output_file, self.data, nav_html, force)
+        if self.use_fragment_cache:
+            self._save_fragments()
+        output_path = os.path.join(config.OUTPUT_DIR, output_file)
+        if written:
+            print(f"✅ 网页已生成: {output_path}"
+                  f"（重新渲染 {self._rendered_count} 个条目，复用 {self._reused_count} 个）")
+        else:
+            print(f"⏭️  内容未变化，跳过写入: {output_path}")
+        return True
+    
+    def _write_page(self, output_file, data, nav_html='', force=False):
+        """
+        渲染并写出一个页面，内容哈希未变时跳过
         
-        stats = self.data.get('stats', {})
-        update_time = self.data.get('update_time', datetime.now().strftime('%Y年%m月%d日 %H:%M'))
+        Returns:
+            bool: 是否实际写入
+        """
+        output_path = os.path.join(config.OUTPUT_DIR, output_file)
+        page_hash = self.page_hash(output_file, data, nav_html)
+        if not force and self._existing_hash(output_path) == page_hash:
+            return False
+        
+        # 确保输出目录存在
+        output_dir = os.path.dirname(output_path)
+        os.makedirs(output_dir, exist_ok=True)
         
-        html_template = f'''<!DOCTYPE html>
+        # 逐块写入临时文件再替换：整页不会在内存中拼成一个字符串，读者也不会看到写了一半的页面
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+        try:
+            chunks = self.iter_page(page_hash, data, nav_html, base='../' * output_file.count('/'))
+            if config.ASSETS_MINIFY:
+                chunks = assets.iter_minified_html(chunks)
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=config.RENDER_BUFFER_SIZE) as f:
+                f.writelines(chunks)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return True
+    
+    def page_hash(self, output_file='index.html', data=None, nav_html=''):
+        """页面内容哈希：模板指纹 + 输出文件名 + 导航 + 数据，按条目逐个累加，不序列化整份数据"""
+        data = self.data if data is None else data
+        digest = hashlib.sha256()
+        digest.update(f'{self.template_hash}:{output_file}:{nav_html}'.encode('utf-8'))
+        for key, value in sorted(data.items()):
+            digest.update(key.encode('utf-8'))
+            values = value if isinstance(value, (list, LazyItems, records.ItemColumns)) else [value]
+            for item in values:
+                if isinstance(item, (records.NewsItem, records.CaseItem)):
+                    item = item.to_dict()
+                digest.update(json.dumps(item, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+                digest.update(b'\n')
+        return digest.hexdigest()
+    
+    def iter_page(self, page_hash='', data=None, nav_html='', base=''):
+        """
+        逐块生成整页HTML：页头、逐条动态、中段、逐条案例、页尾
+        
+        Args:
+            base: 页面到网站根目录的相对路径（归档页为 '../'），用于引用样式表
+        """
+        data = self.data if data is None else data
+        head, middle, tail = self._page_parts(page_hash, data, nav_html, base)
+        yield head
+        yield from self.iter_news_html(data.get('news', []))
+        yield middle
+        yield from self.iter_cases_html(data.get('cases', []))
+        yield tail
+    
+    def _page_parts(self, page_hash, data, nav_html='', base=''):
+        """页面的固定部分，条目片段插在 head/middle 与 middle/tail 之间"""
+        stats = data.get('stats', {})
+        update_time = data.get('update_time', datetime.now().strftime('%Y年%m月%d日 %H:%M'))
+        
+        head = f'''<!DOCTYPE html>
+<!-- content-hash: {page_hash} -->
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{config.SITE_TITLE}</title>
     <meta name="description" content="{config.SITE_DESCRIPTION}">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'PingFang SC', 'Microsoft YaHei', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-
-        .header {{
-            background: white;
-            border-radius: 16px;
-            padding: 30px;
-            margin-bottom: 30px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-
-        .header h1 {{
-            font-size: 32px;
-            color: #2d3748;
-            margin-bottom: 10px;
-        }}
-
-        .header p {{
-            color: #718096;
-            font-size: 16px;
-        }}
-
-        .update-time {{
-            display: inline-block;
-            background: #e6fffa;
-            color: #047857;
-            padding: 6px 12px;
-            border-radius: 6px;
-            font-size: 14px;
-            margin-top: 10px;
-        }}
-
-        .auto-badge {{
-            display: inline-block;
-            background: #fef3c7;
-            color: #d97706;
-            padding: 6px 12px;
-            border-radius: 6px;
-            font-size: 14px;
-            margin-left: 10px;
-        }}
-
-        .dashboard {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 30px;
-        }}
-
-        @media (max-width: 968px) {{
-            .dashboard {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-
-        .panel {{
-            background: white;
-            border-radius: 16px;
-            padding: 30px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-
-        .panel-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 25px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #f7fafc;
-        }}
-
-        .panel-icon {{
-            font-size: 32px;
-            margin-right: 15px;
-        }}
-
-        .panel-title {{
-            font-size: 24px;
-            color: #2d3748;
-            font-weight: 600;
-        }}
-
-        .news-item {{
-            margin-bottom: 25px;
-            padding: 20px;
-            background: #f7fafc;
-            border-radius: 12px;
-            border-left: 4px solid #667eea;
-            transition: all 0.3s ease;
-        }}
-
-        .news-item:hover {{
-            transform: translateX(5px);
-            box-shadow: 0 4px 12px rgba(102, 126, 234, 0.2);
-        }}
-
-        .news-title {{
-            font-size: 18px;
-            color: #2d3748;
-            font-weight: 600;
-            margin-bottom: 10px;
-            display: flex;
-            align-items: center;
-            flex-wrap: wrap;
-        }}
-
-        .priority-badge {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: 600;
-            margin-left: 10px;
-        }}
-
-        .priority-high {{
-            background: #fee2e2;
-            color: #dc2626;
-        }}
-
-        .priority-medium {{
-            background: #fef3c7;
-            color: #d97706;
-        }}
-
-        .news-summary {{
-            color: #4a5568;
-            font-size: 15px;
-            line-height: 1.6;
-            margin-bottom: 10px;
-        }}
-
-        .news-meta {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-top: 12px;
-            font-size: 13px;
-            color: #a0aec0;
-            flex-wrap: wrap;
-            gap: 10px;
-        }}
-
-        .news-tag {{
-            display: inline-block;
-            background: #e0e7ff;
-            color: #4f46e5;
-            padding: 4px 10px;
-            border-radius: 6px;
-            margin-right: 6px;
-            font-size: 12px;
-        }}
-
-        .case-item {{
-            margin-bottom: 25px;
-            padding: 20px;
-            background: #f0fdf4;
-            border-radius: 12px;
-            border-left: 4px solid #10b981;
-            transition: all 0.3s ease;
-        }}
-
-        .case-item:hover {{
-            transform: translateX(5px);
-            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.2);
-        }}
-
-        .case-title {{
-            font-size: 18px;
-            color: #2d3748;
-            font-weight: 600;
-            margin-bottom: 10px;
-        }}
-
-        .case-company {{
-            display: inline-block;
-            background: #d1fae5;
-            color: #047857;
-            padding: 4px 10px;
-            border-radius: 6px;
-            font-size: 13px;
-            font-weight: 600;
-            margin-bottom: 12px;
-        }}
-
-        .case-description {{
-            color: #4a5568;
-            font-size: 15px;
-            line-height: 1.6;
-            margin-bottom: 12px;
-        }}
-
-        .case-impact {{
-            background: white;
-            padding: 12px;
-            border-radius: 8px;
-            margin-top: 12px;
-        }}
-
-        .impact-title {{
-            font-size: 13px;
-            color: #059669;
-            font-weight: 600;
-            margin-bottom: 6px;
-        }}
-
-        .impact-value {{
-            color: #2d3748;
-            font-size: 14px;
-            line-height: 1.8;
-        }}
-
-        .stats-bar {{
-            display: flex;
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-
-        .stat-item {{
-            flex: 1;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px;
-            border-radius: 10px;
-            text-align: center;
-        }}
-
-        .stat-number {{
-            font-size: 24px;
-            font-weight: 700;
-            margin-bottom: 5px;
-        }}
-
-        .stat-label {{
-            font-size: 12px;
-            opacity: 0.9;
-        }}
-
-        .footer {{
-            text-align: center;
-            color: white;
-            margin-top: 30px;
-            padding: 20px;
-            font-size: 14px;
-            opacity: 0.9;
-        }}
-
-        .footer a {{
-            color: white;
-            text-decoration: underline;
-        }}
-    </style>
+    <link rel="stylesheet" href="{base}{self.stylesheet_href()}">
 </head>
 <body>
     <div class="container">
@@ -367,7 +700,7 @@ class DashboardGenerator:
             <h1>🚀 {config.SITE_TITLE}</h1>
             <p>{config.SITE_DESCRIPTION}</p>
             <span class="update-time">📅 最后更新: {update_time}</span>
-            <span class="auto-badge">🤖 自动更新 · 每天10:30</span>
+            <span class="auto-badge">🤖 自动更新 · 每天10:30</span>{nav_html}
         </div>
 
         <div class="stats-bar">
@@ -383,7 +716,7 @@ class DashboardGenerator:
                 <div class="stat-number">自动</div>
                 <div class="stat-label">智能更新</div>
             </div>
-        </div>
+        </div>{self.trends_html(data.get('trends'))}
 
         <div class="dashboard">
             <!-- 左侧：AI重要动态 -->
@@ -392,7 +725,8 @@ class DashboardGenerator:
                     <span class="panel-icon">🔥</span>
                     <h2 class="panel-title">AI重要动态</h2>
                 </div>
-                {news_html}
+                '''
+        middle = f'''
             </div>
 
             <!-- 右侧：AI+项目管理案例 -->
@@ -401,7 +735,8 @@ class DashboardGenerator:
                     <span class="panel-icon">💡</span>
                     <h2 class="panel-title">AI+项目管理实践</h2>
                 </div>
-                {cases_html}
+                '''
+        tail = f'''
             </div>
         </div>
 
@@ -412,26 +747,256 @@ class DashboardGenerator:
     </div>
 </body>
 </html>'''
+        return head, middle, tail
+
+    def trends_html(self, trends):
+        """
+        趋势面板：本周上升的标签、每周高优先级动态占比、行业分布
         
-        # 确保输出目录存在
-        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-        output_path = os.path.join(config.OUTPUT_DIR, output_file)
+        trends 来自历史库的周汇总（HistoryStore.trends），条数固定，与历史长度无关；没有时不显示
+        """
+        if not trends:
+            return ''
         
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        def rows(items):
+            if not items:
+                return '<div class="trend-empty">暂无数据</div>'
+            return ''.join(f'<div class="trend-row"><span>{label}</span>{value}</div>' for label, value in items)
         
-        print(f"✅ 网页已生成: {output_path}")
-        return True
-
-def main():
-    """主函数"""
+        tags = rows([(row['tag'], f'<span class="trend-up">{row["count"]} ↑{row["change"]}</span>')
+                     for row in trends.get('rising_tags', [])])
+        industries = rows([(row['industry'] or '其他', f'<span>{row["cases"]} · {row["pct"]}%</span>')
+                           for row in trends.get('industries', [])])
+        columns = ''.join(
+            f'<div class="trend-column" title="{row["week"]} 起: {row["high"]}/{row["news"]} 条重要">'
+            f'{row["high_pct"]}%<div class="trend-fill" style="height: {row["high_pct"]}%"></div>'
+            f'{row["week"][5:]}</div>'
+            for row in trends.get('weeks', [])
+        )
+        return f'''
+        
+        <div class="trend-bar">
+            <div class="trend-panel">
+                <div class="trend-title">📈 本周上升标签</div>
+                {tags}
+            </div>
+            <div class="trend-panel">
+                <div class="trend-title">🔴 每周重要动态占比</div>
+                <div class="trend-chart">{columns}</div>
+            </div>
+            <div class="trend-panel">
+                <div class="trend-title">🏭 近期案例行业分布</div>
+                {industries}
+            </div>
+        </div>'''
+    
+    @timed_stage('generate_archive')
+    def generate_archive(self, force=False):
+        """
+        根据历史库生成归档：每天一页、每月分页，并写出固定大小的 JSON 分片和清单
+        
+        Returns:
+            list: 有数据的月份（升序），没有历史时为空
+        """
+        if not os.path.exists(config.HISTORY_DB):
+            print(f"⚠️  历史库不存在，跳过归档: {config.HISTORY_DB}")
+            return []
+        
+        store = HistoryStore(config.HISTORY_DB)
+        try:
+            months = {}
+            for day, run_id in store.daily_runs():
+                months.setdefault(day[:7], []).append((day, run_id))
+            month_keys = sorted(months)
+            
+            shards = ShardWriter(os.path.join(config.OUTPUT_DIR, config.SHARD_DIR), config.SHARD_SIZE)
+            pages_written = 0
+            for month in month_keys:
+                days = [day for day, _ in months[month]]
+                month_news, month_cases = [], []
+                for day, run_id in months[month]:
+                    run = store.export_run(run_id)
+                    shards.add('news', run['news'], day)
+                    shards.add('cases', run['cases'], day)
+                    
+                    day_data = self._archive_data(run['update_time'], run['news'], run['cases'])
+                    nav = self._archive_nav(month_keys, month, days, current_day=day)
+                    pages_written += self._write_page(self._archive_file(day), day_data, nav, force)
+                    
+                    # 月度页面新的一天排在前面
+                    month_news[:0] = run['news']
+                    month_cases[:0] = run['cases']
+                
+                page_size = config.ARCHIVE_PAGE_SIZE
+                pages = max(1, -(-max(len(month_news), len(month_cases)) // page_size))
+                for page in range(1, pages + 1):
+                    start, end = (page - 1) * page_size, page * page_size
+                    page_data = self._archive_data(f'{month} 归档 · 第 {page}/{pages} 页',
+                                                   month_news[start:end], month_cases[start:end])
+                    nav = self._archive_nav(month_keys, month, days, page=page, pages=pages)
+                    pages_written += self._write_page(self._archive_file(month, page), page_data, nav, force)
+            
+            shards.finish(months={month: [day for day, _ in months[month]] for month in month_keys})
+        finally:
+            store.close()
+        
+        print(f"📚 归档已更新: {len(month_keys)} 个月，写入 {pages_written} 个页面，"
+              f"{shards.written} 个分片（共 {len(shards.files)} 个）")
+        return month_keys
+    
+    @staticmethod
+    def _archive_file(key, page=1):
+        """归档页的相对路径：天为 YYYY-MM-DD.html，月为 YYYY-MM.html / YYYY-MM-pN.html"""
+        name = key if page == 1 else f'{key}-p{page}'
+        return f'{config.ARCHIVE_DIR}/{name}.html'
+    
+    @staticmethod
+    def _archive_data(update_time, news, cases):
+        return {
+            'update_time': update_time,
+            'news': news,
+            'cases': cases,
+            'stats': {'news_count': len(news), 'case_count': len(cases)}
+        }
+    
+    def index_nav(self, months):
+        """首页导航：最近一个月的归档入口和搜索框，没有归档时为空"""
+        if not months:
+            return ''
+        nav_html = self.archive_link(months[-1])
+        if config.SEARCH_ENABLED:
+            # 索引由 build_search_index.py 在本步骤之后构建
+            from build_search_index import search_box_html
+            nav_html += search_box_html()
+        return nav_html
+    
+    def archive_link(self, month):
+        """首页上的归档入口"""
+        return (f'\n            <div class="archive-nav">'
+                f'<a href="{self._archive_file(month)}">📚 历史归档</a></div>')
+    
+    def _archive_nav(self, month_keys, month, days, current_day=None, page=1, pages=1):
+        """归档页导航：首页、月份、当月日期、分页"""
+        def link(href, text, current=False):
+            css = ' class="current"' if current else ''
+            return f'<a href="{href}"{css}>{text}</a>'
+        
+        prefix = '../' * config.ARCHIVE_DIR.count('/')
+        rows = [
+            link(f'../{prefix}index.html', '🏠 最新') + ''.join(
+                link(f'{m}.html', m, current=(m == month and current_day is None)) for m in reversed(month_keys)),
+            ''.join(link(f'{d}.html', d[5:], current=(d == current_day)) for d in reversed(days)),
+        ]
+        if pages > 1:
+            rows.append(''.join(
+                link(os.path.basename(self._archive_file(month, p)), f'第{p}页', current=(p == page))
+                for p in range(1, pages + 1)))
+        return ''.join(f'\n            <div class="archive-nav">{row}</div>' for row in rows)
+
+class ShardWriter:
+    """按时间顺序把条目切成固定大小的 JSON 分片，并生成清单 manifest.json"""
+    
+    def __init__(self, shard_dir, shard_size):
+        self.shard_dir = shard_dir
+        self.shard_size = shard_size
+        self._buffers = {'news': [], 'cases': []}
+        self._counts = {'news': 0, 'cases': 0}
+        self._shards = {'news': [], 'cases': []}
+        self.files = []
+        self.written = 0
+        os.makedirs(shard_dir, exist_ok=True)
+    
+    def add(self, kind, items, day):
+        """追加条目（需按日期升序调用），满一个分片就写出"""
+        buffer = self._buffers[kind]
+        for item in items:
+            buffer.append(dict(item, run_day=day))
+            if len(buffer) == self.shard_size:
+                self._flush(kind)
+    
+    def _flush(self, kind):
+        buffer = self._buffers[kind]
+        if not buffer:
+            return
+        index = len(self._shards[kind])
+        name = f'{kind}-{index:05d}.json'
+        self.written += write_json_if_changed(
+            os.path.join(self.shard_dir, name), {'kind': kind, 'index': index, 'items': buffer})
+        self._shards[kind].append({
+            'file': name,
+            'count': len(buffer),
+            'first_day': buffer[0]['run_day'],
+            'last_day': buffer[-1]['run_day']
+        })
+        self._counts[kind] += len(buffer)
+        self.files.append(name)
+        self._buffers[kind] = []
+    
+    def finish(self, months):
+        """写出最后一个不满的分片和清单"""
+        for kind in self._buffers:
+            self._flush(kind)
+        manifest = {
+            'shard_size': self.shard_size,
+            'news': {'count': self._counts['news'], 'shards': self._shards['news']},
+            'cases': {'count': self._counts['cases'], 'shards': self._shards['cases']},
+            'months': months
+        }
+        write_json_if_changed(os.path.join(self.shard_dir, 'manifest.json'), manifest)
+
+def write_json_if_changed(path, obj):
+    """紧凑写出 JSON，内容与现有文件相同时不写（保持文件时间戳和浏览器缓存）"""
+    payload = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return True
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='AI+项目管理信息面板 - 网页生成')
+    parser.add_argument('--force', action='store_true', help='忽略内容哈希，强制重新生成')
+    return parser.parse_args(argv)
+
+def render(data=None, force=False):
+    """
+    生成归档和首页
+    
+    Args:
+        data: 内存中的数据，为 None 时从 config.DATA_FILE（或快照）读取
+        force: 忽略内容哈希，强制重新生成
+    
+    Returns:
+        bool: 首页是否生成成功
+    """
     print("\n" + "=" * 60)
     print("🎨 生成网页...")
     print("=" * 60)
     
-    generator = DashboardGenerator()
-    success = generator.generate_html()
+    generator = DashboardGenerator(config.DATA_FILE, snapshot_file=config.DATA_SNAPSHOT, data=data)
+    
+    # 先生成归档，首页只放最新一天并链接到最近的月度归档
+    nav_html = ''
+    if config.ARCHIVE_ENABLED:
+        nav_html = generator.index_nav(generator.generate_archive(force=force))
+    
+    success = generator.generate_html(force=force, nav_html=nav_html)
+    
+    if config.ASSETS_PRECOMPRESS:
+        stats = assets.precompress_tree(config.OUTPUT_DIR)
+        brotli_note = '' if assets.brotli else '（未安装 brotli，跳过 .br）'
+        print(f"🗜️  预压缩: 写入 {stats['gz']} 个 .gz、{stats['br']} 个 .br{brotli_note}")
+    
+    # 把渲染阶段耗时追加到采集阶段写出的指标文件
+    generator.metrics.write(config.METRICS_FILE, config.METRICS_PROM_FILE, merge=True)
     
     if success:
         print("=" * 60)
@@ -441,5 +1006,10 @@ def main():
     
     return success
 
+def main(argv=None):
+    """主函数"""
+    args = parse_args(argv)
+    return render(force=args.force)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 历史数据存储
+每次运行的新闻和案例追加写入 SQLite，data.json 由它导出
+
+每次运行同时在历史库旁边的 .jsonl 文本导出里追加一行（history.db → history.jsonl）。
+导出文件提交到仓库，历史库本身不提交；历史库不存在时打开即从导出文件重建
+"""
+
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    run_day     TEXT NOT NULL,
+    update_time TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS news (
+    id       INTEGER PRIMARY KEY,
+    run_id   TEXT NOT NULL REFERENCES runs(run_id),
+    run_day  TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    date_key TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    payload  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS news_tags (
+    news_id INTEGER NOT NULL REFERENCES news(id),
+    tag     TEXT NOT NULL,
+    run_day TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cases (
+    id       INTEGER PRIMARY KEY,
+    run_id   TEXT NOT NULL REFERENCES runs(run_id),
+    run_day  TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    industry TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    payload  TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_day ON runs(run_day);
+CREATE INDEX IF NOT EXISTS idx_news_run ON news(run_id, position);
+CREATE INDEX IF NOT EXISTS idx_news_day ON news(run_day);
+CREATE INDEX IF NOT EXISTS idx_news_priority_day ON news(priority, run_day);
+CREATE INDEX IF NOT EXISTS idx_news_date ON news(date_key);
+CREATE INDEX IF NOT EXISTS idx_news_tags_tag ON news_tags(tag, run_day);
+CREATE INDEX IF NOT EXISTS idx_news_tags_news ON news_tags(news_id);
+CREATE INDEX IF NOT EXISTS idx_cases_run ON cases(run_id, position);
+CREATE INDEX IF NOT EXISTS idx_cases_day ON cases(run_day);
+CREATE INDEX IF NOT EXISTS idx_cases_industry ON cases(industry, run_day);
+
+-- 趋势汇总：每天以当天最后一次运行为准，按天和按周累计，随每次运行增量更新
+CREATE TABLE IF NOT EXISTS trend_days (
+    run_day TEXT PRIMARY KEY,
+    run_id  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS trend_priorities (
+    grain  TEXT NOT NULL,
+    period TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    count  INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trend_tags (
+    grain  TEXT NOT NULL,
+    period TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    count  INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trend_industries (
+    grain  TEXT NOT NULL,
+    period TEXT NOT NULL,
+    name   TEXT NOT NULL,
+    count  INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, name)
+) WITHOUT ROWID;
+"""
+
+# 汇总表结构版本（PRAGMA user_version），低于它的旧库打开时从原始历史重建汇总
+ROLLUP_VERSION = 1
+
+# 汇总表 -> 本次运行的计数查询 (名称, 条数)
+_ROLLUP_QUERIES = {
+    'trend_priorities': 'SELECT priority, COUNT(*) FROM news WHERE run_id = ? GROUP BY priority',
+    'trend_tags': 'SELECT news_tags.tag, COUNT(DISTINCT news.id) FROM news '
+                  'JOIN news_tags ON news_tags.news_id = news.id WHERE news.run_id = ? GROUP BY news_tags.tag',
+    'trend_industries': 'SELECT industry, COUNT(*) FROM cases WHERE run_id = ? GROUP BY industry',
+}
+
+_DATE_PATTERN = re.compile(r'(\d{4})\s*[年\-/.]\s*(\d{1,2})?\s*(?:[月\-/.]\s*(\d{1,2}))?')
+
+
+def normalize_date(text, default=None):
+    """
+    把大模型返回的自由格式日期规范成可排序的 YYYY-MM-DD
+
+    只有年月时取当月1日，只有年份时取1月1日。
+
+    Args:
+        text: 原始日期，如 "2026年2月"、"2026-02-15"
+        default: 无法识别时的返回值
+
+    Returns:
+        str: 规范化后的日期键
+    """
+    match = _DATE_PATTERN.search(text or '')
+    if not match:
+        return default
+    year, month, day = match.groups()
+    month = int(month) if month else 1
+    day = int(day) if day else 1
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return default
+    return f'{int(year):04d}-{month:02d}-{day:02d}'
+
+
+def trend_periods(run_day):
+    """
+    一个采集日所属的各粒度汇总周期
+
+    Returns:
+        dict: {'day': 'YYYY-MM-DD', 'week': 当周周一 'YYYY-MM-DD'}
+    """
+    day = datetime.strptime(run_day, '%Y-%m-%d')
+    return {
+        'day': run_day,
+        'week': (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d'),
+    }
+
+
+def export_path_for(db_path):
+    """历史库对应的文本导出路径（与数据库同名的 .jsonl），提交到仓库，缓存丢失时据此重建"""
+    return os.path.splitext(db_path)[0] + '.jsonl'
+
+
+def history_exists(db_path):
+    """历史库或它的文本导出是否存在（只有导出时，打开 HistoryStore 会从导出重建）"""
+    return os.path.exists(db_path) or os.path.exists(export_path_for(db_path))
+
+
+class HistoryStore:
+    """基于 SQLite 的只追加历史存储"""
+
+    def __init__(self, db_path, export=True):
+        """
+        打开（必要时创建）历史库
+
+        Args:
+            db_path: SQLite 文件路径，':memory:' 表示内存库
+            export: 是否维护文本导出（内存库没有导出）
+        """
+        self.db_path = db_path
+        self.export_path = None
+        if export and db_path != ':memory:':
+            self.export_path = export_path_for(db_path)
+        exported = self.export_path is not None and os.path.exists(self.export_path)
+        restore = exported and not os.path.exists(db_path)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] < ROLLUP_VERSION:
+            self.rebuild_rollups()
+        if restore:
+            self._restore_export()
+        elif self.export_path is not None and not exported:
+            self._write_export()
+
+    def _write_export(self):
+        """还没有文本导出的已有历史库：按运行顺序写出全部运行（之后每次运行追加一行）"""
+        run_ids = [row['run_id'] for row in self.conn.execute('SELECT run_id FROM runs ORDER BY run_id')]
+        with open(self.export_path, 'w', encoding='utf-8') as f:
+            for run_id in run_ids:
+                run = self.export_run(run_id)
+                run_time = datetime.strptime(run_id[:15], '%Y%m%dT%H%M%S')
+                f.write(self._export_line(run_id, run_time, run['news'], run['cases']))
+
+    @staticmethod
+    def _export_line(run_id, run_time, news, cases):
+        return json.dumps({'run_id': run_id, 'run_time': run_time.isoformat(), 'news': news, 'cases': cases},
+                          ensure_ascii=False) + '\n'
+
+    def _restore_export(self):
+        """从文本导出重建历史库（按原来的运行时间逐次追加，run_id 与原来一致）"""
+        export_path, self.export_path = self.export_path, None
+        runs = 0
+        try:
+            with open(export_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    run = json.loads(line)
+                    self.append_run(run['news'], run['cases'], datetime.fromisoformat(run['run_time']))
+                    runs += 1
+        finally:
+            self.export_path = export_path
+        print(f"🗄️  已从 {export_path} 重建历史库 {self.db_path}（{runs} 次运行）")
+
+    def close(self):
+        self.conn.close()
+
+    def append_run(self, news, cases, run_time=None):
+        """
+        追加一次运行的数据
+
+        Args:
+            news: 校验后的新闻列表
+            cases: 校验后的案例列表
+            run_time: 运行时间（datetime），默认当前时间
+
+        Returns:
+            str: 本次运行的 run_id
+        """
+        run_time = run_time or datetime.now()
+        run_day = run_time.strftime('%Y-%m-%d')
+
+        with self.conn:
+            run_id = self._new_run_id(run_time)
+            self.conn.execute(
+                'INSERT INTO runs (run_id, run_day, update_time) VALUES (?, ?, ?)',
+                (run_id, run_day, run_time.strftime('%Y年%m月%d日 %H:%M'))
+            )
+            for position, item in enumerate(news):
+                cursor = self.conn.execute(
+                    'INSERT INTO news (run_id, run_day, position, date_key, priority, title, payload) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (run_id, run_day, position,
+                     normalize_date(item.get('date'), default=run_day),
+                     item.get('priority', 'medium'), item.get('title', ''),
+                     json.dumps(item, ensure_ascii=False))
+                )
+                self.conn.executemany(
+                    'INSERT INTO news_tags (news_id, tag, run_day) VALUES (?, ?, ?)',
+                    [(cursor.lastrowid, tag, run_day) for tag in item.get('tags', [])]
+                )
+            self.conn.executemany(
+                'INSERT INTO cases (run_id, run_day, position, industry, title, payload) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, run_day, position, item.get('industry', ''), item.get('title', ''),
+                  json.dumps(item, ensure_ascii=False))
+                 for position, item in enumerate(cases)]
+            )
+            self._update_rollups(run_day, run_id)
+        if self.export_path is not None:
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                f.write(self._export_line(run_id, run_time, news, cases))
+        return run_id
+
+    def _new_run_id(self, run_time):
+        """
+        按秒的运行ID；同一秒内已有运行时加上 -02、-03 ... 后缀
+
+        后缀保持字符串顺序与运行先后一致（同一秒的后缀排在下一秒之前）
+        """
+        base = run_time.strftime('%Y%m%dT%H%M%S')
+        existing = {row['run_id'] for row in self.conn.execute(
+            'SELECT run_id FROM runs WHERE run_id >= ? AND run_id < ?', (base, base + '.'))}
+        if base not in existing:
+            return base
+        number = 2
+        while f'{base}-{number:02d}' in existing:
+            number += 1
+        return f'{base}-{number:02d}'
+
+    def _update_rollups(self, run_day, run_id):
+        """
+        当天的汇总改为以 run_id 为准：按新旧两次运行的差值更新天和周的汇总行（与追加在同一事务中）
+
+        只读写这一天涉及的行，代价与历史长度无关；run_id 比当天已汇总的运行旧时不变
+        """
+        row = self.conn.execute('SELECT run_id FROM trend_days WHERE run_day = ?', (run_day,)).fetchone()
+        previous = row['run_id'] if row else None
+        if previous is not None and previous >= run_id:
+            return
+        periods = trend_periods(run_day)
+        for table, query in _ROLLUP_QUERIES.items():
+            delta = {name: count for name, count in self.conn.execute(query, (run_id,))}
+            if previous is not None:
+                for name, count in self.conn.execute(query, (previous,)):
+                    delta[name] = delta.get(name, 0) - count
+            changes = [(grain, period, name, count) for grain, period in periods.items()
+                       for name, count in delta.items() if count]
+            self.conn.executemany(
+                f'INSERT INTO {table} (grain, period, name, count) VALUES (?, ?, ?, ?) '
+                f'ON CONFLICT (grain, period, name) DO UPDATE SET count = count + excluded.count',
+                changes
+            )
+            self.conn.executemany(
+                f'DELETE FROM {table} WHERE grain = ? AND period = ? AND name = ? AND count <= 0',
+                [change[:3] for change in changes]
+            )
+        self.conn.execute('INSERT OR REPLACE INTO trend_days (run_day, run_id) VALUES (?, ?)', (run_day, run_id))
+
+    def rebuild_rollups(self):
+        """从原始历史重建全部趋势汇总（旧库升级时执行一次）"""
+        with self.conn:
+            for table in ('trend_days', *_ROLLUP_QUERIES):
+                self.conn.execute(f'DELETE FROM {table}')
+            for run_day, run_id in self.daily_runs():
+                self._update_rollups(run_day, run_id)
+            self.conn.execute(f'PRAGMA user_version = {ROLLUP_VERSION}')
+
+    def trends(self, weeks=8, top=8, today=None):
+        """
+        从周汇总读取趋势（只读最近 weeks 周的汇总行，代价与历史长度无关）
+
+        Args:
+            weeks: 统计的周数（含本周）
+            top: 上升标签和行业各取前几名
+            today: 基准日期（datetime），默认今天
+
+        Returns:
+            dict: {
+                'weeks': [{'week', 'news', 'high', 'high_pct', 'cases'}, ...] 从旧到新,
+                'rising_tags': [{'tag', 'count', 'previous', 'change'}, ...] 本周比上周增加最多的标签,
+                'industries': [{'industry', 'cases', 'pct'}, ...] 这几周案例最多的行业,
+            }
+        """
+        today = today or datetime.now()
+        current = trend_periods(today.strftime('%Y-%m-%d'))['week']
+        week_keys = [(datetime.strptime(current, '%Y-%m-%d') - timedelta(weeks=n)).strftime('%Y-%m-%d')
+                     for n in reversed(range(weeks))]
+
+        def weekly(table, start):
+            rows = self.conn.execute(
+                f"SELECT period, name, count FROM {table} WHERE grain = 'week' AND period >= ?", (start,)
+            )
+            result = {}
+            for row in rows:
+                result.setdefault(row['period'], {})[row['name']] = row['count']
+            return result
+
+        priorities = weekly('trend_priorities', week_keys[0])
+        industries = weekly('trend_industries', week_keys[0])
+        tags = weekly('trend_tags', week_keys[-2] if weeks > 1 else week_keys[-1])
+
+        rows = []
+        for week in week_keys:
+            news = sum(priorities.get(week, {}).values())
+            high = priorities.get(week, {}).get('high', 0)
+            rows.append({
+                'week': week,
+                'news': news,
+                'high': high,
+                'high_pct': round(high * 100 / news) if news else 0,
+                'cases': sum(industries.get(week, {}).values()),
+            })
+
+        this_week = tags.get(week_keys[-1], {})
+        last_week = tags.get(week_keys[-2], {}) if weeks > 1 else {}
+        rising = sorted(
+            ({'tag': tag, 'count': count, 'previous': last_week.get(tag, 0), 'change': count - last_week.get(tag, 0)}
+             for tag, count in this_week.items() if count > last_week.get(tag, 0)),
+            key=lambda row: (-row['change'], -row['count'], row['tag'])
+        )[:top]
+
+        totals = {}
+        for counts in industries.values():
+            for industry, count in counts.items():
+                totals[industry] = totals.get(industry, 0) + count
+        total_cases = sum(totals.values())
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:top]
+        return {
+            'weeks': rows,
+            'rising_tags': rising,
+            'industries': [{'industry': industry, 'cases': count, 'pct': round(count * 100 / total_cases)}
+                           for industry, count in ranked],
+        }
+
+    def latest_run_id(self):
+        """最近一次运行的 run_id，没有记录时返回 None"""
+        row = self.conn.execute('SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 1').fetchone()
+        return row['run_id'] if row else None
+
+    def last_update_time(self):
+        """最近一次运行的更新时间（如 "2026年02月15日 10:30"），没有记录时返回 None"""
+        row = self.conn.execute('SELECT update_time FROM runs ORDER BY run_id DESC LIMIT 1').fetchone()
+        return row['update_time'] if row else None
+
+    def recent_titles(self, table, start_day, limit=None):
+        """
+        start_day 以来收录过的标题（去重，最近收录的在前）
+
+        Args:
+            table: 'news' 或 'cases'
+            start_day: 起始采集日期（含），YYYY-MM-DD
+        """
+        if table not in ('news', 'cases'):
+            raise ValueError(f"未知的表: {table}")
+        sql = f'SELECT title FROM {table} WHERE run_day >= ? GROUP BY title ORDER BY MAX(id) DESC'
+        params = [start_day]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [row['title'] for row in self.conn.execute(sql, params)]
+
+    def daily_runs(self):
+        """
+        每天最后一次运行（同一天重跑以最后一次为准）
+
+        Returns:
+            list: [(run_day, run_id), ...]，按日期升序
+        """
+        rows = self.conn.execute(
+            'SELECT run_day, MAX(run_id) AS run_id FROM runs GROUP BY run_day ORDER BY run_day'
+        )
+        return [(row['run_day'], row['run_id']) for row in rows]
+
+    def export_run(self, run_id=None):
+        """
+        导出某次运行的数据（data.json 的格式，不含 stats）
+
+        Args:
+            run_id: 运行ID，默认最近一次
+
+        Returns:
+            dict: {'run_id', 'update_time', 'news', 'cases'}，没有记录时返回 None
+        """
+        run_id = run_id or self.latest_run_id()
+        run = self.conn.execute('SELECT * FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        if run is None:
+            return None
+        return {
+            'run_id': run_id,
+            'update_time': run['update_time'],
+            'news': self._load_payloads('news', 'run_id = ? ORDER BY position', (run_id,)),
+            'cases': self._load_payloads('cases', 'run_id = ? ORDER BY position', (run_id,)),
+        }
+
+    def query_news(self, start_day=None, end_day=None, priority=None, tag=None, limit=None):
+        """
+        按采集日期范围、优先级、标签查询新闻（均走索引）
+
+        Args:
+            start_day: 起始日期（含），YYYY-MM-DD
+            end_day: 结束日期（含），YYYY-MM-DD
+            priority: 'high' / 'medium'
+            tag: 标签
+            limit: 最多返回条数
+
+        Returns:
+            list: 新闻列表，最新的在前
+        """
+        table = 'news'
+        clauses, params = [], []
+        if tag is not None:
+            table = 'news JOIN news_tags ON news_tags.news_id = news.id'
+            clauses.append('news_tags.tag = ?')
+            params.append(tag)
+        if priority is not None:
+            clauses.append('news.priority = ?')
+            params.append(priority)
+        if start_day is not None:
+            clauses.append('news.run_day >= ?')
+            params.append(start_day)
+        if end_day is not None:
+            clauses.append('news.run_day <= ?')
+            params.append(end_day)
+
+        sql = f'SELECT news.payload FROM {table}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY news.run_day DESC, news.id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [json.loads(row['payload']) for row in self.conn.execute(sql, params)]
+
+    def recent_news(self, days=30, priority=None, today=None):
+        """最近 days 天采集的新闻，例如 recent_news(30, 'high')"""
+        today = today or datetime.now()
+        start_day = (today - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return self.query_news(start_day=start_day, priority=priority)
+
+    def query_cases(self, start_day=None, end_day=None, industry=None, limit=None):
+        """按采集日期范围和行业查询案例"""
+        clauses, params = [], []
+        if industry is not None:
+            clauses.append('industry = ?')
+            params.append(industry)
+        if start_day is not None:
+            clauses.append('run_day >= ?')
+            params.append(start_day)
+        if end_day is not None:
+            clauses.append('run_day <= ?')
+            params.append(end_day)
+
+        where = ' AND '.join(clauses) if clauses else '1'
+        where += ' ORDER BY run_day DESC, id'
+        if limit is not None:
+            where += ' LIMIT ?'
+            params.append(limit)
+        return self._load_payloads('cases', where, params)
+
+    def _load_payloads(self, table, where, params):
+        rows = self.conn.execute(f'SELECT payload FROM {table} WHERE {where}', params)
+        return [json.loads(row['payload']) for row in rows]
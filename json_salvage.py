@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 容错 JSON 解析
+大模型返回的 JSON 常见问题：代码块和前后的说明文字、尾随逗号、缺少逗号、弯引号和单引号、
+没有引号的键或值、Python 写法的 True/None、注释、字符串中未转义的引号和换行、输出被截断。
+
+先按标准 JSON 解析；失败时用一遍扫描的容错解析器恢复所有完好的条目：能修复的缺陷就地修复，
+无法修复的条目跳到同一层的下一个逗号继续（不回溯，耗时与文本长度成正比），
+被截断的最后一个条目丢弃，之前已经完整的条目保留
+"""
+
+import json
+import re
+from collections import Counter
+
+# 字符串的起始引号 → 可以结束它的引号
+_QUOTES = {'"': '"', "'": "'", '“': '”"', '‘': '’\''}
+# 字符串内需要停下来处理的字符：反斜杠和可能的结束引号
+_STRING_STOPS = {opener: re.compile('[\\\\' + re.escape(closers) + ']') for opener, closers in _QUOTES.items()}
+_CONTROL = re.compile(r'[\x00-\x1f]')
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_PYTHON_LITERALS = {'True': True, 'False': False, 'None': None}
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '/': '/', '\\': '\\', '"': '"', "'": "'"}
+# 值结束的位置（没有引号的值读到这些字符为止）
+_VALUE_END = re.compile(r'[,\]}\n]')
+_KEY_END = re.compile(r'[:,{}\[\]\s]')
+_WHITESPACE = ' \t\r\n'
+# 优先选择后面紧跟对象或右括号的 "["，避免把说明文字里的 [1] 当成数组
+_ARRAY_START = re.compile(r'\[\s*[{\]]')
+# 换行后紧跟没有引号的键（上一行末尾缺少逗号）
+_BARE_KEY = re.compile(r'[A-Za-z_][\w-]*\s*:')
+_DECODER = json.JSONDecoder()
+_HEX4 = re.compile(r'[0-9A-Fa-f]{4}')
+_LOW_SURROGATE = re.compile(r'\\u[dD][c-fC-F][0-9A-Fa-f]{2}')
+
+# 修复类型的中文名（用于输出）
+REPAIR_LABELS = {
+    'code_fence': '代码块标记',
+    'trailing_comma': '尾随逗号',
+    'extra_comma': '多余逗号',
+    'missing_comma': '缺少逗号',
+    'missing_colon': '缺少冒号',
+    'missing_bracket': '缺少右括号',
+    'smart_quote': '弯引号',
+    'single_quote': '单引号',
+    'inner_quote': '未转义的引号',
+    'control_char': '字符串中的换行',
+    'bad_escape': '无效的转义',
+    'lone_surrogate': '不成对的代理项',
+    'unquoted_key': '键缺少引号',
+    'bare_value': '值缺少引号',
+    'python_literal': 'Python 字面量',
+    'comment': '注释',
+    'missing_array': '缺少外层数组',
+}
+
+_MISSING = object()
+
+
+class SalvageStats:
+    """一次解析的恢复统计"""
+
+    def __init__(self):
+        self.strict = True  # 标准 JSON 直接解析成功
+        self.repairs = Counter()  # {修复类型: 次数}
+        self.dropped = 0  # 无法修复而跳过的条目或字段数
+        self.truncated = False  # 输出被截断（丢弃了最后一个不完整的条目）
+
+    @property
+    def total_repairs(self):
+        return sum(self.repairs.values())
+
+    @property
+    def salvaged(self):
+        """是否经过了容错解析（标准 JSON 解析失败）"""
+        return not self.strict
+
+    def summary(self):
+        """如 "尾随逗号×2，弯引号×1；跳过 1 个损坏的条目"，标准 JSON 时为空串"""
+        parts = '，'.join(f'{REPAIR_LABELS.get(kind, kind)}×{count}' for kind, count in self.repairs.most_common())
+        notes = [parts] if parts else []
+        if self.dropped:
+            notes.append(f'跳过 {self.dropped} 个损坏的条目')
+        if self.truncated:
+            notes.append('输出被截断')
+        return '；'.join(notes)
+
+
+class _Truncated(Exception):
+    """文本在值的中途结束，partial 为已经解析出的部分"""
+
+    def __init__(self, partial):
+        super().__init__()
+        self.partial = partial
+
+
+class _Invalid(Exception):
+    """无法修复的值"""
+
+
+class SalvageParser:
+    """
+    一遍扫描的容错解析器
+
+    对象和数组逐个成员解析：成员无法修复时记入 stats.dropped 并跳到同一层的下一个逗号；
+    文本在某个成员中途结束时，数组丢弃该成员，对象保留已完整的成员和其中数组的已完整元素。
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, text, stats=None):
+        self.text = text
+        self.n = len(text)
+        self.i = 0
+        self.stats = stats if stats is not None else SalvageStats()
+
+    def parse(self, start=0):
+        """从 start 处解析一个值，文本被截断时返回已恢复的部分，无法恢复时返回 None"""
+        self.i = start
+        try:
+            return self._value(0)
+        except _Truncated as e:
+            self.stats.truncated = True
+            return None if e.partial is _MISSING else e.partial
+        except _Invalid:
+            self.stats.dropped += 1
+            return None
+
+    def parse_objects(self, start=0):
+        """没有外层数组时，依次解析文本中的顶层对象"""
+        items = []
+        self.i = start
+        while True:
+            position = self.text.find('{', self.i)
+            if position < 0:
+                return items
+            self.i = position
+            try:
+                items.append(self._value(0))
+            except _Truncated as e:
+                self.stats.truncated = True
+                if e.partial is not _MISSING:
+                    self.stats.dropped += 1
+                return items
+            except _Invalid:
+                self.stats.dropped += 1
+                self.i = max(self.i, position + 1)
+
+    def _skip_whitespace(self):
+        text, n = self.text, self.n
+        while self.i < n:
+            ch = text[self.i]
+            if ch in _WHITESPACE:
+                self.i += 1
+            elif ch == '/' and text.startswith('//', self.i):
+                end = text.find('\n', self.i)
+                self.i = n if end < 0 else end + 1
+                self.stats.repairs['comment'] += 1
+            elif ch == '/' and text.startswith('/*', self.i):
+                end = text.find('*/', self.i + 2)
+                self.i = n if end < 0 else end + 2
+                self.stats.repairs['comment'] += 1
+            elif ch == '`' and text.startswith('```', self.i):
+                # 数组中间又出现的代码块标记（模型把多段输出拼在一起）
+                end = text.find('\n', self.i)
+                self.i = n if end < 0 else end + 1
+                self.stats.repairs['code_fence'] += 1
+            else:
+                return
+
+    def _value(self, depth):
+        self._skip_whitespace()
+        if self.i >= self.n:
+            raise _Truncated(_MISSING)
+        ch = self.text[self.i]
+        if ch == '{':
+            return self._object(depth + 1)
+        if ch == '[':
+            return self._array(depth + 1)
+        if ch in _QUOTES:
+            return self._string()
+        return self._bare()
+
+    def _array(self, depth):
+        if depth > self.MAX_DEPTH:
+            raise _Invalid()
+        self.i += 1
+        items, last = [], 'open'
+        while True:
+            self._skip_whitespace()
+            if self.i >= self.n:
+                raise _Truncated(items)
+            ch = self.text[self.i]
+            if ch == ']':
+                if last == 'comma':
+                    self.stats.repairs['trailing_comma'] += 1
+                self.i += 1
+                return items
+            if ch == '}':
+                # 数组没有闭合就结束了外层对象：留给外层处理
+                self.stats.repairs['missing_bracket'] += 1
+                return items
+            if ch == ',':
+                if last != 'value':
+                    self.stats.repairs['extra_comma'] += 1
+                self.i += 1
+                last = 'comma'
+                continue
+            if last == 'value':
+                self.stats.repairs['missing_comma'] += 1
+            try:
+                items.append(self._value(depth))
+            except _Truncated as e:
+                if e.partial is not _MISSING:
+                    self.stats.dropped += 1
+                raise _Truncated(items)
+            except _Invalid:
+                self.stats.dropped += 1
+                self._resync(']')
+                if self.i >= self.n:
+                    raise _Truncated(items)
+            last = 'value'
+
+    def _object(self, depth):
+        if depth > self.MAX_DEPTH:
+            raise _Invalid()
+        self.i += 1
+        obj, last = {}, 'open'
+        while True:
+            self._skip_whitespace()
+            if self.i >= self.n:
+                raise _Truncated(obj)
+            ch = self.text[self.i]
+            if ch == '}':
+                if last == 'comma':
+                    self.stats.repairs['trailing_comma'] += 1
+                self.i += 1
+                return obj
+            if ch == ']':
+                self.stats.repairs['missing_bracket'] += 1
+                return obj
+            if ch == ',':
+                if last != 'value':
+                    self.stats.repairs['extra_comma'] += 1
+                self.i += 1
+                last = 'comma'
+                continue
+            if last == 'value':
+                self.stats.repairs['missing_comma'] += 1
+            key = _MISSING
+            try:
+                key = self._key()
+                self._skip_whitespace()
+                if self.i >= self.n:
+                    raise _Truncated(_MISSING)
+                if self.text[self.i] in ':=':
+                    self.i += 1
+                else:
+                    self.stats.repairs['missing_colon'] += 1
+                obj[key] = self._value(depth)
+            except _Truncated as e:
+                # 截断时只保留数组中已经完整的元素，被截断的字符串、数字不可信
+                if key is not _MISSING and isinstance(e.partial, list):
+                    obj[key] = e.partial
+                raise _Truncated(obj)
+            except _Invalid:
+                self.stats.dropped += 1
+                self._resync('}')
+                if self.i >= self.n:
+                    raise _Truncated(obj)
+            last = 'value'
+
+    def _key(self):
+        if self.text[self.i] in _QUOTES:
+            return self._string()
+        match = _KEY_END.search(self.text, self.i)
+        end = match.start() if match else self.n
+        if end >= self.n:
+            raise _Truncated(_MISSING)
+        key = self.text[self.i:end]
+        if not key:
+            raise _Invalid()
+        self.stats.repairs['unquoted_key'] += 1
+        self.i = end
+        return key
+
+    def _string(self):
+        text, n = self.text, self.n
+        opener = text[self.i]
+        if opener != '"':
+            self.stats.repairs['single_quote' if opener == "'" else 'smart_quote'] += 1
+        stops = _STRING_STOPS[opener]
+        parts = []
+        start = self.i + 1
+        position = start
+        while True:
+            match = stops.search(text, position)
+            if match is None:
+                raise _Truncated(_MISSING)
+            j = match.start()
+            if text[j] == '\\':
+                if j + 1 >= n:
+                    raise _Truncated(_MISSING)
+                parts.append(text[start:j])
+                escaped = text[j + 1]
+                if escaped == 'u':
+                    if j + 6 > n:
+                        raise _Truncated(_MISSING)
+                    if _HEX4.match(text, j + 2):
+                        start = position = j + 6
+                        code = int(text[j + 2:j + 6], 16)
+                        if 0xD800 <= code < 0xDC00 and _LOW_SURROGATE.match(text, j + 6):
+                            # 代理对（如表情符号）合并成一个码位
+                            code = 0x10000 + ((code - 0xD800) << 10) + (int(text[j + 8:j + 12], 16) - 0xDC00)
+                            start = position = j + 12
+                        elif 0xD800 <= code < 0xE000:
+                            # 不成对的代理项无法编码为 UTF-8，写入缓存和历史库时会出错
+                            self.stats.repairs['lone_surrogate'] += 1
+                            code = 0xFFFD
+                        parts.append(chr(code))
+                        continue
+                if escaped in _ESCAPES:
+                    parts.append(_ESCAPES[escaped])
+                else:
+                    self.stats.repairs['bad_escape'] += 1
+                    parts.append(escaped)
+                start = position = j + 2
+                continue
+            if self._closes(j + 1):
+                parts.append(text[start:j])
+                self.i = j + 1
+                value = ''.join(parts)
+                if _CONTROL.search(value):
+                    self.stats.repairs['control_char'] += 1
+                return value
+            # 后面不是分隔符：这是内容里没有转义的引号
+            self.stats.repairs['inner_quote'] += 1
+            position = j + 1
+
+    def _closes(self, k):
+        """引号后面（跳过空白）是分隔符、注释、文本末尾，或换行后紧跟下一个键时，这个引号结束字符串"""
+        text, n = self.text, self.n
+        newline = False
+        while k < n and text[k] in _WHITESPACE:
+            newline = newline or text[k] == '\n'
+            k += 1
+        if k >= n or text[k] in ',:]}' or text.startswith(('//', '/*'), k):
+            return True
+        return newline and (text[k] in _QUOTES or _BARE_KEY.match(text, k) is not None)
+
+    def _bare(self):
+        match = _VALUE_END.search(self.text, self.i)
+        end = match.start() if match else self.n
+        token = self.text[self.i:end].strip()
+        if end >= self.n:
+            # 没有结束符的数字、字面量可能不完整
+            raise _Truncated(_MISSING)
+        if not token:
+            raise _Invalid()
+        self.i = end
+        if token in _LITERALS:
+            return _LITERALS[token]
+        if token in _PYTHON_LITERALS:
+            self.stats.repairs['python_literal'] += 1
+            return _PYTHON_LITERALS[token]
+        if _NUMBER.match(token):
+            return json.loads(token)
+        self.stats.repairs['bare_value'] += 1
+        return token
+
+    def _resync(self, closer):
+        """跳过无法修复的成员：停在同一层的下一个逗号或本层的右括号处（不消耗）"""
+        text, n = self.text, self.n
+        depth, in_string, escape = 0, False, False
+        while self.i < n:
+            ch = text[self.i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in '[{':
+                depth += 1
+            elif ch in ']}':
+                if depth == 0 and ch == closer:
+                    return
+                depth = max(depth - 1, 0)
+            elif ch == ',' and depth == 0:
+                return
+            self.i += 1
+
+
+def _body_start(text):
+    """跳过 markdown 代码块的起始行，返回正文开始的位置"""
+    fence = text.find('```')
+    if fence < 0:
+        return 0
+    newline = text.find('\n', fence)
+    return len(text) if newline < 0 else newline + 1
+
+
+def _value_start(text, start, expect):
+    """数据开始的位置；期望数组但文本以对象开头（没有外层数组）时返回 -1"""
+    if expect is not list:
+        return text.find('{', start)
+    match = _ARRAY_START.search(text, start)
+    if match:
+        return match.start()
+    bracket = text.find('[', start)
+    brace = text.find('{', start)
+    if brace >= 0 and (bracket < 0 or brace < bracket):
+        return -1
+    return bracket
+
+
+def salvage_json(text, expect=list, stats=None):
+    """
+    从大模型的响应中解析 JSON 数组（或对象）
+
+    Args:
+        text: 响应文本
+        expect: list 或 dict
+        stats: 可选的 SalvageStats，用于累计多次解析的统计
+
+    Returns:
+        tuple: (value, stats)，value 为 expect 类型，什么都没有恢复出来时为空列表 / 空字典
+    """
+    stats = stats if stats is not None else SalvageStats()
+    text = text or ''
+    start = _body_start(text)
+    position = _value_start(text, start, expect)
+    if position < 0 and start:
+        # 说明文字里恰好有 ``` 而数据在前面
+        start = 0
+        position = _value_start(text, start, expect)
+
+    if position >= 0:
+        try:
+            value, _ = _DECODER.raw_decode(text, position)
+        except ValueError:
+            value = None
+        if isinstance(value, expect):
+            return value, stats
+
+    stats.strict = False
+    parser = SalvageParser(text, stats)
+    if position >= 0:
+        value = parser.parse(position)
+        if isinstance(value, expect):
+            return value, stats
+    if expect is list:
+        # 没有外层数组，或者数组本身无法解析：逐个恢复顶层对象
+        objects = parser.parse_objects(start)
+        if objects:
+            stats.repairs['missing_array'] += 1
+        return [obj for obj in objects if obj is not None], stats
+    return {}, stats
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 增量 JSON 解析
+流式响应每到一个完整的 {...} 对象就立即解析输出，标准 JSON 解析失败的对象交给容错解析
+"""
+
+import json
+from json_salvage import SalvageStats, salvage_json
+
+
+class JSONObjectStreamParser:
+    """
+    增量解析器：从任意切分的文本块中提取顶层 JSON 对象
+
+    不关心外层的 [ ]、markdown 代码块或前后的说明文字，只跟踪花括号深度
+    和字符串状态；响应被截断时，已经闭合的对象不会丢失。
+    """
+
+    def __init__(self):
+        self._buffer = []  # 当前未闭合对象的文本片段
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.skipped = 0  # 闭合了但容错解析也无法恢复的对象数
+        self.salvage = SalvageStats()  # 容错解析的累计统计
+
+    def feed(self, text):
+        """
+        输入一段文本
+
+        Args:
+            text: 新到达的文本块
+
+        Returns:
+            list: 本次文本中闭合的对象（dict）
+        """
+        objects = []
+        start = 0 if self._depth else None
+        for i, ch in enumerate(text):
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start:i + 1])
+                    obj = self._decode(''.join(self._buffer))
+                    if obj is not None:
+                        objects.append(obj)
+                    self._buffer = []
+                    start = None
+
+        if self._depth and start is not None:
+            self._buffer.append(text[start:])
+        return objects
+
+    @property
+    def pending(self):
+        """是否有尚未闭合的对象（流结束时为 True 说明响应被截断）"""
+        return self._depth > 0
+
+    def _decode(self, raw):
+        try:
+            obj = json.loads(raw)
+        except json.JSONDecodeError:
+            obj, _ = salvage_json(raw, dict, self.salvage)
+            if not obj:
+                self.skipped += 1
+                return None
+        return obj if isinstance(obj, dict) else None
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 关键词调度
+按每个搜索关键词在历次运行中的表现（耗时、token、解析成功率、去重后保留的条数）
+分配每次运行的查询名额和每个查询要求的条数，使单位时间和单位 token 得到的不重复条目最多；
+持续表现差的关键词轮换出去，若干次运行后再回来重新试用
+"""
+
+import json
+import math
+import os
+import tempfile
+from datetime import datetime
+
+# 每个关键词的统计项（均为指数加权平均，n 为记录的调用次数）
+_EWMA_FIELDS = ('wall_s', 'tokens', 'parse_ok', 'unique', 'rate')
+
+
+class KeywordScheduler:
+    """可持久化的关键词产出统计和查询分配"""
+
+    def __init__(self, path=None, alpha=0.3, exploration=0.3, rotate_ratio=0.5, rotate_after=3, bench_runs=7):
+        """
+        Args:
+            path: 统计文件路径（None 表示不持久化）
+            alpha: 指数加权平均中新一次调用的权重
+            exploration: 试用次数少的关键词的加分系数（UCB）
+            rotate_ratio: 得分低于最佳关键词的该比例视为表现差
+            rotate_after: 连续几次运行表现差后轮换出去
+            bench_runs: 轮换出去的关键词暂停的运行次数
+        """
+        self.path = path
+        self.alpha = alpha
+        self.exploration = exploration
+        self.rotate_ratio = rotate_ratio
+        self.rotate_after = rotate_after
+        self.bench_runs = bench_runs
+        self.stats = {}  # {content_type: {keyword: 统计}}
+        self.plans = {}  # {content_type: {'day', 'run', 'pool', 'tasks'}}
+        self._recorded = {}  # 本次运行记录过的 {content_type: set(keyword)}
+
+    @classmethod
+    def load(cls, path, **options):
+        """加载统计文件；文件不存在或损坏时从空统计开始"""
+        scheduler = cls(path, **options)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return scheduler
+        scheduler.stats = payload.get('stats', {})
+        scheduler.plans = payload.get('plans', {})
+        return scheduler
+
+    def save(self):
+        """对本次记录过的关键词做轮换判断，然后原子写入统计文件"""
+        for content_type, keywords in self._recorded.items():
+            self._rotate(content_type, keywords)
+        self._recorded = {}
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'stats': self.stats, 'plans': self.plans}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _entry(self, content_type, keyword):
+        return self.stats.setdefault(content_type, {}).setdefault(keyword, {
+            'n': 0, 'wall_s': None, 'tokens': None, 'parse_ok': None, 'unique': None, 'rate': None,
+            'low_streak': 0, 'benched_until': 0,
+        })
+
+    def record(self, content_type, keyword, requested, call, kept):
+        """
+        记录一次调用的结果（缓存命中的调用不计入）
+
+        Args:
+            requested: 要求的条数
+            call: MetricsRecorder 的调用记录（wall_s、token、items_valid、error）
+            kept: 去重后最终保留的条数
+        """
+        if call is None or call.get('cached'):
+            return
+        entry = self._entry(content_type, keyword)
+        tokens = None
+        if call.get('prompt_tokens') is not None or call.get('completion_tokens') is not None:
+            tokens = (call.get('prompt_tokens') or 0) + (call.get('completion_tokens') or 0)
+        sample = {
+            'wall_s': call.get('wall_s'),
+            'tokens': tokens,
+            'parse_ok': 0.0 if call.get('error') or not call.get('items_valid') else 1.0,
+            'unique': float(kept),
+            'rate': kept / requested if requested else 0.0,
+        }
+        for field in _EWMA_FIELDS:
+            value = sample[field]
+            if value is None:
+                continue
+            previous = entry[field]
+            entry[field] = value if previous is None else previous + self.alpha * (value - previous)
+            entry[field] = round(entry[field], 4)
+        entry['n'] += 1
+        self._recorded.setdefault(content_type, set()).add(keyword)
+
+    def score(self, content_type, keyword):
+        """
+        产出效率：平均保留条数 /（耗时和 token 相对同类关键词均值的平均），没有记录时为 None
+
+        1.0 表示用同类关键词的平均代价拿到 1 条不重复的条目
+        """
+        entries = self.stats.get(content_type, {})
+        entry = entries.get(keyword)
+        if not entry or not entry['n']:
+            return None
+        costs = []
+        for field in ('wall_s', 'tokens'):
+            values = [e[field] for e in entries.values() if e['n'] and e[field]]
+            if entry[field] and values:
+                costs.append(entry[field] / (sum(values) / len(values)))
+        cost = sum(costs) / len(costs) if costs else 1.0
+        return entry['unique'] / cost if cost > 0 else entry['unique']
+
+    def plan(self, content_type, pool, budget, count, min_count=1, max_count=None, day=None):
+        """
+        为一种内容分配本次运行的查询
+
+        同一天内候选和参数不变时返回同一份分配（同一天重跑与流水线缓存的搜索结果对应）
+
+        Args:
+            pool: 候选关键词（按优先顺序，从未用过的关键词按此顺序先试用）
+            budget: 查询数
+            count: 平均每个查询要求的条数，总条数 = budget × count
+            min_count / max_count: 单个查询要求的条数上下限
+            day: 日期（默认今天）
+
+        Returns:
+            list: [(keyword, content_type, count), ...]
+        """
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        signature = [list(pool), budget, count, min_count, max_count]
+        previous = self.plans.get(content_type)
+        if previous and previous['day'] == day and previous['pool'] == signature:
+            return [tuple(task) for task in previous['tasks']]
+
+        run = (previous['run'] + 1) if previous else 1
+        chosen = self._choose(content_type, pool, budget, run)
+        counts = self._allocate(content_type, chosen, budget * count, min_count, max_count or budget * count)
+        tasks = [(keyword, content_type, n) for keyword, n in zip(chosen, counts)]
+        self.plans[content_type] = {'day': day, 'run': run, 'pool': signature, 'tasks': tasks}
+        return tasks
+
+    def _choose(self, content_type, pool, budget, run):
+        """未试用过的先试；其余按得分加上试用次数少的加分（UCB）排序；暂停中的关键词排在最后"""
+        entries = self.stats.get(content_type, {})
+        scores = {keyword: self.score(content_type, keyword) for keyword in pool}
+        best = max((s for s in scores.values() if s), default=1.0) or 1.0
+        total = sum(entries[k]['n'] for k in pool if k in entries) + 1
+
+        def priority(item):
+            index, keyword = item
+            entry = entries.get(keyword)
+            benched = bool(entry and entry['benched_until'] >= run)
+            if scores[keyword] is None:
+                return (benched, 0, index)
+            bonus = self.exploration * math.sqrt(math.log(total) / entry['n'])
+            return (benched, 1, -(scores[keyword] / best + bonus))
+
+        ranked = sorted(enumerate(dict.fromkeys(pool)), key=priority)
+        return [keyword for _, keyword in ranked[:budget]]
+
+    def _allocate(self, content_type, keywords, total, min_count, max_count):
+        """按每条要求的保留率分配条数（没有记录的关键词按平均保留率），总数不变"""
+        if not keywords:
+            return []
+        entries = self.stats.get(content_type, {})
+        rates = [entries[k]['rate'] if k in entries and entries[k]['rate'] is not None else None
+                 for k in keywords]
+        known = [rate for rate in rates if rate is not None]
+        default = sum(known) / len(known) if known else 1.0
+        weights = [max(rate if rate is not None else default, 0.05) for rate in rates]
+        counts = [min(max(round(total * w / sum(weights)), min_count), max_count) for w in weights]
+        # 取整和上下限造成的差额：从保留率高的开始补，从保留率低的开始减
+        order = sorted(range(len(keywords)), key=lambda i: -weights[i])
+        while sum(counts) != total:
+            step = 1 if sum(counts) < total else -1
+            candidates = [i for i in (order if step > 0 else reversed(order))
+                          if min_count <= counts[i] + step <= max_count]
+            if not candidates:
+                break
+            counts[candidates[0]] += step
+        return counts
+
+    def _rotate(self, content_type, keywords):
+        """连续 rotate_after 次运行得分低于最佳的 rotate_ratio 的关键词暂停 bench_runs 次运行"""
+        entries = self.stats.get(content_type, {})
+        scores = {keyword: self.score(content_type, keyword) for keyword in entries}
+        best = max((s for s in scores.values() if s), default=0)
+        run = self.plans.get(content_type, {}).get('run', 0)
+        for keyword in keywords:
+            entry = entries[keyword]
+            if best and (scores[keyword] or 0) < self.rotate_ratio * best:
+                entry['low_streak'] += 1
+            else:
+                entry['low_streak'] = 0
+            if entry['low_streak'] >= self.rotate_after:
+                entry['low_streak'] = 0
+                entry['benched_until'] = run + self.bench_runs
+                print(f"🔄 关键词 \"{keyword}\" 连续 {self.rotate_after} 次产出偏低，暂停 {self.bench_runs} 次运行")
+
+    def report(self, content_type):
+        """各关键词的统计和得分（按得分从高到低）"""
+        rows = []
+        for keyword, entry in self.stats.get(content_type, {}).items():
+            score = self.score(content_type, keyword)
+            rows.append(dict(entry, keyword=keyword, score=round(score, 3) if score is not None else None))
+        return sorted(rows, key=lambda row: -(row['score'] or 0))
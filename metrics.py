@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 运行指标
+记录每次大模型调用的耗时、首字延迟、token 用量和条目数，以及各阶段耗时；
+运行结束后写出 metrics.json 和 Prometheus textfile 格式的 metrics.prom
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 每次调用导出到 Prometheus 的数值字段: (字段, 指标名, 说明)
+CALL_GAUGES = [
+    ('wall_s', 'dashboard_llm_call_seconds', '单次调用的总耗时'),
+    ('ttft_s', 'dashboard_llm_ttft_seconds', '单次调用的首字延迟'),
+    ('prompt_tokens', 'dashboard_llm_prompt_tokens', '提示词 token 数'),
+    ('completion_tokens', 'dashboard_llm_completion_tokens', '生成 token 数'),
+    ('items_parsed', 'dashboard_llm_items_parsed', '解析出的条目数'),
+    ('items_valid', 'dashboard_llm_items_valid', '通过校验的条目数'),
+    ('items_kept', 'dashboard_llm_items_kept', '去重后保留的条目数'),
+    ('items_novel', 'dashboard_llm_items_novel', '不在近期历史中的新条目数'),
+    ('json_repairs', 'dashboard_llm_json_repairs', '容错解析修复的 JSON 缺陷数'),
+    ('items_dropped', 'dashboard_llm_items_dropped', '无法修复而跳过的条目数'),
+    ('retries', 'dashboard_llm_call_retries', '重试次数'),
+]
+
+# 单次实际请求（重试/对冲中胜出的那次）需要并入调用记录的字段
+ATTEMPT_FIELDS = ['ttft_s', 'prompt_tokens', 'completion_tokens', 'items_parsed', 'items_valid', 'json_repairs',
+                  'items_dropped', 'streamed']
+
+
+def timed_stage(name):
+    """方法装饰器：把方法耗时记为阶段 name（要求实例有 metrics 属性）"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsRecorder:
+    """线程安全的指标记录器"""
+
+    def __init__(self, prices=None):
+        """
+        Args:
+            prices: {model: (每千输入 token 价格, 每千输出 token 价格)}，用于成本报告
+        """
+        self.prices = prices or {}
+        self.calls = []
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def start_call(self, query, content_type, model=None, stage='search'):
+        """
+        开始记录一次调用
+
+        Args:
+            model: 调用的模型（用于计算成本）
+            stage: 成本报告里的阶段名
+
+        Returns:
+            dict: 调用记录，调用方逐步填写，结束时交给 finish_call
+        """
+        return {
+            'query': query,
+            'type': content_type,
+            'model': model,
+            'stage': stage,
+            'started': time.perf_counter(),
+            'wall_s': None,
+            'ttft_s': None,
+            'prompt_tokens': None,
+            'completion_tokens': None,
+            'items_parsed': 0,
+            'items_valid': 0,
+            'items_kept': None,
+            'items_novel': None,
+            'json_repairs': 0,
+            'items_dropped': 0,
+            'cached': False,
+            'streamed': False,
+            'retries': 0,
+            'hedged': False,
+            'batch': None,  # 批量请求中拆出的单个查询：所属批次的标签
+            'hedge_won': False,
+            'error': None,
+        }
+
+    def mark_first_token(self, call):
+        """记录首字延迟（只记第一次）"""
+        if call['ttft_s'] is None:
+            call['ttft_s'] = round(time.perf_counter() - call['started'], 4)
+
+    def record_usage(self, call, usage):
+        """记录接口返回的 usage（可能为 None）"""
+        if usage is None:
+            return
+        call['prompt_tokens'] = getattr(usage, 'prompt_tokens', None)
+        call['completion_tokens'] = getattr(usage, 'completion_tokens', None)
+
+    def adopt_attempt(self, call, attempt):
+        """把胜出的那次实际请求的记录并入调用记录"""
+        for field in ATTEMPT_FIELDS:
+            call[field] = attempt[field]
+
+    def finish_call(self, call, error=None):
+        """结束记录"""
+        call['wall_s'] = round(time.perf_counter() - call['started'], 4)
+        if call['ttft_s'] is None and not call['streamed']:
+            call['ttft_s'] = call['wall_s']
+        if error is not None:
+            call['error'] = f'{type(error).__name__}: {error}'
+        with self._lock:
+            self.calls.append(call)
+
+    def set_kept(self, query, content_type, kept, novel=None):
+        """
+        去重完成后回填某个查询最终保留的条目数（以及返回的条目中不在近期历史中的条目数）
+
+        只写入该查询最近一次的调用记录，同一查询有多条记录时汇总不会重复计数
+        """
+        with self._lock:
+            for call in reversed(self.calls):
+                if call['query'] == query and call['type'] == content_type:
+                    call['items_kept'] = kept
+                    if novel is not None:
+                        call['items_novel'] = novel
+                    return
+
+    def last_call(self, query, content_type):
+        """某个查询最近一次的调用记录，没有时返回 None"""
+        with self._lock:
+            for call in reversed(self.calls):
+                if call['query'] == query and call['type'] == content_type:
+                    return call
+        return None
+
+    @contextmanager
+    def stage(self, name):
+        """记录一个阶段的耗时（同名阶段累加）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = round(self.stages.get(name, 0) + elapsed, 4)
+
+    def select(self, predicate):
+        """
+        按调用筛选出一个新的记录器（例如多主题时每个主题各自的调用），不含阶段耗时
+
+        Args:
+            predicate: 接收一条调用记录，返回是否保留
+        """
+        selected = MetricsRecorder(self.prices)
+        with self._lock:
+            selected.calls = [call for call in self.calls if predicate(call)]
+        return selected
+
+    def snapshot(self):
+        """导出为可 JSON 序列化的字典"""
+        with self._lock:
+            calls = [{k: v for k, v in call.items() if k != 'started'} for call in self.calls]
+            stages = dict(self.stages)
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'timestamp': time.time(),
+            'totals': _totals(calls),
+            'cost': cost_report(calls, self.prices),
+            'stages': stages,
+            'calls': calls,
+        }
+
+    def write(self, json_path, prom_path, merge=False):
+        """
+        写出 metrics.json 和 Prometheus textfile
+
+        Args:
+            merge: 合并已有的 metrics.json（例如渲染进程追加 generate_html 阶段）
+        """
+        snapshot = self.snapshot()
+        if merge:
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    previous = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                previous = None
+            if previous:
+                snapshot['calls'] = previous.get('calls', []) + snapshot['calls']
+                snapshot['totals'] = _totals(snapshot['calls'])
+                snapshot['cost'] = cost_report(snapshot['calls'], self.prices) or previous.get('cost', {})
+                snapshot['stages'] = dict(previous.get('stages', {}), **snapshot['stages'])
+
+        _atomic_write(json_path, json.dumps(snapshot, ensure_ascii=False, indent=2))
+        _atomic_write(prom_path, to_prometheus(snapshot))
+
+
+def _totals(calls):
+    # 批量请求拆出的单个查询不是独立的接口调用
+    requests = [c for c in calls if not c.get('batch')]
+    prompt_tokens = sum(c['prompt_tokens'] or 0 for c in calls)
+    completion_tokens = sum(c['completion_tokens'] or 0 for c in calls)
+    kept = sum(c['items_kept'] or 0 for c in calls)
+    # 产出率：每次实际调用（不含缓存命中）保留的条目数，以及每个保留条目花费的 token
+    live = sum(1 for c in requests if not c['cached'])
+    live_kept = sum(c['items_kept'] or 0 for c in calls if not c['cached'])
+    live_novel = sum(c.get('items_novel') or 0 for c in calls if not c['cached'])
+    return {
+        'calls': len(requests),
+        'errors': sum(1 for c in calls if c['error']),
+        'cached': sum(1 for c in calls if c['cached']),
+        'retries': sum(c.get('retries', 0) for c in calls),
+        'hedged': sum(1 for c in calls if c.get('hedged')),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'items_valid': sum(c['items_valid'] or 0 for c in calls),
+        'json_salvaged': sum(1 for c in calls if c.get('json_repairs') or c.get('items_dropped')),
+        'json_repairs': sum(c.get('json_repairs') or 0 for c in calls),
+        'items_dropped': sum(c.get('items_dropped') or 0 for c in calls),
+        'items_kept': kept,
+        'items_novel': sum(c.get('items_novel') or 0 for c in calls),
+        'kept_per_call': round(live_kept / live, 2) if live else None,
+        'novel_per_call': round(live_novel / live, 2) if live else None,
+        'prompt_tokens_per_kept': round(prompt_tokens / live_kept, 1) if live_kept else None,
+        'completion_tokens_per_kept': round(completion_tokens / live_kept, 1) if live_kept else None,
+    }
+
+
+def cost_report(calls, prices):
+    """
+    按阶段汇总 token 用量和费用
+
+    Args:
+        calls: 调用记录
+        prices: {model: (每千输入 token 价格, 每千输出 token 价格)}
+
+    Returns:
+        dict: {stage: {'models', 'calls', 'prompt_tokens', 'completion_tokens', 'cost'}}，
+              没有价格表时返回空字典
+    """
+    if not prices:
+        return {}
+    report = {}
+    for c in calls:
+        if c.get('batch') or c.get('cached'):
+            continue
+        entry = report.setdefault(c.get('stage') or 'search', {
+            'models': [], 'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0
+        })
+        model = c.get('model')
+        if model and model not in entry['models']:
+            entry['models'].append(model)
+        prompt_tokens = c['prompt_tokens'] or 0
+        completion_tokens = c['completion_tokens'] or 0
+        input_price, output_price = prices.get(model, (0, 0))
+        entry['calls'] += 1
+        entry['prompt_tokens'] += prompt_tokens
+        entry['completion_tokens'] += completion_tokens
+        entry['cost'] += (prompt_tokens * input_price + completion_tokens * output_price) / 1000
+    for entry in report.values():
+        entry['cost'] = round(entry['cost'], 6)
+    return report
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(snapshot):
+    """把指标快照转成 Prometheus textfile 格式"""
+    lines = []
+
+    def gauge(name, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for labels, value in samples:
+            label_text = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+    calls = snapshot['calls']
+    for field, name, help_text in CALL_GAUGES:
+        samples = [({'query': c['query'], 'type': c['type']}, c[field])
+                   for c in calls if c.get(field) is not None]
+        if samples:
+            gauge(name, help_text, samples)
+    gauge('dashboard_llm_call_error', '调用是否失败（1 为失败）',
+          [({'query': c['query'], 'type': c['type']}, int(bool(c['error']))) for c in calls])
+    gauge('dashboard_llm_call_cached', '调用是否命中缓存（1 为命中）',
+          [({'query': c['query'], 'type': c['type']}, int(bool(c['cached']))) for c in calls])
+    gauge('dashboard_llm_call_hedged', '是否发出了对冲请求（1 为发出）',
+          [({'query': c['query'], 'type': c['type']}, int(bool(c.get('hedged')))) for c in calls])
+    if snapshot.get('cost'):
+        gauge('dashboard_llm_cost', '各阶段的接口费用（元）',
+              [({'stage': stage}, entry['cost']) for stage, entry in sorted(snapshot['cost'].items())])
+    gauge('dashboard_stage_seconds', '各阶段耗时',
+          [({'stage': stage}, seconds) for stage, seconds in sorted(snapshot['stages'].items())])
+    gauge('dashboard_run_timestamp_seconds', '指标生成时间', [({}, round(snapshot['timestamp'], 3))])
+    return '\n'.join(lines) + '\n'
+
+
+def _atomic_write(path, text):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
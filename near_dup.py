@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 近似重复检测
+字符 n-gram 分片（中文按字、英文按词）+ MinHash 签名 + LSH 分桶索引
+"""
+
+import array
+import base64
+import json
+import os
+import random
+import re
+import tempfile
+import zlib
+from datetime import datetime
+
+# 中文按单字切分，英文/数字按词切分，其余字符（标点、空白）丢弃
+_TOKEN_PATTERN = re.compile(r'[㐀-鿿豈-﫿]|[a-z0-9]+')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def tokenize(text):
+    """CJK 感知的切分：中文单字 + 英文小写单词"""
+    return _TOKEN_PATTERN.findall((text or '').lower())
+
+
+def shingles(text, n=2):
+    """
+    生成 n-gram 分片集合
+
+    Args:
+        text: 原始文本
+        n: 每个分片包含的 token 数
+
+    Returns:
+        set: 分片字符串集合（token 数不足 n 时退化为整体一个分片）
+    """
+    tokens = tokenize(text)
+    if len(tokens) < n:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+
+def _choose_bands(num_perm, threshold):
+    """
+    选择 LSH 的 (bands, rows)，使 S 曲线拐点 (1/b)^(1/r) 不高于阈值且最接近阈值
+
+    拐点略低于阈值可以保证召回，误报由签名相似度再过滤一次
+    """
+    best = (num_perm, 1)
+    best_gap = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        knee = (1 / bands) ** (1 / rows)
+        if knee <= threshold and threshold - knee < best_gap:
+            best, best_gap = (bands, rows), threshold - knee
+    return best
+
+
+class NearDuplicateIndex:
+    """可持久化的 MinHash LSH 索引"""
+
+    def __init__(self, threshold=0.6, num_perm=64, ngram=2, seed=1):
+        """
+        初始化索引
+
+        Args:
+            threshold: 判定为近似重复的 Jaccard 相似度阈值
+            num_perm: MinHash 置换数（签名长度）
+            ngram: 分片长度
+            seed: 置换参数的随机种子，持久化索引要求前后一致
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ngram = ngram
+        self.seed = seed
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        self.entries = {}  # id -> {'kind', 'text', 'day', 'sig'}
+        self._buckets = [dict() for _ in range(self.bands)]
+
+    def signature(self, text):
+        """计算文本的 MinHash 签名"""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text, self.ngram)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+                for a, b in self._perms]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """由签名估计 Jaccard 相似度"""
+        same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return same / len(sig_a)
+
+    def _band_keys(self, sig):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, tuple(sig[start:start + self.rows])
+
+    def query(self, sig, kind=None):
+        """
+        查找与签名最相似的已索引条目
+
+        只比较与签名至少落入同一个桶的候选，复杂度与历史总量无关
+
+        Args:
+            sig: MinHash 签名
+            kind: 只在该类别（如 'news'/'case'）的条目中查找
+
+        Returns:
+            tuple: (entry_id, similarity)；没有达到阈值的条目时返回 (None, 0.0)
+        """
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_id, best_sim = None, 0.0
+        for entry_id in candidates:
+            if kind is not None and self.entries[entry_id]['kind'] != kind:
+                continue
+            sim = self.similarity(sig, self.entries[entry_id]['sig'])
+            if sim > best_sim:
+                best_id, best_sim = entry_id, sim
+        if best_sim >= self.threshold:
+            return best_id, best_sim
+        return None, 0.0
+
+    def add(self, entry_id, sig, kind=None, text='', day=None):
+        """把条目加入索引"""
+        self.entries[entry_id] = {'kind': kind, 'text': text, 'day': day, 'sig': sig}
+        for band, key in self._band_keys(sig):
+            self._buckets[band].setdefault(key, []).append(entry_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self, path):
+        """原子写入索引文件（签名以 base64 紧凑存储，桶在加载时重建）"""
+        payload = {
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'ngram': self.ngram,
+            'seed': self.seed,
+            'entries': {
+                entry_id: {
+                    'kind': entry['kind'],
+                    'text': entry['text'],
+                    'day': entry['day'],
+                    'sig': base64.b64encode(array.array('I', entry['sig']).tobytes()).decode('ascii'),
+                }
+                for entry_id, entry in self.entries.items()
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, threshold=0.6, num_perm=64, ngram=2, seed=1):
+        """
+        加载索引；文件不存在或参数与当前配置不一致时返回空索引
+
+        签名只能在相同的 num_perm/ngram/seed 下比较，参数变化后旧索引作废。
+        阈值只影响查询，可以随时调整。
+        """
+        index = cls(threshold=threshold, num_perm=num_perm, ngram=ngram, seed=seed)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return index
+
+        if (payload.get('num_perm'), payload.get('ngram'), payload.get('seed')) != (num_perm, ngram, seed):
+            print(f"⚠️  近似去重索引参数已变化，忽略旧索引: {path}")
+            return index
+
+        for entry_id, entry in payload.get('entries', {}).items():
+            sig = array.array('I')
+            sig.frombytes(base64.b64decode(entry['sig']))
+            index.add(entry_id, list(sig), entry.get('kind'), entry.get('text', ''), entry.get('day'))
+        return index
+
+
+def write_report(path, merges):
+    """写出近似去重报告"""
+    report = {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'merged_count': len(merges),
+        'merges': merges,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 请求限流器
+令牌桶算法控制请求速率，同时限制同时进行中的请求数
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TokenBucket:
+    """线程安全的令牌桶限流器"""
+
+    def __init__(self, rate, burst=1, max_in_flight=None):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每秒补充的令牌数（即每秒最多发起的请求数）
+            burst: 令牌桶容量（允许的突发请求数）
+            max_in_flight: 同时进行中的最大请求数，None 表示不限制
+        """
+        if rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+    def _refill(self, now):
+        """按流逝时间补充令牌"""
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """阻塞直到拿到一个令牌和一个并发名额"""
+        if self._in_flight is not None:
+            self._in_flight.acquire()
+        self.acquire_token()
+
+    def acquire_token(self):
+        """阻塞直到拿到一个令牌（只限速率，不占并发名额，例如对冲请求）"""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def release(self):
+        """释放并发名额"""
+        if self._in_flight is not None:
+            self._in_flight.release()
+
+    @contextmanager
+    def slot(self, cancellation=None):
+        """
+        拿到令牌和并发名额后执行，结束时归还名额
+
+        Args:
+            cancellation: resilience.Cancellation；被取消时（对冲请求已胜出）立即归还名额，
+                请求本身在后台结束，不再占着其他请求的名额
+        """
+        self.acquire()
+        released = threading.Lock()
+
+        def release_once():
+            if released.acquire(blocking=False):
+                self.release()
+
+        if cancellation is not None:
+            cancellation.add_callback(release_once)
+        try:
+            yield self
+        finally:
+            release_once()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
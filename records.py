@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 条目记录
+新闻和案例的紧凑记录类型（__slots__ 类）、一次遍历完成的校验与类型修正，
+以及大数据量时按列存储的容器
+
+generate_html 在模块级导入本模块：记录类型手写 __slots__，不用 dataclasses / typing
+（两者的导入约占 render 启动耗时的 20ms）
+"""
+
+import re
+from collections.abc import Sequence
+
+# 大模型常见的"高优先级"写法
+_HIGH_PRIORITY = {'high', 'h', 'urgent', 'critical', 'important', '高', '重要', '紧急'}
+# 标签写成一个字符串时的分隔符
+_TAG_SEPARATOR = re.compile(r'\s*[,，、;；/|]\s*')
+
+
+def _text(value):
+    """标量转为去掉首尾空白的字符串，None 视为空串"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return '，'.join(_text(part) for part in value if part is not None)
+    return str(value).strip()
+
+
+def _text_list(value, separator=None):
+    """转为非空字符串列表；字符串按 separator 拆分（为 None 时按行拆分）"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        parts = separator.split(value) if separator else value.splitlines()
+    elif isinstance(value, (list, tuple)):
+        parts = value
+    else:
+        parts = [value]
+    return [text for text in (_text(part) for part in parts) if text]
+
+
+def _priority(value):
+    """high / medium 之外的写法统一：高优先级的常见写法归为 high，其余为 medium"""
+    return 'high' if _text(value).lower() in _HIGH_PRIORITY else 'medium'
+
+
+class _Record:
+    """记录的公共部分：按 FIELDS 比较、显示和转为 dict"""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.values() == other.values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={value!r}' for name, value in zip(self.FIELDS, self.values()))
+        return f'{self.__class__.__name__}({fields})'
+
+    def to_dict(self):
+        return dict(zip(self.FIELDS, self.values()))
+
+
+class NewsItem(_Record):
+    """一条AI动态"""
+
+    __slots__ = ('title', 'summary', 'priority', 'tags', 'date')
+    kind = 'news'
+    FIELDS = __slots__
+
+    def __init__(self, title, summary, priority, tags, date):
+        self.title = title
+        self.summary = summary
+        self.priority = priority
+        self.tags = tags
+        self.date = date
+
+    @classmethod
+    def validate(cls, raw):
+        """
+        校验并修正大模型返回的一条新闻
+
+        Returns:
+            NewsItem: 缺少必需字段或标题为空时返回 None
+        """
+        try:
+            title, summary, priority, tags, date = (raw[name] for name in cls.FIELDS)
+        except (KeyError, TypeError):
+            return None
+        title = _text(title)
+        if not title:
+            return None
+        return cls(title, _text(summary), _priority(priority), _text_list(tags, _TAG_SEPARATOR), _text(date))
+
+    @classmethod
+    def coerce(cls, item):
+        """已校验过的数据（data.json、历史库）转为记录，缺失字段用页面上的占位文字"""
+        if isinstance(item, cls):
+            return item
+        return cls(item.get('title', '未知标题'), item.get('summary', '暂无摘要'),
+                   item.get('priority', 'medium'), item.get('tags', []), item.get('date', '未知日期'))
+
+    def values(self):
+        return (self.title, self.summary, self.priority, self.tags, self.date)
+
+
+class CaseItem(_Record):
+    """一个项目管理案例"""
+
+    __slots__ = ('title', 'company', 'industry', 'description', 'impact')
+    kind = 'case'
+    FIELDS = __slots__
+
+    def __init__(self, title, company, industry, description, impact):
+        self.title = title
+        self.company = company
+        self.industry = industry
+        self.description = description
+        self.impact = impact
+
+    @classmethod
+    def validate(cls, raw):
+        """
+        校验并修正大模型返回的一个案例（效果写成一段文字时按行拆分）
+
+        Returns:
+            CaseItem: 缺少必需字段或标题为空时返回 None
+        """
+        try:
+            title, company, industry, description, impact = (raw[name] for name in cls.FIELDS)
+        except (KeyError, TypeError):
+            return None
+        title = _text(title)
+        if not title:
+            return None
+        return cls(title, _text(company), _text(industry), _text(description), _text_list(impact))
+
+    @classmethod
+    def coerce(cls, item):
+        """已校验过的数据转为记录，缺失字段用页面上的占位文字"""
+        if isinstance(item, cls):
+            return item
+        return cls(item.get('title', '未知案例'), item.get('company', '未知公司'), item.get('industry', '行业'),
+                   item.get('description', '暂无描述'), item.get('impact', []))
+
+    def values(self):
+        return (self.title, self.company, self.industry, self.description, self.impact)
+
+
+RECORD_TYPES = {'news': NewsItem, 'case': CaseItem}
+
+
+def validate_items(results, content_type):
+    """
+    一次遍历校验一组条目
+
+    Args:
+        results: 大模型返回的条目列表
+        content_type: 'news' 或 'case'
+
+    Returns:
+        list: 通过校验的记录（NewsItem / CaseItem）
+    """
+    if not isinstance(results, list):
+        return []
+    validate = RECORD_TYPES[content_type].validate
+    return [record for record in map(validate, results) if record is not None]
+
+
+class ItemColumns(Sequence):
+    """
+    按列存储的同类记录
+
+    每个字段一列；重复出现的值（标签组合、日期、行业、公司、优先级）只保存一份，
+    列表字段存为元组。按下标或遍历时才组装成记录。
+    """
+
+    # 不做去重的长文本字段
+    UNIQUE_FIELDS = {'title', 'summary', 'description'}
+
+    def __init__(self, record_type, items=()):
+        """
+        Args:
+            record_type: NewsItem 或 CaseItem
+            items: 初始条目（记录或 dict）
+        """
+        self.record_type = record_type
+        self.columns = {name: [] for name in record_type.FIELDS}
+        self._shared = {}
+        self.extend(items)
+
+    def append(self, item):
+        record = self.record_type.coerce(item)
+        for name, value in zip(self.record_type.FIELDS, record.values()):
+            if isinstance(value, list):
+                value = tuple(value)
+            if name not in self.UNIQUE_FIELDS:
+                value = self._shared.setdefault(value, value)
+            self.columns[name].append(value)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.columns[self.record_type.FIELDS[0]])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.record_type(*(self.columns[name][index] for name in self.record_type.FIELDS))
+
+    def __iter__(self):
+        make = self.record_type
+        return (make(*values) for values in zip(*(self.columns[name] for name in make.FIELDS)))
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 请求容错
+可重试错误按指数退避（带随机抖动）重试；慢请求超过历史延迟分位数后发出对冲请求，
+先返回的结果胜出（对冲请求有独立的名额，输掉的一方被取消）；接口持续故障时熔断，直接快速失败
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# 可重试的 HTTP 状态码：超时、冲突、限流和服务端错误
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# 可重试的异常类型名（openai 的超时/连接错误没有状态码）
+RETRYABLE_ERRORS = {'APITimeoutError', 'APIConnectionError', 'Timeout', 'TimeoutError',
+                    'ConnectionError', 'ConnectTimeout', 'ReadTimeout', 'RemoteProtocolError'}
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，请求被直接拒绝"""
+
+
+def is_retryable(exc):
+    """判断异常是否值得重试（超时、连接错误、429、5xx）"""
+    status = getattr(exc, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(exc).__mro__)
+
+
+def is_outage(exc):
+    """判断异常是否说明接口本身不可用（计入熔断；429 只是限流，不计入）"""
+    status = getattr(exc, 'status_code', None)
+    if status is not None:
+        return status >= 500
+    return is_retryable(exc)
+
+
+def backoff_delay(attempt, base, cap, rng=random):
+    """
+    第 attempt 次重试前的等待时间（full jitter）
+
+    Args:
+        attempt: 重试序号，从 0 开始
+        base: 基础等待秒数
+        cap: 最长等待秒数
+
+    Returns:
+        float: 在 [0, min(cap, base * 2^attempt)] 内均匀随机
+    """
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    熔断器：连续 failure_threshold 次故障后打开，reset_timeout 秒内所有请求快速失败；
+    之后进入半开状态放行一个探测请求，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """请求前调用；熔断中抛出 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - self.clock()
+                if remaining > 0:
+                    raise CircuitOpenError(f"熔断中，{remaining:.0f}s 后重试")
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError("熔断半开，等待探测请求结果")
+                self._probing = True
+
+    def record_success(self):
+        """
+        记录一次成功
+
+        Returns:
+            bool: 是否由此从半开恢复为关闭
+        """
+        with self._lock:
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+            return recovered
+
+    def record_failure(self):
+        """
+        记录一次故障
+
+        Returns:
+            bool: 是否由此打开熔断
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                return True
+            return False
+
+    def release_probe(self):
+        """探测请求以非故障错误结束时，允许下一个请求继续探测"""
+        with self._lock:
+            self._probing = False
+
+
+class Cancellation:
+    """
+    对冲请求分出胜负后通知输掉的一方
+
+    请求方可以登记回调（例如提前归还限流名额），读取流式响应时也可以检查 cancelled 后停止
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """登记取消时执行的回调；已经取消时立即执行"""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class LatencyTracker:
+    """最近若干次成功请求的耗时，用来计算对冲请求的触发阈值"""
+
+    def __init__(self, percentile=0.9, min_samples=4, window=50, initial_delay=None):
+        """
+        Args:
+            percentile: 触发对冲的延迟分位数
+            min_samples: 样本不足时使用 initial_delay
+            window: 保留的最近样本数
+            initial_delay: 样本不足时的固定阈值（秒），None 表示样本不足时不对冲
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.initial_delay = initial_delay
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            del self._samples[:-self.window]
+
+    def threshold(self):
+        """当前的对冲阈值（秒），None 表示不对冲"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile))
+        return samples[index]
+
+
+class ResilientCaller:
+    """把重试、对冲和熔断组合在一起执行一次逻辑请求"""
+
+    def __init__(self, max_retries=3, backoff_base=1.0, backoff_cap=30.0,
+                 breaker=None, latency=None, hedge=True, max_hedges=2, log=print):
+        """
+        Args:
+            max_retries: 可重试错误的最多重试次数
+            backoff_base: 退避基础秒数
+            backoff_cap: 单次退避最长秒数
+            breaker: CircuitBreaker，None 表示不熔断
+            latency: LatencyTracker，None 表示不对冲
+            hedge: 是否启用对冲请求
+            max_hedges: 同时进行中的对冲请求数上限（与主请求的并发名额分开），用完时不再对冲
+            log: 日志输出函数
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker
+        self.latency = latency
+        self.hedge = hedge and latency is not None and max_hedges > 0
+        self._hedge_slots = threading.BoundedSemaphore(max(1, max_hedges))
+        self.log = log
+        self.rng = random.Random()
+
+    def call(self, func, label, stats=None):
+        """
+        执行请求
+
+        Args:
+            func: func(attempt_index, cancellation) -> 结果；attempt_index 为 0 表示主请求，1 表示对冲请求，
+                cancellation 为 Cancellation，另一方胜出后被取消
+            label: 日志里显示的请求名
+            stats: 可选的 dict，写入 retries / hedged / hedge_won
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            CircuitOpenError: 熔断中
+            Exception: 不可重试的错误，或重试次数用完后的最后一个错误
+        """
+        stats = stats if stats is not None else {}
+        stats.setdefault('retries', 0)
+        stats.setdefault('hedged', False)
+        stats.setdefault('hedge_won', False)
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.before_call()
+            try:
+                result = self._hedged(func, label, stats)
+            except Exception as e:
+                self._record_failure(e, label)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap, self.rng)
+                attempt += 1
+                stats['retries'] = attempt
+                self.log(f"  🔁 [{label}] {_describe(e)}，{delay:.1f}s 后第 {attempt}/{self.max_retries} 次重试")
+                time.sleep(delay)
+                continue
+            if self.breaker is not None and self.breaker.record_success():
+                self.log(f"  🟢 [{label}] 探测请求成功，熔断恢复")
+            return result
+
+    def _record_failure(self, exc, label):
+        if self.breaker is None:
+            return
+        if not is_outage(exc):
+            self.breaker.release_probe()
+        elif self.breaker.record_failure():
+            self.log(f"  ⛔ [{label}] 接口连续故障，熔断 {self.breaker.reset_timeout:.0f}s")
+
+    def _timed(self, func, index, cancellation):
+        start = time.perf_counter()
+        result = func(index, cancellation)
+        if self.latency is not None:
+            self.latency.record(time.perf_counter() - start)
+        return result
+
+    def _hedged(self, func, label, stats):
+        """超过延迟阈值仍未返回时再发一个相同请求，取先成功的那个"""
+        threshold = self.latency.threshold() if self.hedge else None
+        if threshold is None:
+            return self._timed(func, 0, Cancellation())
+
+        # 不等待输掉的请求：取消它（归还名额、停止读取流式响应），它在后台结束后自然退出
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            primary_cancellation, hedge_cancellation = Cancellation(), Cancellation()
+            primary = pool.submit(self._timed, func, 0, primary_cancellation)
+            done, _ = wait([primary], timeout=threshold)
+            if done:
+                return primary.result()
+            # 对冲名额用完（大量请求同时变慢）时再发请求只会加重积压，继续等主请求
+            if not self._hedge_slots.acquire(blocking=False):
+                return primary.result()
+
+            self.log(f"  🪁 [{label}] 超过 {threshold:.1f}s 未返回，发出对冲请求")
+            stats['hedged'] = True
+            hedge = pool.submit(self._timed, func, 1, hedge_cancellation)
+            hedge.add_done_callback(lambda _: self._hedge_slots.release())
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        (hedge_cancellation if future is primary else primary_cancellation).cancel()
+                        if future is hedge:
+                            stats['hedge_won'] = True
+                            self.log(f"  🪁 [{label}] 对冲请求先返回")
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            pool.shutdown(wait=False)
+
+
+def _describe(exc):
+    status = getattr(exc, 'status_code', None)
+    name = type(exc).__name__
+    return f'{name}（HTTP {status}）' if status is not None else name
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 数据序列化
+data.json 的读写后端：标准库 json、orjson（已安装时）和可 mmap 的二进制快照
+
+快照格式（小端）:
+    8 字节魔数 | u32 头部长度 | 头部 JSON | 各列表的偏移表和条目
+    头部: {"keys": 原始键顺序, "meta": 非列表字段, "lists": {键: [偏移表位置, 条目数]}}
+    偏移表: 条目数+1 个 u64（相对头部之后的位置），第 i 条为 [off[i], off[i+1]) 的紧凑 JSON
+读取时只解析头部，条目在访问时才从 mmap 中解码。
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+
+try:
+    import orjson
+except ImportError:  # orjson 是可选依赖
+    orjson = None
+
+SNAPSHOT_MAGIC = b'AIPMSNP1'
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
+
+def _compact(obj):
+    """紧凑 JSON（UTF-8 字节），orjson 与 json 的输出相同"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _parse(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class JsonBackend:
+    """标准库 json，带缩进（与原来的 data.json 格式一致）"""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    orjson，输出与 JsonBackend 逐字节相同
+
+    仅浮点数的指数写法不同（1e+20 / 1e20），data.json 中没有浮点数。
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+
+class SnapshotBackend:
+    """长度前缀的二进制快照，可 mmap 后按条读取"""
+
+    name = 'snapshot'
+
+    def dumps(self, data):
+        body = bytearray()
+        meta, lists = {}, {}
+        for key, value in data.items():
+            if not isinstance(value, (list, LazyItems)):
+                meta[key] = value
+                continue
+            blobs = [_compact(item) for item in value]
+            table_at = len(body)
+            offsets, position = [], table_at + _U64.size * (len(blobs) + 1)
+            for blob in blobs:
+                offsets.append(position)
+                position += len(blob)
+            offsets.append(position)
+            body += struct.pack(f'<{len(offsets)}Q', *offsets)
+            body += b''.join(blobs)
+            lists[key] = [table_at, len(blobs)]
+
+        header = _compact({'keys': list(data), 'meta': meta, 'lists': lists})
+        return SNAPSHOT_MAGIC + _U32.pack(len(header)) + header + bytes(body)
+
+    def loads(self, raw):
+        """整体解码为普通 dict"""
+        return Snapshot(raw).to_dict()
+
+
+class LazyItems(Sequence):
+    """快照中的一个列表，按下标访问时才解码对应条目"""
+
+    def __init__(self, buffer, base, table_at, count):
+        self._buffer = buffer
+        self._table = base + table_at
+        self._base = base
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def raw(self, index):
+        """第 index 条的紧凑 JSON 字节（不解码）"""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start, end = struct.unpack_from('<2Q', self._buffer, self._table + index * _U64.size)
+        return self._buffer[self._base + start:self._base + end]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        return _parse(self.raw(index))
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield _parse(self.raw(index))
+
+
+class Snapshot(Mapping):
+    """只解析头部的快照视图，可以当作只读 dict 使用"""
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer: 快照字节（bytes 或 mmap）
+        """
+        if buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError("不是数据快照文件")
+        self._buffer = buffer
+        header_len, = _U32.unpack_from(buffer, len(SNAPSHOT_MAGIC))
+        header_at = len(SNAPSHOT_MAGIC) + _U32.size
+        header = _parse(bytes(buffer[header_at:header_at + header_len]))
+        base = header_at + header_len
+        self._keys = header['keys']
+        self._values = dict(header['meta'])
+        for key, (table_at, count) in header['lists'].items():
+            self._values[key] = LazyItems(buffer, base, table_at, count)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def to_dict(self):
+        return {key: list(value) if isinstance(value, LazyItems) else value
+                for key, value in self._values.items()}
+
+
+def open_snapshot(path):
+    """
+    mmap 打开快照文件
+
+    Returns:
+        Snapshot: 映射在文件生命周期内保持打开（进程结束时释放）
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Snapshot(buffer)
+
+
+BACKENDS = {
+    'json': JsonBackend,
+    'orjson': OrjsonBackend,
+    'snapshot': SnapshotBackend,
+}
+
+
+def get_backend(name='auto'):
+    """
+    按名称取后端
+
+    Args:
+        name: 'json' / 'orjson' / 'snapshot' / 'auto'（已安装 orjson 时用 orjson，否则 json）
+    """
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+    if name not in BACKENDS:
+        raise ValueError(f"未知的序列化后端: {name}")
+    if name == 'orjson' and orjson is None:
+        print("⚠️  未安装 orjson，改用标准库 json")
+        name = 'json'
+    return BACKENDS[name]()
+
+
+def dump_file(path, obj, backend='auto'):
+    """原子写出（先写临时文件再替换）"""
+    payload = get_backend(backend).dumps(obj)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return len(payload)
+
+
+def load_file(path, backend='auto'):
+    """
+    读取数据文件，按魔数自动识别快照
+
+    Returns:
+        dict 或 Snapshot（快照按条延迟解码）
+    """
+    with open(path, 'rb') as f:
+        is_snapshot = f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+        if not is_snapshot:
+            f.seek(0)
+            return get_backend(backend).loads(f.read())
+    return open_snapshot(path)
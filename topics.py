@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+AI+项目管理信息面板 - 多主题面板
+按 config.TOPICS 为每个主题生成一个面板：所有主题的查询共用一个采集器（同一个限流器、
+同一组 API 并发）同时发起，再按主题各自去重、保存，最后用进程池并行渲染到各自的输出目录
+"""
+
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+import config
+
+
+def topic_settings(name, topic):
+    """
+    主题对应的配置项（输出目录、数据文件、历史库、去重索引等都按主题分开）
+
+    Args:
+        name: 主题名（用作目录名）
+        topic: config.TOPICS 中的定义
+    """
+    root = os.path.join(config.TOPICS_DIR, name)
+    cache_dir = os.path.join(os.path.dirname(config.RENDER_CACHE_FILE) or '.', 'topics', name)
+    return {
+        'SITE_TITLE': topic.get('title', f'{name} 智能信息面板'),
+        'SITE_DESCRIPTION': topic.get('description', config.SITE_DESCRIPTION),
+        'OUTPUT_DIR': os.path.join(config.OUTPUT_DIR, name),
+        'DATA_FILE': os.path.join(root, 'data.json'),
+        'DATA_SNAPSHOT': os.path.join(cache_dir, 'data.snap') if config.DATA_SNAPSHOT else None,
+        'HISTORY_DB': os.path.join(root, 'history.db'),
+        'NEAR_DUP_INDEX': os.path.join(root, 'near_dup_index.json'),
+        'NEAR_DUP_REPORT': os.path.join(root, 'dedup_report.json'),
+        'KEYWORD_STATS_FILE': os.path.join(root, 'keyword_stats.json'),
+        'RENDER_CACHE_FILE': os.path.join(cache_dir, 'render_cache.json'),
+        'METRICS_FILE': os.path.join(root, 'metrics.json'),
+        'METRICS_PROM_FILE': os.path.join(root, 'metrics.prom'),
+    }
+
+
+@contextmanager
+def use_topic(name, topic):
+    """在 with 块内把 config 切换为该主题的配置（只能在单线程中使用）"""
+    settings = topic_settings(name, topic)
+    os.makedirs(os.path.dirname(settings['HISTORY_DB']), exist_ok=True)
+    saved = {key: getattr(config, key) for key in settings}
+    for key, value in settings.items():
+        setattr(config, key, value)
+    try:
+        yield settings
+    finally:
+        for key, value in saved.items():
+            setattr(config, key, value)
+
+
+def render_topic(name, topic, data, force=False):
+    """
+    进程池中渲染一个主题（子进程内直接修改 config，不需要还原）
+
+    Returns:
+        bool: 首页是否生成成功
+    """
+    for key, value in topic_settings(name, topic).items():
+        setattr(config, key, value)
+    from generate_html import render
+    success = render(data=data, force=force)
+    if success and config.SEARCH_ENABLED:
+        from build_search_index import build_search_index
+        build_search_index()
+    return success
+
+
+def collect_topics(collector, topics):
+    """
+    采集所有主题
+
+    所有主题、两类内容的搜索同时提交，实际并发由采集器的令牌桶（RATE_LIMIT_RPS / MAX_IN_FLIGHT）
+    统一控制，总耗时取决于 API 并发而不是主题数。去重和保存按主题依次进行（各自的去重索引和历史库），
+    级联模式的精写再并发执行。每个主题的调用指标写到该主题的 METRICS_FILE。
+
+    Args:
+        collector: AINewsCollector
+        topics: {主题名: 定义}
+
+    Returns:
+        dict: {主题名: 保存后的数据}
+    """
+    # 增量上下文来自各主题自己的历史库（同一查询出现在多个主题时以后面的主题为准）
+    for name, topic in topics.items():
+        with use_topic(name, topic):
+            delta = collector.load_delta()
+        collector.delta_by_query.update({query: delta for query in topic['news'] + topic['cases']})
+
+    with ThreadPoolExecutor(max_workers=max(1, len(topics) * 2)) as pool:
+        searches = {name: (pool.submit(collector.search_stage, 'news', topic['news'], name),
+                           pool.submit(collector.search_stage, 'case', topic['cases'], name))
+                    for name, topic in topics.items()}
+        results = {name: (news.result(), cases.result()) for name, (news, cases) in searches.items()}
+
+    merged, near_dup = {}, {}
+    for name, topic in topics.items():
+        with use_topic(name, topic):
+            collector.load_near_dup()
+            merged[name] = collector.dedupe_stage(*results[name], topic['news'], topic['cases'])
+            near_dup[name] = (collector.near_dup, collector.near_dup_merges)
+
+    if config.CASCADE_MODE:
+        with ThreadPoolExecutor(max_workers=max(1, len(topics) * 2)) as pool:
+            refined = {name: (pool.submit(collector.refine_stage, news, 'news', name),
+                              pool.submit(collector.refine_stage, cases, 'case', name))
+                       for name, (news, cases) in merged.items()}
+            merged = {name: (news.result(), cases.result()) for name, (news, cases) in refined.items()}
+
+    saved = {}
+    for name, topic in topics.items():
+        with use_topic(name, topic):
+            print(f"\n📂 [{name}] 保存数据")
+            collector.near_dup, collector.near_dup_merges = near_dup[name]
+            saved[name] = collector.save_data(*merged[name])
+            # 本主题的采集调用写到主题自己的 metrics.json（覆盖上次运行），渲染阶段再合并进去
+            metrics = collector.metrics.select(lambda call: call.get('topic') == name)
+            metrics.write(config.METRICS_FILE, config.METRICS_PROM_FILE)
+            print(f"📈 [{name}] 指标已写入 {config.METRICS_FILE}（{len(metrics.calls)} 条调用记录）")
+    return saved
+
+
+def render_topics(topics, datas, force=False, workers=None):
+    """
+    用进程池并行渲染各主题的面板
+
+    Args:
+        topics: {主题名: 定义}
+        datas: {主题名: 数据}，缺少的主题从该主题的 data.json 读取
+        workers: 进程数，默认 config.TOPIC_RENDER_WORKERS
+
+    Returns:
+        dict: {主题名: 是否成功}
+    """
+    importlib.import_module('generate_html')  # 先在父进程导入，fork 出的子进程直接复用
+    names = list(topics)
+    workers = min(workers or config.TOPIC_RENDER_WORKERS, len(names)) or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(render_topic, names, [topics[name] for name in names],
+                           [datas.get(name) for name in names], [force] * len(names))
+        return dict(zip(names, results))
+
+
+def select_topics(only=None):
+    """
+    按名称筛选 config.TOPICS
+
+    Args:
+        only: 逗号分隔的主题名，None 表示全部
+
+    Raises:
+        ValueError: 主题不存在或定义缺少 news / cases
+    """
+    topics = dict(config.TOPICS)
+    if only:
+        names = [name.strip() for name in only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in topics]
+        if unknown:
+            raise ValueError(f"未知的主题: {', '.join(unknown)}（可选: {', '.join(topics)}）")
+        topics = {name: topics[name] for name in names}
+    for name, topic in topics.items():
+        if not topic.get('news') or not topic.get('cases'):
+            raise ValueError(f"主题 {name} 需要同时配置 news 和 cases 关键词")
+    return topics